@@ -0,0 +1,77 @@
+"""
+Memory benchmark for the in-memory article representation
+Compares articles kept as the dicts returned by the JSON loader with slotted Article records
+
+Usage (from the backend directory):
+    python benchmarks/article_memory.py [--articles 20000]
+
+Both representations share the same string objects for titles, urls and
+contents, so the difference is the per-article container overhead plus the
+tag and source strings saved by interning.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import random
+import sys
+import tracemalloc
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+TAGS = ["ia", "politique", "économie", "santé", "technologie", "union européenne", "entreprise"]
+
+
+def make_json(count: int) -> str:
+    """Serialized synthetic articles, as stored in articles_seen.json"""
+    rng = random.Random(42)
+    return json.dumps([{
+        "title": f"Article {i}",
+        "url": f"https://example.com/{i}",
+        "content": "x" * rng.randint(500, 3000),
+        "has_been_pretreat": True,
+        "rating": rng.choice([None, 3, 4, 5]),
+        "time_spent": rng.randint(0, 600),
+        "comments": "",
+        "tags": rng.sample(TAGS, 3),
+        "source": rng.choice(["TechCrunch", "France Info"]),
+        "scraped_date": "2025-01-01 10:00:00",
+        "id": i
+    } for i in range(count)], ensure_ascii=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20000)
+    args = parser.parse_args()
+
+    with patch("config.DEBUG_LOGGING", False), contextlib.redirect_stdout(io.StringIO()):
+        from models import Article
+
+    text = make_json(args.articles)
+    gc.collect()
+    tracemalloc.start()
+
+    base = tracemalloc.get_traced_memory()[0]
+    dicts = json.loads(text)
+    dict_bytes = tracemalloc.get_traced_memory()[0] - base
+
+    articles = [Article.from_dict(article).freeze() for article in dicts]
+    del dicts
+    gc.collect()
+    article_bytes = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    print(f"{args.articles} articles (contents included)")
+    print(f"dicts:            {dict_bytes / 1024 / 1024:8.2f} MiB  {dict_bytes / args.articles:8.0f} B/article")
+    print(f"Article records:  {article_bytes / 1024 / 1024:8.2f} MiB  {article_bytes / args.articles:8.0f} B/article")
+    print(f"saved per article: {(dict_bytes - article_bytes) / args.articles:7.0f} B")
+    assert len(articles) == args.articles
+
+
+if __name__ == "__main__":
+    main()
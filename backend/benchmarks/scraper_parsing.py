@@ -0,0 +1,127 @@
+"""
+Parsing benchmark for the scrapers
+Compares full html.parser trees with the lxml-backed, strained parsing of the scrapers on saved pages
+
+Usage (from the backend directory):
+    python benchmarks/scraper_parsing.py [--pages tests/fixtures] [--repeat 50]
+
+The pages directory holds one HTML file per page kind (techcrunch_listing,
+techcrunch_article, france_info_listing, france_info_article); pages saved
+from the live sites can be dropped in place of the fixtures. Both
+paths must extract the same titles, links and bodies. Memory is the peak
+of Python allocations (tracemalloc) while parsing a page: BeautifulSoup
+drives lxml through parser events, so no lxml tree is built on the side.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from bs4 import BeautifulSoup
+
+from config import (FRANCE_INFO_BASE_URL, FRANCE_INFO_CARD_CLASSES, FRANCE_INFO_CONTENT_CLASS,
+                    PARAGRAPH_CLASS, TITLE_CLASS)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures")
+
+
+def baseline_techcrunch_listing(html: str) -> dict:
+    """Previous parsing path: full html.parser tree"""
+    soup = BeautifulSoup(html, "html.parser")
+    titles, links = [], []
+    for element in soup.find_all(class_=TITLE_CLASS):
+        link_element = element.find("a")
+        if link_element and "href" in link_element.attrs:
+            title_text = element.text.strip()
+            if title_text and link_element["href"]:
+                titles.append(title_text)
+                links.append(link_element["href"])
+    return {"titles": titles, "links": links}
+
+
+def baseline_techcrunch_article(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    paragraphs = soup.find_all("p", class_=PARAGRAPH_CLASS) or soup.find_all("p")
+    return "\n".join(text for text in (para.text.strip() for para in paragraphs) if text and len(text) > 20)
+
+
+def baseline_france_info_listing(html: str) -> list:
+    soup = BeautifulSoup(html, "html.parser")
+    urls = []
+    for class_name in FRANCE_INFO_CARD_CLASSES:
+        for link in soup.find_all("a", class_=class_name):
+            href = link.get("href")
+            if href:
+                urls.append(href if href.startswith("http") else FRANCE_INFO_BASE_URL + href)
+    return list(set(urls))
+
+
+def baseline_france_info_article(html: str) -> tuple:
+    soup = BeautifulSoup(html, "html.parser")
+    title_element = soup.find("h1")
+    title = title_element.get_text(strip=True) if title_element else ""
+    content = "\n".join(block.get_text(strip=True, separator=" ")
+                        for block in soup.find_all("div", class_=FRANCE_INFO_CONTENT_CLASS))
+    if not content:
+        content = "\n".join(text for text in (para.text.strip() for para in soup.find_all("p"))
+                            if text and len(text) > 20)
+    return title, content
+
+
+def measure(parse, html: str, repeat: int) -> dict:
+    parse(html)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(html)
+    ms = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    parse(html)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ms": ms, "peak_kib": peak / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", default=FIXTURES_DIR)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with patch("config.DEBUG_LOGGING", False), contextlib.redirect_stdout(io.StringIO()):
+        from scraper import FranceInfoScraper, TechCrunchScraper
+        from scraper.parsing import HTML_PARSER
+
+        techcrunch, france_info = TechCrunchScraper(), FranceInfoScraper()
+
+    pages = {
+        "techcrunch_listing.html": (baseline_techcrunch_listing, techcrunch._parse_listing),
+        "techcrunch_article.html": (baseline_techcrunch_article, techcrunch._parse_article),
+        "france_info_listing.html": (baseline_france_info_listing, france_info._parse_listing),
+        "france_info_article.html": (baseline_france_info_article, france_info._parse_article),
+    }
+
+    print(f"Scraper parsing, {args.repeat} runs per page, new path uses '{HTML_PARSER}'")
+    print(f"{'page':<26}{'path':<10}{'ms/page':>9}{'peak KiB':>10}")
+    for name, (baseline, current) in pages.items():
+        with open(os.path.join(args.pages, name), encoding="utf-8") as f:
+            html = f.read()
+        expected, result = baseline(html), current(html)
+        if isinstance(expected, list):
+            expected, result = sorted(expected), sorted(result)
+        assert result == expected, f"{name}: the parsing paths disagree"
+
+        for path, parse in (("before", baseline), ("after", current)):
+            stats = measure(parse, html, args.repeat)
+            print(f"{name:<26}{path:<10}{stats['ms']:>9.2f}{stats['peak_kib']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Startup benchmark for the article cache
+Measures the first load of the cache and its resident memory for growing article body sizes
+
+Usage (from the backend directory):
+    python benchmarks/startup_content.py [--articles 5000]
+
+For each body size the cache is started twice in a fresh process on the same
+data: the first start parses the articles file and fills the content store,
+the second one finds the storage unchanged and only reads the metadata
+snapshot. Memory is the resident set size after the load (Linux only, from
+/proc/self/statm).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+WORDS = ["election", "gouvernement", "intelligence", "artificielle", "startup", "modèle",
+         "parlement", "europe", "réforme", "données", "robot", "santé", "finance", "openai"]
+
+
+def write_articles(path: str, count: int, body_words: int) -> None:
+    rng = random.Random(42)
+    articles = [{
+        "title": f"Article {i} " + " ".join(rng.choice(WORDS) for _ in range(6)),
+        "url": f"https://example.com/{i}",
+        "content": " ".join(rng.choice(WORDS) for _ in range(body_words)),
+        "has_been_pretreat": True,
+        "rating": None,
+        "time_spent": 0,
+        "comments": "",
+        "tags": rng.sample(["ia", "politique", "économie", "santé"], 2),
+        "source": rng.choice(["TechCrunch", "France Info"]),
+        "scraped_date": "2025-01-01 10:00:00",
+        "id": i
+    } for i in range(count)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(articles, f, ensure_ascii=False)
+
+
+def child(data_dir: str) -> None:
+    """Start the cache on data_dir and print load time and memory as JSON"""
+    sys.path.insert(0, SRC_DIR)
+    paths = {
+        "config.JSON_FILE": os.path.join(data_dir, "articles_seen.json"),
+        "config.SEARCH_INDEX_FILE": os.path.join(data_dir, "search_index.json"),
+        "config.CONTENT_STORE_FILE": os.path.join(data_dir, "article_contents.bin"),
+        "config.CONTENT_INDEX_FILE": os.path.join(data_dir, "article_contents.json"),
+        "config.DEBUG_LOGGING": False,
+    }
+    with contextlib.ExitStack() as stack:
+        for target, value in paths.items():
+            stack.enter_context(patch(target, value))
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        from cache import ArticleCache
+
+        cache = ArticleCache()
+        start = time.perf_counter()
+        count = len(cache.get_articles())
+        elapsed = time.perf_counter() - start
+
+    rss = None
+    if os.path.exists("/proc/self/statm"):
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    print(json.dumps({"articles": count, "seconds": elapsed, "rss": rss}))
+
+
+def run_child(data_dir: str) -> dict:
+    output = subprocess.run([sys.executable, __file__, "--child", data_dir],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    print(f"{args.articles} articles")
+    print(f"{'body words':>10}{'file MiB':>10}  {'start':<6}{'load s':>8}{'RSS MiB':>9}")
+    for body_words in (50, 500, 2000):
+        with tempfile.TemporaryDirectory() as data_dir:
+            articles_file = os.path.join(data_dir, "articles_seen.json")
+            write_articles(articles_file, args.articles, body_words)
+            size = os.path.getsize(articles_file) / 1024 / 1024
+            for start in ("cold", "warm"):
+                result = run_child(data_dir)
+                rss = f"{result['rss'] / 1024 / 1024:9.1f}" if result["rss"] else f"{'n/a':>9}"
+                print(f"{body_words:>10}{size:>10.1f}  {start:<6}{result['seconds']:>8.2f}{rss}")
+
+
+if __name__ == "__main__":
+    main()
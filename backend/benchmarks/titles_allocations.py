@@ -0,0 +1,202 @@
+"""
+Allocation benchmark for POST /api/titles
+Measures the memory allocated per request on a synthetic article set
+
+Usage (from the backend directory):
+    python benchmarks/titles_allocations.py [--articles 5000] [--requests 200] [--baseline-requests 10]
+
+The JSON response cache is disabled so that every request goes through the
+article cache read path. For each scenario the script reports the average
+peak of memory allocated while serving a full request and while running only
+the cache read (ArticleCache.get_paginated_titles), plus the average time of both.
+
+The "before" rows run the original cache read on the same articles: a copy of
+the cached list of mutable dicts, the fuzzy title filter and a sort on every
+request, then a new dict per returned title. They have no HTTP request
+columns, and run fewer times since the fuzzy filter takes seconds per read.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from flask import Flask
+
+WORDS = ["election", "gouvernement", "intelligence", "artificielle", "startup", "modèle",
+         "parlement", "europe", "réforme", "données", "robot", "santé", "finance", "openai"]
+
+SCENARIOS = {
+    "order": {"sort_by": "order"},
+    "date": {"sort_by": "date"},
+    "rating": {"sort_by": "rating"},
+    "search": {"sort_by": "date", "search": "gouvernement"},
+}
+
+
+def make_articles(count: int) -> list:
+    """Synthetic articles with realistic field sizes"""
+    rng = random.Random(42)
+    return [{
+        "id": i,
+        "title": " ".join(rng.choice(WORDS) for _ in range(8)),
+        "url": f"https://example.com/{i}",
+        "content": " ".join(rng.choice(WORDS) for _ in range(300)),
+        "has_been_pretreat": rng.random() < 0.5,
+        "rating": rng.choice([None, 1, 2, 3, 4, 5]),
+        "time_spent": rng.randint(0, 600),
+        "comments": "",
+        "tags": rng.sample(["ia", "politique", "économie", "santé"], 2),
+        "source": rng.choice(["TechCrunch", "France Info"]),
+        "scraped_date": f"2025-01-{rng.randint(1, 28):02d}T10:00:00Z",
+        "date": f"2025-01-{rng.randint(1, 28):02d}"
+    } for i in range(count)]
+
+
+def baseline_paginated_titles(cache, articles: list, page: int, per_page: int, sort_by: str,
+                              search: str = None) -> dict:
+    """Original ArticleCache.get_paginated_titles over plain dicts, sorting on each request"""
+    from sort_index import SORT_KEYS
+
+    articles = articles.copy()  # get_articles() handed out a copy of the cached list
+    if search and search.strip():
+        search_term = search.strip().lower()
+        articles = [article for article in articles if cache._matches_search(article.get('title', ''), search_term)]
+    if sort_by in SORT_KEYS:
+        articles_sorted = sorted(articles, key=lambda x: (SORT_KEYS[sort_by](x), x.get('id', 0)), reverse=True)
+    else:
+        articles_sorted = articles
+
+    start_index = (page - 1) * per_page
+    titles = [{
+        "id": article.get("id", start_index + i),
+        "title": article.get("title", ""),
+        "url": article.get("url", ""),
+        "has_been_pretreat": article.get("has_been_pretreat", False),
+        "rating": article.get("rating"),
+        "time_spent": article.get("time_spent", 0),
+        "comments": article.get("comments", ""),
+        "tags": article.get("tags", []),
+        "source": article.get("source"),
+        "scraped_date": article.get("scraped_date"),
+        "date": article.get("date", None)
+    } for i, article in enumerate(articles_sorted[start_index:start_index + per_page])]
+    return {"titles": titles, "pagination": {"page": page, "per_page": per_page, "total": len(articles),
+                                             "returned": len(titles), "sort_by": sort_by}}
+
+
+def measure_peak(function, *args) -> tuple:
+    """Call a function and return (result, bytes allocated at its peak)"""
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function(*args)
+    return result, tracemalloc.get_traced_memory()[1] - before
+
+
+def run_scenario(client, cache, body: dict, requests: int) -> dict:
+    """Send the same request repeatedly and measure each one"""
+    request_peaks, cache_peaks, durations, cache_durations = [], [], [], []
+    for page in range(requests):
+        payload = dict(body, page=page % 10 + 1, per_page=20)
+        start = time.perf_counter()
+        response, peak = measure_peak(lambda: client.post("/api/titles", json=payload))
+        durations.append(time.perf_counter() - start)
+        request_peaks.append(peak)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+        start = time.perf_counter()
+        _, peak = measure_peak(cache.get_paginated_titles, payload["page"], payload["per_page"],
+                               payload["sort_by"], payload.get("search"))
+        cache_durations.append(time.perf_counter() - start)
+        cache_peaks.append(peak)
+    return {
+        "request_kib": sum(request_peaks) / requests / 1024,
+        "cache_kib": sum(cache_peaks) / requests / 1024,
+        "ms": sum(durations) / requests * 1000,
+        "cache_ms": sum(cache_durations) / requests * 1000,
+    }
+
+
+def run_baseline(cache, articles: list, body: dict, requests: int) -> dict:
+    """Run the original cache read repeatedly, checking it returns the same page as the cache"""
+    cache_peaks, cache_durations = [], []
+    for page in range(requests):
+        args = (page % 10 + 1, 20, body["sort_by"], body.get("search"))
+        start = time.perf_counter()
+        result, peak = measure_peak(baseline_paginated_titles, cache, articles, *args)
+        cache_durations.append(time.perf_counter() - start)
+        cache_peaks.append(peak)
+        if page < 10:
+            expected = cache.get_paginated_titles(*args)
+            assert [title["id"] for title in result["titles"]] == [title["id"] for title in expected["titles"]], \
+                f"{body}: the read paths disagree"
+    return {
+        "request_kib": None,
+        "cache_kib": sum(cache_peaks) / requests / 1024,
+        "ms": None,
+        "cache_ms": sum(cache_durations) / requests * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--baseline-requests", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        articles_file = os.path.join(temp_dir, "articles_seen.json")
+        with open(articles_file, "w", encoding="utf-8") as f:
+            json.dump(make_articles(args.articles), f, ensure_ascii=False)
+        # What the original cache kept: the dicts of the JSON loader, bodies included
+        with open(articles_file, "r", encoding="utf-8") as f:
+            baseline_articles = json.load(f)
+
+        with patch("config.JSON_FILE", articles_file), \
+             patch("config.SEARCH_INDEX_FILE", os.path.join(temp_dir, "search_index.json")), \
+             patch("config.CONTENT_STORE_FILE", os.path.join(temp_dir, "article_contents.bin")), \
+             patch("config.CONTENT_INDEX_FILE", os.path.join(temp_dir, "article_contents.json")), \
+             patch("config.DEBUG_LOGGING", False), \
+             contextlib.redirect_stdout(io.StringIO()):
+            from cache import ArticleCache
+            from json_cache import json_response_cache
+            from routes.articles import api_bp
+
+            cache = ArticleCache()
+            app = Flask(__name__)
+            app.register_blueprint(api_bp)
+            client = app.test_client()
+            # Every request must reach the article cache
+            json_response_cache.max_entries = 0
+
+            with patch("routes.articles.article_cache", cache), patch("json_cache.article_cache", cache):
+                cache.get_articles()
+                tracemalloc.start()
+                results = {name: {"before": run_baseline(cache, baseline_articles, body, args.baseline_requests),
+                                  "after": run_scenario(client, cache, body, args.requests)}
+                           for name, body in SCENARIOS.items()}
+                tracemalloc.stop()
+
+    print(f"POST /api/titles, {args.articles} articles, {args.requests} requests per scenario")
+    print(f"{'scenario':<10}{'path':<8}{'request peak KiB':>18}{'ms/request':>12}"
+          f"{'cache read peak KiB':>21}{'ms/cache read':>15}")
+    for name, paths in results.items():
+        for path, result in paths.items():
+            request_kib = "-" if result["request_kib"] is None else f"{result['request_kib']:.1f}"
+            request_ms = "-" if result["ms"] is None else f"{result['ms']:.2f}"
+            print(f"{name:<10}{path:<8}{request_kib:>18}{request_ms:>12}"
+                  f"{result['cache_kib']:>21.1f}{result['cache_ms']:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,28 @@ AI Module for News Summary Backend
 Provides AI-powered article processing and chat functionality
 """
 
-from .chat import chat_with_ai
+from .chat import chat_with_ai, stream_chat_with_ai
 from .models import load_models_settings
-from .processing import pretreat_articles, process_article_content
+from .pretreatment import (PretreatmentPool, pretreat_articles, pretreatment_pool, start_pretreatment,
+                           stop_pretreatment)
+from .processing import merge_article_tags, process_article_content
+from .response_cache import ResponseCache, response_cache
 from .tags import prepare_tag_to_str, get_required_tag_for_source
 from .utils import extract_content_and_tags
 
 __all__ = [
     "chat_with_ai",
+    "stream_chat_with_ai",
     "load_models_settings",
+    "PretreatmentPool",
     "pretreat_articles",
+    "pretreatment_pool",
+    "start_pretreatment",
+    "stop_pretreatment",
+    "merge_article_tags",
     "process_article_content",
+    "ResponseCache",
+    "response_cache",
     "prepare_tag_to_str",
     "get_required_tag_for_source",
     "extract_content_and_tags"
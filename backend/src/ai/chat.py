@@ -3,18 +3,86 @@ AI Chat module
 Handles conversational AI interactions about articles
 """
 
+import json
 import sys
 import os
+from typing import Iterator
+
 import requests
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import DEBUG_LOGGING
-from models import ArticleManager
+from cache import article_cache
 from settings import SettingsManager
 
 from .models import load_models_settings
 
 
+def _prepare_chat_request(article_id: str, user_question: str, model_name: str) -> dict:
+    """
+    Find the article and build the model request for a chat question
+
+    Returns:
+        dict: Either {"success": False, "error": ...} or the article, model settings
+              and request url/headers/body
+    """
+    # Get article details from the cache's id index
+    try:
+        article = article_cache.get_article_by_id(int(article_id))
+    except (TypeError, ValueError):
+        article = None
+
+    if DEBUG_LOGGING:
+        print(f"[AI_CHAT] Looking for article_id: '{article_id}' (found: {article is not None})")
+
+    if not article:
+        return {
+            "success": False,
+            "error": f"Article not found. Looking for ID: {article_id}"
+        }
+
+    # Get model settings
+    model_settings = load_models_settings(model_name)
+    if not model_settings:
+        return {
+            "success": False,
+            "error": f"Model '{model_name}' not found in configuration"
+        }
+
+    # Prepare the chat prompt with article context
+    chat_prompt = SettingsManager.get_prompt("chat").format(
+        article_content=article.get("content", ""),
+        article_title=article.get("title", ""),
+        article_source=article.get("source", ""),
+        user_question=user_question
+    )
+
+    headers = {
+        "Authorization": f"Bearer {model_settings['apikey']}",
+        "Content-Type": "application/json"
+    }
+
+    body = {
+        "model": model_settings["id"],
+        "messages": [
+            {
+                "role": "user",
+                "content": chat_prompt
+            }
+        ],
+        "max_tokens": 1000,
+        "temperature": 0.7
+    }
+
+    return {
+        "success": True,
+        "article": article,
+        "url": model_settings["url"],
+        "headers": headers,
+        "body": body
+    }
+
+
 def chat_with_ai(article_id: str, user_question: str, model_name: str = None) -> dict:
     """
     Chat with AI about a specific article
@@ -31,71 +99,15 @@ def chat_with_ai(article_id: str, user_question: str, model_name: str = None) ->
     if model_name is None:
         model_name = SettingsManager.get_chat_model()
     try:
-        # Get article details
-        articles = ArticleManager.load_articles()
-
-        if DEBUG_LOGGING:
-            print(f"[AI_CHAT] Looking for article_id: '{article_id}' (type: {type(article_id)})")
-            print(f"[AI_CHAT] Total articles loaded: {len(articles)}")
-            if articles:
-                print(f"[AI_CHAT] First article ID: '{articles[0].get('id')}' (type: {type(articles[0].get('id'))})")
-                print(f"[AI_CHAT] Available article IDs: {[str(art.get('id')) for art in articles[:5]]}")  # Show first 5
-
-        article = None
-        for art in articles:
-            # Convert both to string for comparison since article_id comes as string from URL
-            if str(art.get("id")) == str(article_id):
-                article = art
-                break
-
-        if not article:
-            return {
-                "success": False,
-                "error": f"Article not found. Looking for ID: {article_id}. Available IDs: {[str(art.get('id')) for art in articles[:10]]}"
-            }
-
-        # Get model settings
-        model_settings = load_models_settings(model_name)
-        if not model_settings:
-            return {
-                "success": False,
-                "error": f"Model '{model_name}' not found in configuration"
-            }
-
-        # Prepare the chat prompt with article context
-        chat_prompt = SettingsManager.get_prompt("chat").format(
-            article_content=article.get("content", ""),
-            article_title=article.get("title", ""),
-            article_source=article.get("source", ""),
-            user_question=user_question
-        )
-
-        # Make API request
-        url = model_settings["url"]
-        api_key = model_settings["apikey"]
-        model_id = model_settings["id"]
-
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-
-        body = {
-            "model": model_id,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": chat_prompt
-                }
-            ],
-            "max_tokens": 1000,
-            "temperature": 0.7
-        }
+        chat_request = _prepare_chat_request(article_id, user_question, model_name)
+        if not chat_request["success"]:
+            return chat_request
+        article = chat_request["article"]
 
         if DEBUG_LOGGING:
             print(f"[AI_CHAT] Sending question about article '{article.get('title', 'Unknown')}' to {model_name}")
 
-        response = requests.post(url, headers=headers, json=body)
+        response = requests.post(chat_request["url"], headers=chat_request["headers"], json=chat_request["body"])
 
         if response.status_code == 200:
             ai_response = response.json().get("choices", [])[0].get("message", {}).get("content", "")
@@ -120,4 +132,65 @@ def chat_with_ai(article_id: str, user_question: str, model_name: str = None) ->
         return {
             "success": False,
             "error": f"Error processing chat request: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+
+def stream_chat_with_ai(article_id: str, user_question: str, model_name: str = None) -> Iterator[dict]:
+    """
+    Chat with AI about a specific article, yielding the answer as it is generated
+
+    Args:
+        article_id: ID of the article to discuss
+        user_question: User's question about the article
+        model_name: Name of the AI model to use (optional, uses configured chat model if not provided)
+
+    Yields:
+        dict: Events, in order:
+              {"type": "start", "article_title", "model_used"},
+              {"type": "token", "content"} for each chunk,
+              then {"type": "done", "answer"} or {"type": "error", "error"}
+    """
+    # Use configured chat model if none specified
+    if model_name is None:
+        model_name = SettingsManager.get_chat_model()
+    try:
+        chat_request = _prepare_chat_request(article_id, user_question, model_name)
+        if not chat_request["success"]:
+            yield {"type": "error", "error": chat_request["error"]}
+            return
+        article = chat_request["article"]
+
+        yield {"type": "start", "article_title": article.get("title", ""), "model_used": model_name}
+
+        if DEBUG_LOGGING:
+            print(f"[AI_CHAT] Streaming answer about article '{article.get('title', 'Unknown')}' from {model_name}")
+
+        body = dict(chat_request["body"], stream=True)
+        with requests.post(chat_request["url"], headers=chat_request["headers"], json=body,
+                           stream=True, timeout=(10, 120)) as response:
+            if response.status_code != 200:
+                if DEBUG_LOGGING:
+                    print(f"[AI_CHAT] Error: {response.status_code} {response.text}")
+                yield {"type": "error", "error": f"AI service error: {response.status_code}"}
+                return
+
+            answer_parts = []
+            # OpenAI-compatible stream: "data: {json chunk}" lines, ended by "data: [DONE]"
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    answer_parts.append(content)
+                    yield {"type": "token", "content": content}
+
+        yield {"type": "done", "answer": "".join(answer_parts)}
+
+    except Exception as e:
+        if DEBUG_LOGGING:
+            print(f"[AI_CHAT] Exception: {str(e)}")
+        yield {"type": "error", "error": f"Error processing chat request: {str(e)}"}
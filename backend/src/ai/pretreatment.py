@@ -0,0 +1,344 @@
+"""
+Article pretreatment module
+Runs AI pretreatment of new articles on a bounded worker pool and commits results in batches,
+either over every unpretreated article or as jobs consumed from the pretreatment queue
+"""
+
+import math
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import article_cache
+from config import (DEBUG_LOGGING, PRETREATMENT_BATCH_SIZE, PRETREATMENT_MAX_IN_FLIGHT,
+                    PRETREATMENT_POLL_INTERVAL, PRETREATMENT_QUEUE, PRETREATMENT_WORKERS)
+from job_queue import JobQueue, job_queue
+from models import ArticleManager
+from settings import SettingsManager
+
+from .models import load_models_settings
+from .processing import merge_article_tags, process_article_content
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(percent / 100 * len(ordered)))) - 1
+    return ordered[rank]
+
+
+class PretreatmentPool:
+    """
+    Pretreats articles concurrently
+
+    Articles are sent to the AI model by a pool of worker threads. Each model
+    has its own limit of requests in flight (the "max_in_flight" field of the
+    model settings, PRETREATMENT_MAX_IN_FLIGHT by default). Results are
+    written with one storage patch per batch instead of one save per article.
+
+    In the background, a consumer thread takes the ids of new articles from
+    the pretreatment job queue, so that scraping never waits for the model:
+    failed articles are retried later and dead-lettered after too many
+    attempts, and a crashed batch is picked up again once its jobs' visibility
+    timeout expires.
+    """
+
+    def __init__(self, workers: int = PRETREATMENT_WORKERS, batch_size: int = PRETREATMENT_BATCH_SIZE,
+                 max_in_flight: int = PRETREATMENT_MAX_IN_FLIGHT, queue: JobQueue = job_queue):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.queue = queue
+        self.running = False
+        self.thread = None
+        self._run_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._model_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._progress: Dict = self._empty_progress()
+
+    def run(self) -> Dict:
+        """
+        Pretreat every article that has not been pretreated yet
+
+        If a run is already in progress (scraping loop and /api/pretreat at the
+        same time), returns its progress instead of starting a second one.
+
+        Returns:
+            Progress and throughput of the run
+        """
+        if not self._run_lock.acquire(blocking=False):
+            if DEBUG_LOGGING:
+                print("[AI] Pretreatment already running")
+            return self.get_stats()
+
+        try:
+            articles = [article for article in ArticleManager.load_articles()
+                        if not article.get("has_been_pretreat", False)]
+            model_name = SettingsManager.get_article_processing_model()
+            self._start_progress(len(articles), model_name)
+
+            if DEBUG_LOGGING:
+                print(f"[AI] Starting pretreatment of {len(articles)} articles with {model_name}")
+
+            if articles:
+                self._run_pool(articles, model_name)
+        finally:
+            self._finish_progress()
+            self._run_lock.release()
+
+        stats = self.get_stats()
+        if DEBUG_LOGGING:
+            print(f"[AI] Pretreatment done: {stats['completed']}/{stats['total']} articles, "
+                  f"{stats['articles_per_minute']:.1f} articles/min, "
+                  f"p50 {stats['latency_p50_seconds']:.2f}s, p95 {stats['latency_p95_seconds']:.2f}s")
+        return stats
+
+    def process_queue(self) -> int:
+        """
+        Pretreat the next batch of articles of the pretreatment queue
+
+        Each job holds the id of an article. A job is acknowledged once its
+        result is written (or if its article is gone or already pretreated)
+        and failed otherwise, for the queue to retry or dead-letter it.
+
+        Returns:
+            Number of jobs handled (0 when the queue has no job ready)
+        """
+        with self._run_lock:
+            jobs = self.queue.claim(PRETREATMENT_QUEUE, limit=self.batch_size)
+            if not jobs:
+                return 0
+
+            todo: List[Tuple[Dict, Dict]] = []
+            for job in jobs:
+                # Looked up through the id index of the article cache, which
+                # follows storage writes, instead of loading every article
+                article = article_cache.get_article_by_id(job["payload"].get("article_id"))
+                if article is None or article.get("has_been_pretreat", False):
+                    # Deleted or already pretreated since it was queued
+                    self.queue.ack(job["id"])
+                else:
+                    todo.append((job, article.to_dict()))
+
+            if todo:
+                model_name = SettingsManager.get_article_processing_model()
+                self._start_progress(len(todo), model_name)
+                try:
+                    self._run_jobs(todo, model_name)
+                finally:
+                    self._finish_progress()
+        return len(jobs)
+
+    def enqueue_articles(self, articles: List[Dict]) -> int:
+        """Queue the articles that have not been pretreated yet (insert listener of the storage)"""
+        return self.queue.enqueue_many(PRETREATMENT_QUEUE, [
+            (str(article["id"]), {"article_id": article["id"]})
+            for article in articles if not article.get("has_been_pretreat", False)
+        ])
+
+    def start(self):
+        """Start consuming the pretreatment queue in a background thread"""
+        if not self.running:
+            # New articles are queued as soon as they are stored, and the ones
+            # stored while the consumer was not running are queued now
+            ArticleManager.add_insert_listener(self.enqueue_articles)
+            self.enqueue_articles([article.to_dict(include_content=False)
+                                   for article in article_cache.get_articles()])
+            self.running = True
+            self.thread = threading.Thread(target=self._consume_loop, daemon=True)
+            self.thread.start()
+            if DEBUG_LOGGING:
+                print("[AI] Pretreatment queue consumer started")
+
+    def stop(self):
+        """Stop the pretreatment queue consumer"""
+        self.running = False
+        if DEBUG_LOGGING:
+            print("[AI] Pretreatment queue consumer stopped")
+
+    def get_stats(self) -> Dict:
+        """Get progress and throughput of the current or last run"""
+        with self._stats_lock:
+            progress = dict(self._progress)
+            latencies = list(progress.pop("latencies"))
+
+        started_at = progress.get("started_at")
+        end = time.time() if progress["running"] else progress.get("finished_at") or time.time()
+        elapsed = end - started_at if started_at else 0
+        progress.update({
+            "elapsed_seconds": elapsed,
+            "articles_per_minute": progress["completed"] * 60 / elapsed if elapsed > 0 else 0.0,
+            "latency_p50_seconds": _percentile(latencies, 50),
+            "latency_p95_seconds": _percentile(latencies, 95)
+        })
+        return progress
+
+    def _run_pool(self, articles: List[Dict], model_name: str) -> None:
+        batch: List[Tuple[int, Dict, Dict]] = []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(articles)))) as executor:
+            futures = {executor.submit(self._pretreat_one, article, model_name): article
+                       for article in articles}
+            for future in as_completed(futures):
+                article = futures[future]
+                try:
+                    batch.append(future.result())
+                except Exception as e:
+                    # The article stays unpretreated and is retried on the next run
+                    with self._stats_lock:
+                        self._progress["failed"] += 1
+                    if DEBUG_LOGGING:
+                        print(f"[AI] Error pretreating article '{article.get('title')}': {e}")
+                    continue
+
+                if len(batch) >= self.batch_size:
+                    self._commit(batch)
+                    batch = []
+
+        if batch:
+            self._commit(batch)
+
+    def _run_jobs(self, todo: List[Tuple[Dict, Dict]], model_name: str) -> None:
+        """Pretreat the articles of claimed jobs and settle every job"""
+        done: List[Tuple[Dict, Tuple[int, Dict, Dict]]] = []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(todo)))) as executor:
+            # A rate-limited or failing model fails the job so that the queue retries it
+            futures = {executor.submit(self._pretreat_one, article, model_name, True): (job, article)
+                       for job, article in todo}
+            for future in as_completed(futures):
+                job, article = futures[future]
+                try:
+                    done.append((job, future.result()))
+                except Exception as e:
+                    with self._stats_lock:
+                        self._progress["failed"] += 1
+                    if DEBUG_LOGGING:
+                        print(f"[AI] Error pretreating article '{article.get('title')}': {e}")
+                    self.queue.fail(job["id"], str(e))
+
+        if not done:
+            return
+        try:
+            self._commit([result for _, result in done])
+        except Exception as e:
+            for job, _ in done:
+                self.queue.fail(job["id"], f"Could not save the result: {e}")
+            raise
+        for job, _ in done:
+            self.queue.ack(job["id"])
+
+    def _consume_loop(self):
+        """Main loop of the queue consumer"""
+        while self.running:
+            try:
+                if self.process_queue():
+                    continue
+            except Exception as e:
+                if DEBUG_LOGGING:
+                    print(f"[AI] Error processing the pretreatment queue: {e}")
+            # Sleep in small chunks to allow for graceful shutdown
+            for _ in range(PRETREATMENT_POLL_INTERVAL):
+                if not self.running:
+                    break
+                time.sleep(1)
+
+    def _pretreat_one(self, article: Dict, model_name: str, strict: bool = False) -> Tuple[int, Dict, Dict]:
+        """Run the model on one article and build its storage patch (strict: raise on a model error response)"""
+        with self._model_slot(model_name):
+            with self._stats_lock:
+                self._progress["in_flight"] += 1
+            start_time = time.time()
+            try:
+                if DEBUG_LOGGING:
+                    print(f"[AI] Pretreating article: {article['title']}")
+                processed_content, ai_tags = process_article_content(
+                    article["content"],
+                    model_name,
+                    article.get("source", ""),
+                    raise_on_error=strict
+                )
+            finally:
+                latency = time.time() - start_time
+                with self._stats_lock:
+                    self._progress["in_flight"] -= 1
+                    self._progress["latencies"].append(latency)
+
+        if DEBUG_LOGGING:
+            print(f"[AI] Processed content: {processed_content[:60]}...")  # Print first 60 chars
+            print(f"[AI] AI suggested tags: {ai_tags}")
+
+        final_tags = merge_article_tags(article, ai_tags)
+        return article["id"], {
+            "content": processed_content,
+            "has_been_pretreat": True,
+            "tags": final_tags
+        }, {}
+
+    def _commit(self, batch: List[Tuple[int, Dict, Dict]]) -> None:
+        """Write a batch of results (the patch also updates the cached entries and indexes)"""
+        updated = ArticleManager.patch_articles(batch)
+        with self._stats_lock:
+            self._progress["completed"] += updated
+            self._progress["batches"] += 1
+        if DEBUG_LOGGING:
+            print(f"[AI] Saved a batch of {updated} pretreated articles")
+
+    def _model_slot(self, model_name: str) -> threading.BoundedSemaphore:
+        """Semaphore limiting the requests in flight for a model"""
+        with self._stats_lock:
+            slot = self._model_slots.get(model_name)
+            if slot is None:
+                model = load_models_settings(model_name) or {}
+                limit = int(model.get("max_in_flight", self.max_in_flight))
+                slot = self._model_slots[model_name] = threading.BoundedSemaphore(max(1, limit))
+            return slot
+
+    def _start_progress(self, total: int, model_name: str) -> None:
+        with self._stats_lock:
+            self._progress = self._empty_progress()
+            self._progress.update({"running": True, "total": total,
+                                   "model": model_name, "started_at": time.time()})
+
+    def _finish_progress(self) -> None:
+        with self._stats_lock:
+            self._progress["running"] = False
+            self._progress["finished_at"] = time.time()
+
+    @staticmethod
+    def _empty_progress() -> Dict:
+        return {
+            "running": False,
+            "model": None,
+            "total": 0,
+            "completed": 0,
+            "failed": 0,
+            "in_flight": 0,
+            "batches": 0,
+            "started_at": None,
+            "finished_at": None,
+            "latencies": []
+        }
+
+
+# Global pretreatment pool instance
+pretreatment_pool = PretreatmentPool()
+
+
+def pretreat_articles() -> Dict:
+    """Pretreat articles that have not been pretreat yet using an AI model"""
+    return pretreatment_pool.run()
+
+
+def start_pretreatment():
+    """Start the background pretreatment queue consumer"""
+    pretreatment_pool.start()
+
+
+def stop_pretreatment():
+    """Stop the background pretreatment queue consumer"""
+    pretreatment_pool.stop()
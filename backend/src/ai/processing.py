@@ -9,15 +9,16 @@ import requests
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import DEBUG_LOGGING
-from models import ArticleManager
 from settings import SettingsManager
 
 from .models import load_models_settings
+from .response_cache import response_cache
 from .tags import get_required_tag_for_source, prepare_tag_to_str
 from .utils import extract_content_and_tags
 
 
-def process_article_content(content: str, model_name: str, source: str = None) -> tuple[str, list]:
+def process_article_content(content: str, model_name: str, source: str = None,
+                            raise_on_error: bool = False) -> tuple[str, list]:
     """
     Process article content using AI model
 
@@ -25,9 +26,13 @@ def process_article_content(content: str, model_name: str, source: str = None) -
         content: Article content to process
         model_name: Name of the AI model to use
         source: Article source for tag filtering
+        raise_on_error: Raise on a non-200 model response instead of returning the original content
 
     Returns:
         tuple: (processed_content, tags_list)
+
+    Raises:
+        requests.HTTPError: If raise_on_error is set and the model did not answer with a 200
     """
     model = load_models_settings(model_name)
     if not model:
@@ -44,10 +49,20 @@ def process_article_content(content: str, model_name: str, source: str = None) -
         "Authorization": f"Bearer {api_key}"
     }
 
+    system_prompt = SettingsManager.get_prompt("article_processing").format(tags=prepare_tag_to_str(source))
+
+    # Same model, prompt and content always get the same answer: reuse it
+    cache_key = response_cache.make_key(model_id, system_prompt, content)
+    cached_response = response_cache.get(cache_key)
+    if cached_response is not None:
+        if DEBUG_LOGGING:
+            print(f"[AI] Using cached AI response for model {model_id}")
+        return extract_content_and_tags(cached_response)
+
     body = {
         "model": model_id,
         "messages": [
-            {"role": "system", "content": SettingsManager.get_prompt("article_processing").format(tags=prepare_tag_to_str(source))},
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": f"Pretreat the following article content:\n\n{content}"}
         ]
     }
@@ -58,66 +73,48 @@ def process_article_content(content: str, model_name: str, source: str = None) -
         ai_response = response.json().get("choices", [])[0].get("message", {}).get("content", "")
         if DEBUG_LOGGING:
             print(f"[AI] Raw AI response: {ai_response}")
+        response_cache.put(cache_key, model_id, ai_response)
         processed_content, tags = extract_content_and_tags(ai_response)
         return processed_content, tags
     else:
         if DEBUG_LOGGING:
             print(f"[AI] Error processing article content: {response.status_code} {response.text}")
+        if raise_on_error:
+            raise requests.HTTPError(f"Model answered {response.status_code}: {response.text[:200]}",
+                                     response=response)
         return content, []
 
 
-def pretreat_articles() -> None:
-    """Pretreat articles that have not been pretreat yet using an AI model"""
-    if DEBUG_LOGGING:
-        print("[AI] Starting pretreatment of articles")
-
-    articles = ArticleManager.load_articles()
-
-    for article in articles:
-        if not article.get("has_been_pretreat", False):
-            if DEBUG_LOGGING:
-                print(f"[AI] Pretreating article: {article['title']}")
-
-            # Process article content
-            article_source = article.get("source", "")
-            model_name = SettingsManager.get_article_processing_model()
-            processed_content, ai_tags = process_article_content(
-                article["content"],
-                model_name,
-                article_source
-            )
-
-            if DEBUG_LOGGING:
-                print(f"[AI] Processed content: {processed_content[:60]}...")  # Print first 60 chars
-                print(f"[AI] AI suggested tags: {ai_tags}")
-
-            # Add required tag based on source
-            required_tag = get_required_tag_for_source(article_source)
-            final_tags = ai_tags.copy() if ai_tags else []
-
-            # Add required tag if not already present
-            if required_tag and required_tag not in final_tags:
-                final_tags.append(required_tag)
-                if DEBUG_LOGGING:
-                    print(f"[AI] Added required tag '{required_tag}' for source '{article_source}'")
-
-            # Merge with existing tags if any
-            existing_tags = article.get("tags", [])
-            if existing_tags:
-                # Merge existing with new tags, remove duplicates
-                all_tags = list(set(existing_tags + final_tags))
-                final_tags = all_tags
-                if DEBUG_LOGGING:
-                    print(f"[AI] Merged with existing tags: {existing_tags} -> {final_tags}")
-
-            # Update article
-            article["content"] = processed_content
-            article["has_been_pretreat"] = True
-            article["tags"] = final_tags
-
-            ArticleManager.save_articles(articles)
-
-            if DEBUG_LOGGING:
-                print(f"[AI] Article '{article['title']}' saved with final tags: {final_tags}")
-
-    return None
\ No newline at end of file
+def merge_article_tags(article: dict, ai_tags: list) -> list:
+    """
+    Build the final tags of a pretreated article
+
+    Args:
+        article: Article being pretreated
+        ai_tags: Tags suggested by the AI model
+
+    Returns:
+        AI tags plus the tag required by the source, merged with the existing tags
+    """
+    article_source = article.get("source", "")
+
+    # Add required tag based on source
+    required_tag = get_required_tag_for_source(article_source)
+    final_tags = ai_tags.copy() if ai_tags else []
+
+    # Add required tag if not already present
+    if required_tag and required_tag not in final_tags:
+        final_tags.append(required_tag)
+        if DEBUG_LOGGING:
+            print(f"[AI] Added required tag '{required_tag}' for source '{article_source}'")
+
+    # Merge with existing tags if any
+    existing_tags = article.get("tags", [])
+    if existing_tags:
+        # Merge existing with new tags, remove duplicates
+        all_tags = list(set(existing_tags + final_tags))
+        final_tags = all_tags
+        if DEBUG_LOGGING:
+            print(f"[AI] Merged with existing tags: {existing_tags} -> {final_tags}")
+
+    return final_tags
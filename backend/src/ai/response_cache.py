@@ -0,0 +1,150 @@
+"""
+AI response cache module
+Persistent, size-bounded LRU cache of model responses keyed by the request content
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Optional
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DEBUG_LOGGING, LLM_CACHE_FILE, LLM_CACHE_MAX_BYTES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model_id TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+"""
+
+
+class ResponseCache:
+    """
+    Content-addressed cache of raw model responses
+
+    The key is a hash of the model id, the rendered system prompt and the
+    article content, so a change of model or prompt never returns a stale
+    answer. Entries are stored in SQLite and the least recently used ones are
+    evicted once the stored responses exceed max_bytes.
+    """
+
+    def __init__(self, cache_file: str = LLM_CACHE_FILE, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.cache_file = cache_file
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._total_bytes: Optional[int] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(model_id: str, system_prompt: str, content: str) -> str:
+        """Hash the parts of a request that determine the response"""
+        digest = hashlib.sha256()
+        for part in (model_id, system_prompt, content):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response and mark it as recently used
+
+        Args:
+            key: Key built with make_key
+
+        Returns:
+            The raw response, or None on a miss
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            connection.commit()
+            self._hits += 1
+            return row[0]
+
+    def put(self, key: str, model_id: str, response: str) -> None:
+        """Store a response, evicting the least recently used ones if needed"""
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            connection = self._connect()
+            now = time.time()
+            previous = connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, model_id, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_id, response, size, now, now)
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict(connection)
+            connection.commit()
+
+    def get_stats(self) -> Dict:
+        """Get hit rate and size information"""
+        with self._lock:
+            connection = self._connect()
+            entries = connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "entries": entries,
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM responses")
+            connection.commit()
+            self._total_bytes = 0
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        while self._total_bytes > self.max_bytes:
+            row = connection.execute(
+                "SELECT key, size FROM responses ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._total_bytes = 0
+                return
+            connection.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._total_bytes -= row[1]
+            self._evictions += 1
+            if DEBUG_LOGGING:
+                print(f"[AI_CACHE] Evicted cached response {row[0][:12]}")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            # Shared by the pretreatment workers; every access holds self._lock
+            self._connection = sqlite3.connect(self.cache_file, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+            self._total_bytes = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+        return self._connection
+
+
+# Global AI response cache instance
+response_cache = ResponseCache()
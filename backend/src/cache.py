@@ -3,20 +3,43 @@ Cache module for News Summary Backend
 Manages in-memory caching of articles for better performance
 """
 
+import atexit
+import bisect
+import threading
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from config import CACHE_DURATION, DEBUG_LOGGING
-from models import ArticleManager
+from config import BASIC_TAGS, DEBUG_LOGGING
+from models import Article, ArticleManager
+from models.content_store import content_store
+from search_index import INDEXED_FIELDS, SearchIndex
+from sort_index import SortIndex, decode_cursor, encode_cursor
+from tag_index import TagIndex
+from title_index import TitleIndex
 
 
 class ArticleCache:
-    """In-memory cache for articles with automatic expiration"""
+    """In-memory cache for articles, reloaded only when the stored data changes"""
     
     def __init__(self):
-        self._cache: List[Dict] = []
+        self._cache: List[Article] = []  # Frozen articles
+        self._snapshot: Optional[Tuple[Article, ...]] = None  # Handed out until the next change
         self._cache_timestamp: float = 0
-        self._cache_duration = CACHE_DURATION
+        self._data_version: Optional[Tuple] = None  # Storage version the cache reflects
+        self._reload_count = 0
+        self._exit_hook_registered = False
+        self._positions: Dict[int, int] = {}  # Article id -> position in _cache
+        self._generation = 0  # Bumped every time the cached data changes
+        self.tag_index = TagIndex()
+        self.title_index = TitleIndex()
+        self.sort_index = SortIndex()
+        self.search_index = SearchIndex()
+        # Held while the cache is reloaded or changed by a storage listener (request,
+        # reading-time, scraper and pretreatment threads)
+        self._lock = threading.RLock()
+        # Keep cached entries in sync with storage patches and inserts
+        ArticleManager.add_patch_listener(self.apply_patch)
+        ArticleManager.add_insert_listener(self.apply_insert)
     
     def _matches_search(self, title: str, search_term: str) -> bool:
         """
@@ -82,49 +105,117 @@ class ArticleCache:
         return (len(str2) - previous_row[-1]) / len(str2)
     
     def is_cache_valid(self) -> bool:
-        """Check if the current cache is still valid"""
-        if not self._cache:
-            return False
-        
-        current_time = time.time()
-        return (current_time - self._cache_timestamp) <= self._cache_duration
+        """Check if the cache still reflects the stored articles (no write, no external edit)"""
+        return self._data_version is not None and self._data_version == ArticleManager.get_data_version()
     
     def invalidate_cache(self) -> None:
         """Manually invalidate the cache"""
-        self._cache_timestamp = 0
+        self._data_version = None
         if DEBUG_LOGGING:
             print("[CACHE] Cache manually invalidated")
     
-    def get_articles(self, force_refresh: bool = False) -> List[Dict]:
+    def get_articles(self, force_refresh: bool = False) -> Sequence[Article]:
         """
-        Get articles from cache or reload from storage if expired
+        Get articles from cache or reload from storage if they changed
         
         Args:
             force_refresh: If True, bypass cache and reload from storage
         
         Returns:
-            List of article dictionaries
+            Tuple of frozen articles, shared until the cache changes
         """
-        current_time = time.time()
-        
-        # Check if we need to refresh the cache
-        if force_refresh or not self.is_cache_valid():
-            try:
-                self._cache = ArticleManager.load_articles()
-                self._cache_timestamp = current_time
+        self._refresh_if_needed(force_refresh)
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = tuple(self._cache)
+            return self._snapshot
+
+    def get_generation(self) -> int:
+        """
+        Get the data generation, reloading first if the stored articles changed
+
+        Two reads returning the same generation saw the same data, which lets
+        the HTTP layer reuse encoded responses.
+        """
+        self._refresh_if_needed()
+        return self._generation
+
+    def _refresh_if_needed(self, force_refresh: bool = False) -> None:
+        """Reload articles from storage if they changed or a refresh is forced"""
+        with self._lock:
+            current_time = time.time()
+            # Taken before loading: a write racing with the load triggers another reload
+            data_version = ArticleManager.get_data_version()
+
+            # Check if we need to refresh the cache
+            if force_refresh or self._data_version != data_version:
+                self._data_version = data_version
+                self._reload_count += 1
+                try:
+                    self._load(data_version[1])
+                    self._cache_timestamp = current_time
                 
-                if DEBUG_LOGGING:
-                    print(f"[CACHE] Articles reloaded in cache: {len(self._cache)} articles")
+                    if DEBUG_LOGGING:
+                        print(f"[CACHE] Articles reloaded in cache: {len(self._cache)} articles")
                     
-            except Exception as e:
-                if DEBUG_LOGGING:
-                    print(f"[CACHE] Error loading articles: {e}")
-                # Return empty list if there's an error
-                self._cache = []
-                self._cache_timestamp = current_time
-        
-        return self._cache.copy()  # Return a copy to prevent external modifications
+                except Exception as e:
+                    if DEBUG_LOGGING:
+                        print(f"[CACHE] Error loading articles: {e}")
+                    # Return empty list if there's an error
+                    self._cache = []
+                    self._cache_timestamp = current_time
+                    self._rebuild_indexes()
     
+    def _load(self, signature: Tuple) -> None:
+        """
+        Load the articles, leaving their bodies in the content store
+
+        If the storage files still have the signature of the saved metadata
+        snapshot, only the snapshot is read and no body is parsed. Otherwise
+        the articles are loaded from storage, the changed bodies are appended
+        to the content store and a new snapshot is saved.
+        """
+        metadata = content_store.load_snapshot(signature)
+        if metadata is not None:
+            self._cache = [self._unloaded(Article.from_dict(article)) for article in metadata]
+            self._rebuild_indexes(sync_search_index=False)
+            if self.search_index.get_article_ids() != set(self._positions):
+                # Reads the bodies back from the content store
+                self.search_index.sync(self._cache)
+            if DEBUG_LOGGING:
+                print("[CACHE] Articles loaded from the metadata snapshot")
+            return
+
+        self._cache = [Article.from_dict(article) for article in ArticleManager.load_articles()]
+        # Indexed while the bodies are still in memory
+        self._rebuild_indexes()
+        content_store.put_many((article.id, article.content) for article in self._cache
+                               if article.id is not None)
+        content_store.remove_missing(self._positions)
+        for article in self._cache:
+            self._unloaded(article)
+        self._save_snapshot(signature)
+        if not self._exit_hook_registered:
+            # Writes made after this load are in the snapshot if it is saved again on exit
+            atexit.register(self._save_snapshot_on_exit)
+            self._exit_hook_registered = True
+
+    def _save_snapshot(self, signature: Tuple) -> None:
+        content_store.save_snapshot(signature, [article.to_dict(include_content=False)
+                                                for article in self._cache])
+        # The snapshot path does not re-index, so the search index must match it
+        self.search_index.save()
+
+    def _save_snapshot_on_exit(self) -> None:
+        if self.is_cache_valid():
+            self._save_snapshot(self._data_version[1])
+
+    @staticmethod
+    def _unloaded(article: Article) -> Article:
+        """Freeze an article whose body is in the content store, dropping the body from memory"""
+        article.unload_content()
+        return article.freeze()
+
     def get_cache_info(self) -> Dict:
         """Get information about the current cache status"""
         current_time = time.time()
@@ -134,91 +225,164 @@ class ArticleCache:
             "cache_size": len(self._cache),
             "cache_age_seconds": age,
             "cache_valid": self.is_cache_valid(),
-            "cache_duration": self._cache_duration,
+            "generation": self._generation,
+            "storage_generation": ArticleManager.get_generation(),
+            "reload_count": self._reload_count,
+            "content_store": content_store.get_stats(),
             "last_updated": self._cache_timestamp
         }
     
     def get_articles_count(self) -> int:
         """Get the total number of articles in cache"""
-        articles = self.get_articles()
-        return len(articles)
+        self._refresh_if_needed()
+        return len(self._cache)
     
-    def get_article_by_id(self, article_id: int) -> Optional[Dict]:
-        """Get a specific article by ID from cache"""
-        articles = self.get_articles()
-        if 0 <= article_id < len(articles):
-            article = articles[article_id].copy()
-            article["id"] = article_id
-            return article
-        return None
+    def get_article_by_id(self, article_id: int) -> Optional[Article]:
+        """Get a specific frozen article by ID from cache (ids may differ from list positions)"""
+        self._refresh_if_needed()
+        position = self._positions.get(article_id)
+        if position is None:
+            return None
+        return self._cache[position]
     
-    def get_paginated_articles(self, start: int, end: int) -> Dict:
+    def get_paginated_articles(self, start: int, end: int, cursor: Optional[str] = None) -> Dict:
         """
         Get a paginated slice of articles
         
         Args:
             start: Starting position (1-based)
             end: Ending position (inclusive)
+            cursor: Optional next_cursor of a previous page; the page then starts
+                    right after that article and holds end - start + 1 articles
         
         Returns:
-            Dictionary with articles and pagination info
+            Dictionary with articles (as dictionaries) and pagination info
+        
+        Raises:
+            ValueError: If the cursor is invalid
         """
         articles = self.get_articles()
         
         # Convert 1-based to 0-based indexing
         start_index = max(0, start - 1)
         end_index = min(end, len(articles))
+        if cursor:
+            start_index = self._cursor_position(cursor) + 1
+            end_index = min(start_index + end - start + 1, len(articles))
         
         articles_slice = articles[start_index:end_index]
         
+        next_cursor = None
+        if articles_slice and end_index < len(articles):
+            next_cursor = encode_cursor('order', None, articles_slice[-1].get("id"))
+        
         return {
-            "articles": articles_slice,
+            "articles": [article.to_dict() for article in articles_slice],
             "pagination": {
-                "start": start,
-                "end": min(end, len(articles)),
+                "start": start_index + 1 if cursor else start,
+                "end": end_index if cursor else min(end, len(articles)),
                 "total": len(articles),
-                "returned": len(articles_slice)
+                "returned": len(articles_slice),
+                "next_cursor": next_cursor
             }
         }
     
-    def get_paginated_titles(self, page: int, per_page: int, sort_by: str = 'date', search: Optional[str] = None) -> Dict:
+    def _cursor_position(self, cursor: str) -> int:
+        """Get the position in the insertion order of the article an 'order' cursor points to"""
+        _, article_id = decode_cursor(cursor, 'order')
+        position = self._positions.get(article_id)
+        if position is None:
+            raise ValueError("Cursor points to an unknown article")
+        return position
+    
+    def get_paginated_titles(self, page: int, per_page: int, sort_by: str = 'date', search: Optional[str] = None,
+                             cursor: Optional[str] = None) -> Dict:
         """
         Get paginated article titles with sorting and optional search
         
+        Pages are addressed either by number or by the next_cursor returned with
+        the previous page. A cursor encodes the (sort key, id) of the last
+        article shown, so resuming is a binary search in the presorted order and
+        articles inserted meanwhile do not shift the next page.
+        
         Args:
-            page: Page number (1-based)
+            page: Page number (1-based), ignored when a cursor is given
             per_page: Number of articles per page
-            sort_by: Sort order ('date' for newest first, 'order' for insertion order)
+            sort_by: Sort order ('date' for newest first, 'order' for insertion order,
+                     'rating' for best rated first, 'time_spent' for most read first,
+                     'relevance' for full-text BM25 ranking of the search term)
             search: Optional search term to filter titles
+            cursor: Optional next_cursor of a previous page with the same sort_by
         
         Returns:
             Dictionary with titles and pagination info
-        """
-        articles = self.get_articles()
         
-        # Appliquer le filtre de recherche si fourni
-        if search and search.strip():
-            search_term = search.strip().lower()
-            # Utiliser la même logique de recherche floue que le frontend
-            articles = [article for article in articles if self._matches_search(article.get('title', ''), search_term)]
-        
-        # Trier les articles selon le paramètre sort_by
-        if sort_by == 'date':
-            # Trier par date (plus récents en premier), puis par ordre d'arrivée (id) si pas de date
-            articles_sorted = sorted(articles, key=lambda x: (
-                x.get('date', '1900-01-01'),  # Date par défaut très ancienne si pas de date
-                x.get('id', 0)  # ID croissant comme second critère
-            ), reverse=True)
-        else:
-            # Garder l'ordre d'insertion (ordre original)
-            articles_sorted = articles
+        Raises:
+            ValueError: If the cursor is invalid or was issued for another sort order
+        """
+        self._refresh_if_needed()
         
         # Calculate indices
         start_index = (page - 1) * per_page
         end_index = start_index + per_page
+        search_term = search.strip() if search else ""
         
-        # Extract slice
-        articles_slice = articles_sorted[start_index:end_index]
+        # Un élément de plus que la page pour savoir s'il reste des articles après
+        if sort_by == 'relevance' and search_term:
+            # Recherche plein texte (titre, contenu, commentaires, tags) classée par BM25
+            scores = self.search_index.search(search_term)
+            matches = [self._cache[self._positions[article_id]]
+                       for article_id in scores if article_id in self._positions]
+            # Meilleur score d'abord, puis les plus récents à score égal
+            sort_key = lambda x: ((scores[x.get('id')], x.get('date', '1900-01-01')), x.get('id', 0))
+            articles_sorted = sorted(matches, key=sort_key, reverse=True)
+            total = len(articles_sorted)
+            if cursor:
+                after = decode_cursor(cursor, sort_by)
+                try:
+                    articles_sorted = [article for article in articles_sorted if sort_key(article) < after]
+                except TypeError:
+                    raise ValueError(f"Cursor does not match the '{sort_by}' order")
+                start_index, end_index = 0, per_page
+            articles_slice = articles_sorted[start_index:end_index + 1]
+            key_of = lambda article: sort_key(article)[0]
+        else:
+            article_ids = None
+            if search_term:
+                # Même logique de recherche floue que _matches_search, via l'index de trigrammes
+                # (reconstruit et mis à jour en même temps que _positions)
+                article_ids = self.title_index.search(search_term.lower())
+            total = len(self._cache) if article_ids is None else len(article_ids)
+            
+            if sort_by == 'order':
+                # Garder l'ordre d'insertion (ordre original)
+                key_of = lambda article: None
+                if article_ids is None:
+                    if cursor:
+                        start_index = self._cursor_position(cursor) + 1
+                        end_index = start_index + per_page
+                    articles_slice = self._cache[start_index:end_index + 1]
+                else:
+                    positions = sorted(self._positions[article_id] for article_id in article_ids)
+                    if cursor:
+                        start_index = bisect.bisect_right(positions, self._cursor_position(cursor))
+                        end_index = start_index + per_page
+                    articles_slice = [self._cache[position] for position in positions[start_index:end_index + 1]]
+            else:
+                # Ordres pré-triés, tenus à jour à chaque modification ('relevance' sans recherche : par date)
+                order = 'date' if sort_by == 'relevance' else sort_by
+                if cursor:
+                    page_ids = self.sort_index.get_page_after(order, decode_cursor(cursor, sort_by),
+                                                              per_page + 1, article_ids)
+                else:
+                    page_ids = self.sort_index.get_page(order, start_index, end_index + 1, article_ids)
+                articles_slice = [self._cache[self._positions[article_id]] for article_id in page_ids]
+                key_of = lambda article: self.sort_index.get_key(order, article.get("id"))
+        
+        next_cursor = None
+        if len(articles_slice) > per_page:
+            articles_slice = articles_slice[:per_page]
+            next_cursor = encode_cursor(sort_by, key_of(articles_slice[-1]), articles_slice[-1].get("id"))
         
         # Create titles with minimal data
         titles = []
@@ -242,12 +406,143 @@ class ArticleCache:
             "pagination": {
                 "page": page,
                 "per_page": per_page,
-                "total": len(articles),
+                "total": total,
                 "returned": len(titles),
-                "sort_by": sort_by
+                "sort_by": sort_by,
+                "next_cursor": next_cursor
             }
         }
     
+    def apply_patch(self, article_id: int, fields: Optional[Dict] = None,
+                    increments: Optional[Dict] = None) -> bool:
+        """
+        Update a single cached article in place instead of invalidating the cache
+
+        Args:
+            article_id: ID of the patched article
+            fields: Values that were set
+            increments: Numeric fields that were added to
+
+        Returns:
+            True if the article was found in the cache
+        """
+        with self._lock:
+            position = self._positions.get(article_id)
+            if position is None:
+                return False
+            self._acknowledge_write()
+
+            # Replace the article: the old one may still be referenced by readers
+            updated = self._cache[position].copy()
+            updated.update(fields or {}, increments)
+            if fields and "content" in fields and updated.id is not None:
+                content_store.put(updated.id, updated.content)
+                updated.unload_content()
+            updated.freeze()
+            self._cache[position] = updated
+            self._snapshot = None
+            self._generation += 1
+            if fields and "tags" in fields:
+                self.tag_index.set_article_tags(article_id, updated.get("tags") or [])
+            if fields and "title" in fields:
+                self.title_index.set_article_title(article_id, updated.get("title"))
+            if fields and any(field in fields for field in INDEXED_FIELDS):
+                self.search_index.set_article(updated)
+            # Only moves the article in the orders whose key changed
+            self.sort_index.set_article(updated)
+
+            if DEBUG_LOGGING:
+                print(f"[CACHE] Article {article_id} patched in cache")
+            return True
+
+    def apply_insert(self, articles: List[Dict]) -> None:
+        """Append newly stored articles to the cache instead of invalidating it"""
+        with self._lock:
+            if self._data_version is None:
+                # Nothing loaded yet: the next read loads everything anyway
+                return
+            self._acknowledge_write()
+            content_store.put_many((article["id"], article.get("content", "")) for article in articles
+                                   if article.get("id") is not None and article.get("id") not in self._positions)
+            for article in articles:
+                if article.get("id") in self._positions:
+                    continue
+                article = self._unloaded(Article.from_dict(article))
+                self._positions[article.get("id")] = len(self._cache)
+                self._cache.append(article)
+                self.tag_index.set_article_tags(article.get("id"), article.get("tags") or [])
+                self.title_index.set_article_title(article.get("id"), article.get("title"))
+                self.search_index.set_article(article)
+                self.sort_index.set_article(article)
+            self._snapshot = None
+            self._generation += 1
+
+            if DEBUG_LOGGING:
+                print(f"[CACHE] {len(articles)} new articles added to cache")
+
+    def filter_by_tags(self, tags: List[str], match: str = "any") -> Sequence[Article]:
+        """
+        Get the articles carrying the given tags, in cache order
+
+        Args:
+            tags: Tags to filter on
+            match: 'any' (OR) or 'all' (AND)
+
+        Returns:
+            List of matching articles
+        """
+        articles = self.get_articles()
+        if not tags:
+            return articles
+        positions = sorted(self._positions[article_id]
+                           for article_id in self.tag_index.get_article_ids(tags, match)
+                           if article_id in self._positions)
+        return [articles[position] for position in positions]
+
+    def get_all_tags(self) -> List[str]:
+        """Get all unique tags from the cached articles, plus the basic tags"""
+        self.get_articles()
+        return sorted(set(self.tag_index.get_tags()) | set(BASIC_TAGS))
+
+    def get_tag_counts(self) -> Dict[str, int]:
+        """Get the number of cached articles per tag"""
+        self.get_articles()
+        return self.tag_index.get_counts()
+
+    def _acknowledge_write(self) -> None:
+        """
+        Mark a storage write notified through a listener as already applied
+
+        Only accepted when it is the single write since the version the cache
+        reflects; if other writes happened in between, the cache keeps its old
+        version and the next read reloads.
+        """
+        data_version = ArticleManager.get_data_version()
+        if self._data_version is not None and data_version[0] - self._data_version[0] <= 1:
+            self._data_version = data_version
+
+    def _rebuild_indexes(self, sync_search_index: bool = True) -> None:
+        """Rebuild the id, tag, title and sort indexes (and sync the search index) after a full reload"""
+        self._generation += 1
+        self._snapshot = None
+        self._positions = {article.get("id"): i for i, article in enumerate(self._cache)}
+        self.tag_index.build(self._cache)
+        self.title_index.build(self._cache)
+        self.sort_index.build(self._cache)
+        if not sync_search_index:
+            return
+        try:
+            # Only re-tokenizes the articles that changed since the persisted index
+            self.search_index.sync(self._cache)
+        except Exception as e:
+            if DEBUG_LOGGING:
+                print(f"[CACHE] Error syncing search index: {e}")
+
+    def close(self) -> None:
+        """Stop following storage writes (for caches other than the global one)"""
+        ArticleManager.remove_patch_listener(self.apply_patch)
+        ArticleManager.remove_insert_listener(self.apply_insert)
+
     def update_cache_after_modification(self) -> None:
         """Update cache after articles have been modified externally"""
         self.invalidate_cache()
@@ -259,7 +554,7 @@ class ArticleCache:
 article_cache = ArticleCache()
 
 
-def get_cached_articles(force_refresh: bool = False) -> List[Dict]:
+def get_cached_articles(force_refresh: bool = False) -> Sequence[Article]:
     """Get articles from the global cache"""
     return article_cache.get_articles(force_refresh)
 
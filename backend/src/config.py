@@ -7,9 +7,30 @@ import os
 
 # File paths
 JSON_FILE = "./data/articles_seen.json"
+ARTICLES_LOG_FILE = "./data/articles_seen.log"
+ARTICLES_DB_FILE = "./data/articles.db"
+SEARCH_INDEX_FILE = "./data/search_index.json"
+HTTP_CACHE_FILE = "./data/http_cache.json"
+LLM_CACHE_FILE = "./data/llm_cache.db"
+CONTENT_STORE_FILE = "./data/article_contents.bin"
+CONTENT_INDEX_FILE = "./data/article_contents.json"
+SEEN_INDEX_FILE = "./data/seen_index.json"
+JOB_QUEUE_FILE = "./data/jobs.db"
+
+# Storage settings
+# "json": every save rewrites the whole JSON file, so each rating, comment or
+#         tag change still loads and rewrites every article (O(N) per write)
+# "log": saves append field patches to ARTICLES_LOG_FILE, merged into JSON_FILE in the background
+# "sqlite": articles live in ARTICLES_DB_FILE (migrated once from JSON_FILE)
+STORAGE_ENGINE = os.getenv("STORAGE_ENGINE", "json")
+LOG_COMPACTION_THRESHOLD = 500  # Number of log records before merging them into the snapshot
 
 # Cache settings
-CACHE_DURATION = 60  # Cache valid for 60 seconds
+JSON_RESPONSE_CACHE_SIZE = 256  # Encoded responses kept for the read endpoints
+CONTENT_CACHE_SIZE = 64  # Article bodies kept in memory after being read from the content store
+
+# Reading time settings
+READING_TIME_FLUSH_INTERVAL = 30  # Buffered reading-time heartbeats are written every 30 seconds
 
 # TechCrunch scraping settings
 TECHCRUNCH_URL = "https://techcrunch.com/category/artificial-intelligence/"
@@ -58,7 +79,58 @@ REQUIRED_TAGS = ["ia", "politique"]
 BASIC_TAGS = []
 
 # Scraping intervals
-SCRAPING_INTERVAL = 1800  # 30 minutes in seconds
+SCRAPING_INTERVAL = 1800  # 30 minutes in seconds (default polling interval of a source)
+SCRAPER_MAX_WORKERS = 4  # Article bodies fetched in parallel per source (default budget)
+SCRAPER_HOST_INTERVAL = 1.0  # Minimum seconds between two requests to the same host
+
+# Adaptive polling: the interval of a source follows its hit rate (new articles per poll, smoothed)
+SCRAPER_MIN_INTERVAL = 300  # Shortest interval of a busy source (5 minutes)
+SCRAPER_MAX_INTERVAL = 7200  # Longest interval of a quiet source (2 hours)
+SCRAPER_INTERVAL_FACTOR = 1.5  # Interval multiplied (quiet) or divided (busy) by this factor after a poll
+SCRAPER_BUSY_HIT_RATE = 3.0  # Hit rate above which the source is polled more often
+SCRAPER_QUIET_HIT_RATE = 0.5  # Hit rate below which the source is polled less often
+SCRAPER_HIT_RATE_SMOOTHING = 0.3  # Weight of the latest poll in the hit rate (exponential moving average)
+
+# Scraping sources, each run on its own schedule by the scraping service
+# "scraper": registered implementation (see scraper.registry)
+# "listing_urls": pages listing the articles, "selectors": CSS classes read by the scraper
+# "required_tag": tag added to every article, "interval": seconds before the second poll, then adapted
+# "min_interval"/"max_interval": optional bounds overriding SCRAPER_MIN_INTERVAL/SCRAPER_MAX_INTERVAL
+# "max_workers": article pages downloaded in parallel, "enabled": set to False to skip the source
+SCRAPER_SOURCES = {
+    "techcrunch": {
+        "scraper": "techcrunch",
+        "source": TECHCRUNCH_SOURCE,
+        "listing_urls": [TECHCRUNCH_URL],
+        "selectors": {"title": TITLE_CLASS, "paragraph": PARAGRAPH_CLASS},
+        "required_tag": TAG_CATEGORIES["ia"]["main_tag"],
+        "interval": 600,  # Listing souvent mis à jour, et un 304 ne coûte presque rien
+        "max_workers": SCRAPER_MAX_WORKERS
+    },
+    "france_info": {
+        "scraper": "france_info",
+        "source": FRANCE_INFO_SOURCE,
+        "listing_urls": [FRANCE_INFO_POLITIQUE_URL],
+        "base_url": FRANCE_INFO_BASE_URL,
+        "selectors": {"cards": FRANCE_INFO_CARD_CLASSES, "content": FRANCE_INFO_CONTENT_CLASS},
+        "required_tag": TAG_CATEGORIES["politique"]["main_tag"],
+        "interval": SCRAPING_INTERVAL,
+        "max_workers": 2
+    }
+}
+
+# Pretreatment settings
+PRETREATMENT_WORKERS = 4  # Articles sent to the AI model in parallel
+PRETREATMENT_MAX_IN_FLIGHT = 2  # Default requests in flight per model (overridable with "max_in_flight" in models.json)
+PRETREATMENT_BATCH_SIZE = 5  # Pretreated articles written per storage patch
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024  # Cached AI responses kept on disk before LRU eviction
+PRETREATMENT_QUEUE = "pretreatment"  # Job queue fed with the ids of new articles
+PRETREATMENT_POLL_INTERVAL = 5  # Seconds the pretreatment consumer waits when its queue is empty
+
+# Job queue settings
+JOB_MAX_ATTEMPTS = 5  # Attempts of a job before it is dead-lettered
+JOB_RETRY_DELAY = 60  # Seconds before the first retry of a failed job, doubled on each attempt
+JOB_VISIBILITY_TIMEOUT = 600  # Seconds a claimed job stays hidden before another consumer can take it
 
 # Flask settings
 CORS_ORIGINS = ['http://localhost:5173', 'http://localhost:3000']
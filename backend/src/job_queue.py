@@ -0,0 +1,217 @@
+"""
+Job queue module for News Summary Backend
+Durable SQLite-backed queue handing work from one stage to the next (scraped articles to pretreatment)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import (DEBUG_LOGGING, JOB_MAX_ATTEMPTS, JOB_QUEUE_FILE, JOB_RETRY_DELAY,
+                    JOB_VISIBILITY_TIMEOUT)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    queue TEXT NOT NULL,
+    key TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    UNIQUE (queue, key)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(queue, status, available_at);
+"""
+
+
+class JobQueue:
+    """
+    Persistent queues of jobs with retries, dead-lettering and visibility timeouts
+
+    A claimed job is leased to its consumer for a visibility timeout: if it
+    is neither acknowledged nor failed in time (crashed or stuck consumer),
+    it becomes claimable again. A failed job is retried with an exponential
+    delay until it has used max_attempts, then it is dead-lettered: it stays
+    in the table with its last error until requeue_dead() is called.
+    Acknowledged jobs are deleted. A job enqueued with a key is ignored while
+    a job with the same key is still in its queue (pending, running or dead).
+    """
+
+    def __init__(self, queue_file: str = JOB_QUEUE_FILE, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 retry_delay: float = JOB_RETRY_DELAY, visibility_timeout: float = JOB_VISIBILITY_TIMEOUT):
+        self.queue_file = queue_file
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.visibility_timeout = visibility_timeout
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def enqueue(self, queue: str, payload: Dict, key: Optional[str] = None) -> bool:
+        """
+        Add a job to a queue
+
+        Args:
+            queue: Name of the queue
+            payload: JSON-serializable job data
+            key: Optional deduplication key within the queue
+
+        Returns:
+            True if the job was added (False if its key is already queued)
+        """
+        return self.enqueue_many(queue, [(key, payload)]) == 1
+
+    def enqueue_many(self, queue: str, jobs: Iterable[Tuple[Optional[str], Dict]]) -> int:
+        """
+        Add several (key, payload) jobs to a queue in one transaction
+
+        Returns:
+            Number of jobs added
+        """
+        now = time.time()
+        rows = [(queue, key, json.dumps(payload, ensure_ascii=False), self.max_attempts, now, now)
+                for key, payload in jobs]
+        if not rows:
+            return 0
+        with self._lock:
+            connection = self._connect()
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO jobs (queue, key, payload, max_attempts, available_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            connection.commit()
+            added = connection.total_changes - before
+        if DEBUG_LOGGING and added:
+            print(f"[JOB_QUEUE] Enqueued {added} jobs in '{queue}'")
+        return added
+
+    def claim(self, queue: str, limit: int = 1, visibility_timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Lease the next jobs of a queue
+
+        Args:
+            queue: Name of the queue
+            limit: Maximum number of jobs to claim
+            visibility_timeout: Seconds before unacknowledged jobs can be claimed again
+
+        Returns:
+            Claimed jobs ({"id", "payload", "attempts"}), oldest first
+        """
+        now = time.time()
+        lease_until = now + (self.visibility_timeout if visibility_timeout is None else visibility_timeout)
+        with self._lock:
+            connection = self._connect()
+            # Expired leases that used their last attempt are dead-lettered instead of retried
+            connection.execute(
+                "UPDATE jobs SET status = 'dead', lease_until = NULL, "
+                "last_error = COALESCE(last_error, 'Visibility timeout expired') "
+                "WHERE queue = ? AND status = 'running' AND lease_until <= ? AND attempts >= max_attempts",
+                (queue, now)
+            )
+            rows = connection.execute(
+                "SELECT id, payload, attempts FROM jobs WHERE queue = ? AND "
+                "((status = 'pending' AND available_at <= ?) OR (status = 'running' AND lease_until <= ?)) "
+                "ORDER BY available_at, id LIMIT ?",
+                (queue, now, now, limit)
+            ).fetchall()
+            connection.executemany(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ? WHERE id = ?",
+                [(lease_until, row[0]) for row in rows]
+            )
+            connection.commit()
+        return [{"id": row[0], "payload": json.loads(row[1]), "attempts": row[2] + 1} for row in rows]
+
+    def ack(self, job_id: int) -> bool:
+        """Remove a job once it has been processed"""
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute("DELETE FROM jobs WHERE id = ? AND status = 'running'", (job_id,))
+            connection.commit()
+            return cursor.rowcount > 0
+
+    def fail(self, job_id: int, error: str = "") -> Optional[str]:
+        """
+        Record a failed attempt, scheduling a retry or dead-lettering the job
+
+        Args:
+            job_id: ID of a claimed job
+            error: Error message kept with the job
+
+        Returns:
+            New status of the job ("pending" or "dead"), None if the job is unknown
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'running'", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            attempts, max_attempts = row
+            if attempts >= max_attempts:
+                status, available_at = "dead", time.time()
+            else:
+                status, available_at = "pending", time.time() + self.retry_delay * 2 ** (attempts - 1)
+            connection.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_until = NULL, last_error = ? WHERE id = ?",
+                (status, available_at, error, job_id)
+            )
+            connection.commit()
+        if DEBUG_LOGGING:
+            print(f"[JOB_QUEUE] Job {job_id} failed (attempt {attempts}/{max_attempts}), now {status}: {error}")
+        return status
+
+    def get_dead(self, queue: str, limit: int = 100) -> List[Dict]:
+        """Get the dead-lettered jobs of a queue with their last error"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id, payload, attempts, last_error FROM jobs WHERE queue = ? AND status = 'dead' "
+                "ORDER BY id LIMIT ?",
+                (queue, limit)
+            ).fetchall()
+        return [{"id": row[0], "payload": json.loads(row[1]), "attempts": row[2], "last_error": row[3]}
+                for row in rows]
+
+    def requeue_dead(self, queue: str) -> int:
+        """Give the dead-lettered jobs of a queue a fresh set of attempts"""
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, available_at = ? "
+                "WHERE queue = ? AND status = 'dead'",
+                (time.time(), queue)
+            )
+            connection.commit()
+            return cursor.rowcount
+
+    def get_stats(self, queue: str) -> Dict:
+        """Get the number of jobs of a queue by status"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE queue = ? GROUP BY status", (queue,)
+            ).fetchall()
+        stats = {"pending": 0, "running": 0, "dead": 0}
+        stats.update(dict(rows))
+        return stats
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.queue_file) or ".", exist_ok=True)
+            # Shared by the producers and consumers; every access holds self._lock
+            self._connection = sqlite3.connect(self.queue_file, check_same_thread=False, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+
+# Global job queue instance
+job_queue = JobQueue()
@@ -0,0 +1,126 @@
+"""
+JSON response cache module for News Summary Backend
+Keeps the encoded bytes of read endpoints and answers conditional requests with 304
+"""
+
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import Response, make_response, request
+
+from cache import article_cache
+from config import DEBUG_LOGGING, JSON_RESPONSE_CACHE_SIZE
+
+
+class JsonResponseCache:
+    """
+    LRU cache of encoded JSON responses
+
+    Entries are keyed by (endpoint, normalized parameters, data generation).
+    Any change to the cached articles bumps the generation, so stale entries
+    are never served and simply age out.
+    """
+
+    def __init__(self, max_entries: int = JSON_RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+
+    def get(self, key: Tuple) -> Optional[Tuple[bytes, str]]:
+        """Get the (body, etag) stored for a key"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: Tuple, body: bytes) -> Tuple[bytes, str]:
+        """Store an encoded body and return it with its strong ETag"""
+        entry = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self._not_modified += 1
+
+    def clear(self) -> None:
+        """Drop every stored response"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "not_modified": self._not_modified
+            }
+
+
+# Global JSON response cache instance
+json_response_cache = JsonResponseCache()
+
+
+def _normalized_params(view_args: Dict) -> str:
+    """Canonical form of everything that can change a read endpoint's output"""
+    params = {
+        "view": view_args,
+        "args": sorted((key, value) for key, values in request.args.lists() for value in values)
+    }
+    if request.method == "POST":
+        params["body"] = request.get_json(silent=True)
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def cached_json(view: Callable) -> Callable:
+    """
+    Serve a read endpoint from the JSON response cache
+
+    Only 200 JSON responses are stored. Every response carries a strong ETag,
+    and a matching If-None-Match gets an empty 304.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = (request.endpoint, _normalized_params(kwargs), article_cache.get_generation())
+        entry = json_response_cache.get(key)
+
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or not response.is_json:
+                return response
+            entry = json_response_cache.put(key, response.get_data())
+        elif DEBUG_LOGGING:
+            print(f"[JSON_CACHE] Serving {request.endpoint} from cache")
+
+        body, etag = entry
+        if etag.strip('"') in request.if_none_match:
+            json_response_cache.record_not_modified()
+            not_modified = Response(status=304)
+            not_modified.headers["ETag"] = etag
+            return not_modified
+
+        cached = Response(body, status=200, mimetype="application/json")
+        cached.headers["ETag"] = etag
+        return cached
+
+    return wrapper
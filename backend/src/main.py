@@ -20,11 +20,13 @@ Architecture:
 - main.py: Application initialization and startup
 """
 
+from ai import start_pretreatment
 from cache import article_cache
 # Import our modular components
 from config import CORS_ORIGINS, DEBUG_LOGGING, get_port, is_development
 from flask import Flask
 from flask_cors import CORS
+from reading_time import start_reading_time_buffer, stop_reading_time_buffer
 from routes import register_routes
 from scraper import start_scraper
 
@@ -60,6 +62,16 @@ def initialize_services():
         if DEBUG_LOGGING:
             print("[MAIN] Article cache initialized")
         
+        # Start the batched reading time writer
+        start_reading_time_buffer()
+        if DEBUG_LOGGING:
+            print("[MAIN] Reading time buffer started")
+
+        # Start the pretreatment queue consumer (before the scraper, which feeds its queue)
+        start_pretreatment()
+        if DEBUG_LOGGING:
+            print("[MAIN] Pretreatment queue consumer started")
+
         # Start the background scraping service
         start_scraper()
         if DEBUG_LOGGING:
@@ -100,6 +112,7 @@ def main():
     except KeyboardInterrupt:
         if DEBUG_LOGGING:
             print("\n[MAIN] Shutting down gracefully...")
+        stop_reading_time_buffer()
     except Exception as e:
         if DEBUG_LOGGING:
             print(f"[MAIN] Fatal error: {e}")
@@ -4,9 +4,13 @@ Contains data models and managers organized by functionality
 """
 
 from .article import Article
+from .article_log import ArticleLog
 from .article_manager import ArticleManager
 from .article_operations import ArticleOperations
 from .article_queries import ArticleQueries
+from .article_sqlite import ArticleDatabase
 from .article_storage import ArticleStorage
 from .chat_manager import ChatManager
+from .content_store import ContentStore
+from .seen_index import SeenIndex
 from .tags import normalize_tag, normalize_tags
\ No newline at end of file
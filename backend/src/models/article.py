@@ -3,18 +3,52 @@ Article model module for News Summary Backend
 Contains the Article data model class
 """
 
+import sys
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+from .content_store import content_store
 from .tags import normalize_tags
 
+# Fields stored in slots, in the order they are serialized
+FIELDS = ("title", "url", "content", "has_been_pretreat", "rating", "time_spent", "comments",
+          "tags", "source", "scraped_date", "id", "date")
+
+# Slot names (the body is stored behind the content property)
+SLOTS = tuple("_content" if field == "content" else field for field in FIELDS)
+
+# Fields left out of to_dict (and reported as missing by get) while unset
+OPTIONAL_FIELDS = ("id", "date")
+
+_MISSING = object()
+
+# Stored in place of a body that lives in the content store
+LAZY_CONTENT = object()
+
 
 class Article:
-    """Article data model"""
+    """
+    Article data model
+
+    A __slots__ record, used both for freshly scraped articles and as the
+    in-memory representation of the cached articles. Tags are stored as a
+    tuple and tags and source strings are interned, since the same few values
+    repeat across every article. Fields without a slot are kept in `extra`.
+
+    Articles also offer dict-style reads (get, [], in) so that code working on
+    stored dicts works on them unchanged. The cache freezes its articles:
+    setting an attribute on a frozen article raises TypeError. It also
+    unloads their bodies, which are then read from the content store on
+    access.
+    """
+
+    __slots__ = SLOTS + ("extra", "_frozen")
 
     def __init__(self, title: str, url: str, content: str = "", has_been_pretreat: bool = False,
                  rating: Optional[int] = None, time_spent: int = 0, comments: str = "",
-                 tags: Optional[List[str]] = None, source: str = "", scraped_date: Optional[str] = None):
+                 tags: Optional[List[str]] = None, source: str = "", scraped_date: Optional[str] = None,
+                 article_id: Optional[int] = None, date: Optional[str] = None,
+                 extra: Optional[Dict] = None):
         self.title = title
         self.url = url
         self.content = content
@@ -22,16 +56,93 @@ class Article:
         self.rating = rating  # Note de 1 à 5 étoiles
         self.time_spent = time_spent  # Temps passé en secondes
         self.comments = comments  # Commentaires personnels
-        self.tags = normalize_tags(tags or [])  # Liste des tags normalisés
+        self.tags = normalize_tags(tags or [])  # Tuple des tags normalisés
         self.source = source  # Source de l'article (TechCrunch, France Info, etc.)
         self.scraped_date = scraped_date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # Date et heure de scraping
+        self.id = article_id
+        self.date = date
+        self.extra = extra or None  # Champs sans slot, None si aucun
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise TypeError("cached articles are read-only, use to_dict() or copy() to modify one")
+        if name == "tags":
+            value = tuple(sys.intern(tag) for tag in value or ())
+        elif name == "source" and value:
+            value = sys.intern(value)
+        object.__setattr__(self, name, value)
+
+    @property
+    def content(self) -> str:
+        content = self._content
+        if content is LAZY_CONTENT:
+            return content_store.get(self.id) or ""
+        return content
+
+    @content.setter
+    def content(self, value: str) -> None:
+        object.__setattr__(self, "_content", value)
 
-    def to_dict(self) -> Dict:
-        """Convert article to dictionary"""
-        return {
+    def unload_content(self) -> None:
+        """Drop the body from memory; it must already be in the content store"""
+        if self.id is not None:
+            self._content = LAZY_CONTENT
+
+    def freeze(self) -> 'Article':
+        """Make the article read-only and return it"""
+        object.__setattr__(self, "_frozen", True)
+        return self
+
+    def copy(self) -> 'Article':
+        """Get a mutable copy of the article (an unloaded body stays unloaded)"""
+        article = object.__new__(Article)
+        for name in SLOTS:
+            object.__setattr__(article, name, getattr(self, name))
+        object.__setattr__(article, "extra", dict(self.extra) if self.extra else None)
+        return article
+
+    def update(self, fields: Dict, increments: Optional[Dict] = None) -> None:
+        """
+        Set fields and add to numeric fields, like a storage patch
+
+        Args:
+            fields: Values to set (unknown fields go to extra)
+            increments: Numeric fields to add to
+        """
+        for key, value in fields.items():
+            self._set_field(key, value)
+        for key, amount in (increments or {}).items():
+            self._set_field(key, (self.get(key) or 0) + amount)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a field like dict.get (unset optional fields count as missing)"""
+        if key in FIELDS:
+            value = getattr(self, key)
+            if value is None and key in OPTIONAL_FIELDS:
+                return default
+            return value
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __repr__(self) -> str:
+        return f"Article(id={self.id!r}, title={self.title!r})"
+
+    def to_dict(self, include_content: bool = True) -> Dict:
+        """Convert article to dictionary (without "content" if include_content is False)"""
+        data = {
             "title": self.title,
             "url": self.url,
-            "content": self.content,
+            "content": self.content if include_content else None,
             "has_been_pretreat": self.has_been_pretreat,
             "rating": self.rating,
             "time_spent": self.time_spent,
@@ -40,6 +151,15 @@ class Article:
             "source": self.source,
             "scraped_date": self.scraped_date
         }
+        if self.id is not None:
+            data["id"] = self.id
+        if self.date is not None:
+            data["date"] = self.date
+        if self.extra:
+            data.update(self.extra)
+        if not include_content:
+            del data["content"]
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Article':
@@ -52,7 +172,18 @@ class Article:
             rating=data.get("rating"),
             time_spent=data.get("time_spent", 0),
             comments=data.get("comments", ""),
-            tags=normalize_tags(data.get("tags", [])),  # Normaliser les tags lors du chargement
+            tags=data.get("tags", []),  # Normalisés par le constructeur lors du chargement
             source=data.get("source", ""),
-            scraped_date=data.get("scraped_date", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        )
\ No newline at end of file
+            scraped_date=data.get("scraped_date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            article_id=data.get("id"),
+            date=data.get("date"),
+            extra={key: value for key, value in data.items() if key not in FIELDS}
+        )
+
+    def _set_field(self, key: str, value: Any) -> None:
+        if key in FIELDS:
+            setattr(self, key, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
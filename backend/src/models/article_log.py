@@ -0,0 +1,346 @@
+"""
+Article Log module for News Summary Backend
+Contains the append-only mutation log used by the "log" storage engine
+"""
+
+import copy
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config import (ARTICLES_LOG_FILE, DEBUG_LOGGING, JSON_FILE,
+                    LOG_COMPACTION_THRESHOLD)
+
+
+class ArticleLog:
+    """
+    Snapshot + append-only log of article mutations
+
+    The snapshot is the regular articles JSON file. Every save only appends
+    the fields that changed since the previous save, one JSON record per line:
+
+        {"op": "set", "id": 3, "fields": {"rating": 4}}
+        {"op": "add", "article": {...}}
+        {"op": "delete", "id": 7}
+
+    Records are idempotent, so replaying a log twice gives the same result.
+    Once the log grows past the compaction threshold it is merged into the
+    snapshot by a background thread.
+    """
+
+    def __init__(self, snapshot_file: str = JSON_FILE, log_file: str = ARTICLES_LOG_FILE,
+                 compaction_threshold: int = LOG_COMPACTION_THRESHOLD):
+        self.snapshot_file = snapshot_file
+        self.log_file = log_file
+        self.compacting_file = log_file + ".compacting"
+        self.compaction_threshold = compaction_threshold
+        self._lock = threading.RLock()
+        self._state: Optional[List[Dict]] = None  # Materialized snapshot + log
+        self._index: Dict[int, int] = {}  # Article id -> position in _state
+        self._record_count = 0
+        self._signature: Optional[Tuple] = None
+        self._compaction_thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def load(self) -> List[Dict]:
+        """Return the articles as of the last record in the log"""
+        with self._lock:
+            self._ensure_loaded()
+            return [self._copy_article(article) for article in self._state]
+
+    def save(self, articles: List[Dict]) -> int:
+        """
+        Persist a full article list by appending only what changed
+
+        Args:
+            articles: Complete list of articles, each with an "id"
+
+        Returns:
+            Number of log records appended
+        """
+        with self._lock:
+            self._ensure_loaded()
+            records = self._diff(articles)
+            if records:
+                self._append(records)
+            return len(records)
+
+    def append_records(self, records: List[Dict]) -> None:
+        """Append already-built mutation records and apply them to the materialized state"""
+        if not records:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            self._append(records)
+
+    def patch(self, article_id: int, fields: Optional[Dict] = None, increments: Optional[Dict] = None) -> bool:
+        """
+        Append a single "set" record for one article
+
+        Increments are resolved against the materialized state so that the
+        record stores absolute values and stays idempotent.
+
+        Returns:
+            True if the article exists
+        """
+        return self.patch_many([(article_id, fields or {}, increments or {})])[0]
+
+    def patch_many(self, patches: List[Tuple[int, Dict, Dict]]) -> List[bool]:
+        """
+        Apply several (article_id, fields, increments) patches with a single append
+
+        Returns:
+            For each patch, True if the article exists
+        """
+        with self._lock:
+            self._ensure_loaded()
+            records = []
+            results = []
+            pending: Dict[int, Dict] = {}  # Values of earlier patches of the same batch
+            for article_id, fields, increments in patches:
+                position = self._index.get(article_id)
+                if position is None:
+                    results.append(False)
+                    continue
+
+                current = self._state[position]
+                values = copy.deepcopy(fields) if fields else {}
+                for key, amount in (increments or {}).items():
+                    base = pending.get(article_id, {}).get(key, current.get(key))
+                    values[key] = (base or 0) + amount
+                if values:
+                    pending.setdefault(article_id, {}).update(values)
+                    records.append({"op": "set", "id": article_id, "fields": values})
+                results.append(True)
+
+            if records:
+                self._append(records)
+            return results
+
+    def compact(self) -> bool:
+        """
+        Merge the log into the snapshot
+
+        The active log is first renamed so that new saves can keep appending
+        while the snapshot is rewritten.
+
+        Returns:
+            True if a compaction was performed
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._record_count == 0 and not os.path.exists(self.compacting_file):
+                return False
+            if os.path.exists(self.log_file) and not os.path.exists(self.compacting_file):
+                os.replace(self.log_file, self.compacting_file)
+            snapshot = [self._copy_article(article) for article in self._state]
+            merged_records = self._record_count
+            self._record_count = 0
+
+        try:
+            self._write_snapshot(snapshot)
+            if os.path.exists(self.compacting_file):
+                os.remove(self.compacting_file)
+        except Exception as e:
+            if DEBUG_LOGGING:
+                print(f"[MODELS] Error compacting article log: {e}")
+            raise
+        finally:
+            with self._lock:
+                self._signature = self._current_signature()
+
+        if DEBUG_LOGGING:
+            print(f"[MODELS] Compacted {merged_records} log records into {self.snapshot_file}")
+        return True
+
+    def get_log_info(self) -> Dict:
+        """Get information about the current log status"""
+        with self._lock:
+            return {
+                "log_file": self.log_file,
+                "pending_records": self._record_count,
+                "compaction_threshold": self.compaction_threshold,
+                "compaction_running": self._is_compaction_running()
+            }
+
+    def reset(self) -> None:
+        """Drop the materialized state so the next access re-reads the files"""
+        with self._lock:
+            self._state = None
+            self._index = {}
+            self._record_count = 0
+            self._signature = None
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self) -> None:
+        """Load snapshot + log, or reload them if another writer touched the files"""
+        if self._state is not None and self._signature == self._current_signature():
+            return
+
+        state = self._read_snapshot()
+        self._state = state
+        self._reindex()
+        self._record_count = 0
+        for path in (self.compacting_file, self.log_file):
+            for record in self._read_records(path):
+                self._apply(record)
+                self._record_count += 1
+        self._signature = self._current_signature()
+
+        if DEBUG_LOGGING:
+            print(f"[MODELS] Replayed {self._record_count} log records over {len(state)} articles")
+
+    def _diff(self, articles: List[Dict]) -> List[Dict]:
+        """Build the log records turning the current state into `articles`"""
+        records = []
+        seen_ids = set()
+        for article in articles:
+            article_id = article.get("id")
+            seen_ids.add(article_id)
+            position = self._index.get(article_id)
+            if position is None:
+                records.append({"op": "add", "article": self._copy_article(article)})
+                continue
+
+            current = self._state[position]
+            changed = {key: copy.deepcopy(value) for key, value in article.items()
+                       if key not in current or current[key] != value}
+            if changed:
+                records.append({"op": "set", "id": article_id, "fields": changed})
+
+        for article in self._state:
+            if article.get("id") not in seen_ids:
+                records.append({"op": "delete", "id": article.get("id")})
+
+        return records
+
+    def _append(self, records: List[Dict]) -> None:
+        """Write records to the log file and apply them in memory"""
+        os.makedirs(os.path.dirname(self.log_file) or ".", exist_ok=True)
+        payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        for record in records:
+            self._apply(record)
+        self._record_count += len(records)
+        self._signature = self._current_signature()
+
+        if DEBUG_LOGGING:
+            print(f"[MODELS] Appended {len(records)} records to article log")
+
+        if self._record_count >= self.compaction_threshold:
+            self._schedule_compaction()
+
+    def _apply(self, record: Dict) -> None:
+        """Apply a single log record to the materialized state"""
+        op = record.get("op")
+        if op == "set":
+            position = self._index.get(record.get("id"))
+            if position is not None:
+                self._state[position].update(record.get("fields", {}))
+        elif op == "add":
+            article = record.get("article", {})
+            position = self._index.get(article.get("id"))
+            if position is None:
+                self._index[article.get("id")] = len(self._state)
+                self._state.append(article)
+            else:
+                self._state[position] = article
+        elif op == "delete":
+            position = self._index.get(record.get("id"))
+            if position is not None:
+                del self._state[position]
+                self._reindex()
+
+    def _reindex(self) -> None:
+        self._index = {article.get("id"): i for i, article in enumerate(self._state)}
+
+    def _schedule_compaction(self) -> None:
+        if self._is_compaction_running():
+            return
+        self._compaction_thread = threading.Thread(target=self._compact_in_background, daemon=True)
+        self._compaction_thread.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception:
+            # Records stay in the log and will be merged by the next compaction
+            pass
+
+    def _is_compaction_running(self) -> bool:
+        return self._compaction_thread is not None and self._compaction_thread.is_alive()
+
+    def _read_snapshot(self) -> List[Dict]:
+        if not os.path.exists(self.snapshot_file):
+            return []
+        try:
+            with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                articles = json.load(f)
+            for i, article in enumerate(articles):
+                if "id" not in article or article["id"] is None:
+                    article["id"] = i
+            return articles
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            if DEBUG_LOGGING:
+                print(f"[MODELS] Error loading article snapshot: {e}")
+            return []
+
+    def _write_snapshot(self, articles: List[Dict]) -> None:
+        """Atomically replace the snapshot file"""
+        os.makedirs(os.path.dirname(self.snapshot_file) or ".", exist_ok=True)
+        tmp_file = self.snapshot_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(articles, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+
+    @staticmethod
+    def _read_records(path: str) -> List[Dict]:
+        if not os.path.exists(path):
+            return []
+        records = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn write can only affect the last line; skip it
+                    if DEBUG_LOGGING:
+                        print(f"[MODELS] Skipping corrupted log record at {path}:{line_number}")
+        return records
+
+    def _current_signature(self) -> Tuple:
+        signature = []
+        for path in (self.snapshot_file, self.compacting_file, self.log_file):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    @staticmethod
+    def _copy_article(article: Dict) -> Dict:
+        article_copy = dict(article)
+        if isinstance(article_copy.get("tags"), list):
+            article_copy["tags"] = list(article_copy["tags"])
+        return article_copy
+
+
+# Global article log instance
+article_log = ArticleLog()
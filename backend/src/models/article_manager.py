@@ -3,11 +3,12 @@ Article Manager module for News Summary Backend
 Main ArticleManager class that combines all article operations
 """
 
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from .article_operations import ArticleOperations
 from .article_queries import ArticleQueries
 from .article_storage import ArticleStorage
+from .seen_index import SeenIndex
 
 
 class ArticleManager:
@@ -26,10 +27,47 @@ class ArticleManager:
     def ensure_article_ids() -> None:
         ArticleStorage.ensure_article_ids()
 
+    @staticmethod
+    def get_data_version() -> Tuple:
+        return ArticleStorage.get_data_version()
+
+    @staticmethod
+    def get_generation() -> int:
+        return ArticleStorage.get_generation()
+
+    @staticmethod
+    def get_seen_index() -> SeenIndex:
+        return ArticleStorage.get_seen_index()
+
     @staticmethod
     def add_new_articles(new_articles: List) -> int:
         return ArticleStorage.add_new_articles(new_articles)
 
+    @staticmethod
+    def patch_article(article_id: int, fields: Optional[Dict] = None,
+                      increments: Optional[Dict] = None) -> bool:
+        return ArticleStorage.patch_article(article_id, fields, increments)
+
+    @staticmethod
+    def patch_articles(patches: List[Tuple[int, Dict, Dict]]) -> int:
+        return ArticleStorage.patch_articles(patches)
+
+    @staticmethod
+    def add_patch_listener(listener: Callable[[int, Dict, Dict], None]) -> None:
+        ArticleStorage.add_patch_listener(listener)
+
+    @staticmethod
+    def add_insert_listener(listener: Callable[[List[Dict]], None]) -> None:
+        ArticleStorage.add_insert_listener(listener)
+
+    @staticmethod
+    def remove_patch_listener(listener: Callable[[int, Dict, Dict], None]) -> None:
+        ArticleStorage.remove_patch_listener(listener)
+
+    @staticmethod
+    def remove_insert_listener(listener: Callable[[List[Dict]], None]) -> None:
+        ArticleStorage.remove_insert_listener(listener)
+
     # Query operations
     @staticmethod
     def get_article_by_id(article_id: int) -> Optional[Dict]:
@@ -5,8 +5,9 @@ Contains query and filtering operations for articles
 
 from typing import Dict, List, Optional
 
-from config import BASIC_TAGS, DEBUG_LOGGING
+from config import BASIC_TAGS, DEBUG_LOGGING, STORAGE_ENGINE
 
+from .article_sqlite import article_db
 from .article_storage import ArticleStorage
 
 
@@ -16,21 +17,25 @@ class ArticleQueries:
     @staticmethod
     def get_article_by_id(article_id: int) -> Optional[Dict]:
         """Get a specific article by its ID"""
-        articles = ArticleStorage.load_articles()
-        if 0 <= article_id < len(articles):
-            article = articles[article_id].copy()
-            article["id"] = article_id
-            return article
+        if STORAGE_ENGINE == "sqlite":
+            return article_db.get_article(article_id)
+
+        # Ids are not list positions once articles are deleted or reordered
+        for article in ArticleStorage.load_articles():
+            if article.get("id") == article_id:
+                return article.copy()
         return None
 
     @staticmethod
     def get_all_tags() -> List[str]:
         """Get all unique tags from all articles"""
-        articles = ArticleStorage.load_articles()
         all_tags = set()
-        for article in articles:
-            tags = article.get("tags", [])
-            all_tags.update(tags)
+        if STORAGE_ENGINE == "sqlite":
+            all_tags.update(article_db.get_all_tags())
+        else:
+            for article in ArticleStorage.load_articles():
+                tags = article.get("tags", [])
+                all_tags.update(tags)
         # add basic tags if not already present
         for tag in BASIC_TAGS:
             all_tags.add(tag)
@@ -40,6 +45,9 @@ class ArticleQueries:
     def get_unpretreat_articles() -> List[Dict]:
         """Get all articles that haven't been pretreated"""
         try:
+            if STORAGE_ENGINE == "sqlite":
+                return article_db.get_unpretreat_articles()
+
             articles = ArticleStorage.load_articles()
             unpretreat = []
             for i, article in enumerate(articles):
@@ -58,6 +66,9 @@ class ArticleQueries:
     @staticmethod
     def filter_by_tags(tags: List[str]) -> List[Dict]:
         """Filter articles by tags"""
+        if STORAGE_ENGINE == "sqlite":
+            return article_db.filter_by_tags(tags) if tags else article_db.load_articles()
+
         articles = ArticleStorage.load_articles()
         if not tags:
             return articles
@@ -73,6 +84,9 @@ class ArticleQueries:
     @staticmethod
     def filter_by_rating(min_rating: int) -> List[Dict]:
         """Filter articles by minimum rating"""
+        if STORAGE_ENGINE == "sqlite":
+            return article_db.filter_by_rating(min_rating)
+
         articles = ArticleStorage.load_articles()
         filtered = []
         for article in articles:
@@ -0,0 +1,386 @@
+"""
+Article SQLite module for News Summary Backend
+Contains the SQLite database used by the "sqlite" storage engine
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import ARTICLES_DB_FILE, DEBUG_LOGGING, JSON_FILE
+
+# Article fields stored in their own column (everything else goes to "extra")
+COLUMNS = ["id", "url", "title", "source", "date", "scraped_date", "rating",
+           "has_been_pretreat", "time_spent", "content", "comments"]
+
+# Columns that are only present in the article dict when they have a value
+OPTIONAL_COLUMNS = {"date"}
+
+# Article ids bound per tag query (older SQLite builds allow 999 variables)
+TAG_QUERY_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    date TEXT,
+    scraped_date TEXT,
+    rating INTEGER,
+    has_been_pretreat INTEGER NOT NULL DEFAULT 0,
+    time_spent INTEGER NOT NULL DEFAULT 0,
+    content TEXT NOT NULL DEFAULT '',
+    comments TEXT NOT NULL DEFAULT '',
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS article_tags (
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (article_id, tag)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_url ON articles(url);
+CREATE INDEX IF NOT EXISTS idx_articles_title ON articles(title);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date);
+CREATE INDEX IF NOT EXISTS idx_articles_rating ON articles(rating);
+CREATE INDEX IF NOT EXISTS idx_articles_pretreat ON articles(has_been_pretreat);
+CREATE INDEX IF NOT EXISTS idx_article_tags_tag ON article_tags(tag);
+"""
+
+
+class ArticleDatabase:
+    """SQLite storage for articles with indexed columns and a tag join table"""
+
+    def __init__(self, db_file: str = ARTICLES_DB_FILE, json_file: str = JSON_FILE):
+        self.db_file = db_file
+        self.json_file = json_file
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    # ------------------------------------------------------------------
+    # Connection management
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection of the current thread, creating the schema on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.db_file, timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    connection.executescript(SCHEMA)
+                    self._migrate_from_json(connection)
+                    self._initialized = True
+        return connection
+
+    def close(self) -> None:
+        """Close the connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def _migrate_from_json(self, connection: sqlite3.Connection) -> int:
+        """Import the JSON articles file once, the first time the database is created"""
+        migrated = connection.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone()
+        if migrated is not None:
+            return 0
+
+        articles = []
+        if os.path.exists(self.json_file):
+            try:
+                with open(self.json_file, "r", encoding="utf-8") as f:
+                    articles = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError) as e:
+                if DEBUG_LOGGING:
+                    print(f"[MODELS] Error reading {self.json_file} for migration: {e}")
+                return 0
+
+        with connection:
+            for i, article in enumerate(articles):
+                if "id" not in article or article["id"] is None:
+                    article["id"] = i
+                self._upsert(connection, article)
+            connection.execute("INSERT INTO meta (key, value) VALUES ('migrated_from', ?)", (self.json_file,))
+
+        if DEBUG_LOGGING:
+            print(f"[MODELS] Migrated {len(articles)} articles from {self.json_file} to {self.db_file}")
+        return len(articles)
+
+    # ------------------------------------------------------------------
+    # Full list operations (ArticleStorage API)
+    # ------------------------------------------------------------------
+
+    def load_articles(self) -> List[Dict]:
+        """Load every article in id order"""
+        connection = self._connect()
+        rows = connection.execute("SELECT * FROM articles ORDER BY id").fetchall()
+        return self._rows_to_articles(connection, rows)
+
+    def save_articles(self, articles: List[Dict]) -> None:
+        """Replace the stored articles with the given list"""
+        connection = self._connect()
+        with connection:
+            # The kept ids go through a temporary table: one bound variable per
+            # article would exceed SQLITE_MAX_VARIABLE_NUMBER on large collections
+            connection.execute("CREATE TEMP TABLE IF NOT EXISTS kept_ids (id INTEGER PRIMARY KEY)")
+            connection.execute("DELETE FROM kept_ids")
+            for article in articles:
+                self._upsert(connection, article)
+                connection.execute("INSERT OR IGNORE INTO kept_ids (id) VALUES (?)", (article["id"],))
+            connection.execute("DELETE FROM articles WHERE id NOT IN (SELECT id FROM kept_ids)")
+            connection.execute("DELETE FROM kept_ids")
+
+    def insert_articles(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Insert new articles, skipping those whose title or url already exists
+
+        Returns:
+            The inserted articles, with their new ids
+        """
+        connection = self._connect()
+        inserted = []
+        with connection:
+            next_id = connection.execute("SELECT COALESCE(MAX(id) + 1, 0) FROM articles").fetchone()[0]
+            for article in articles:
+                exists = connection.execute(
+                    "SELECT 1 FROM articles WHERE title = ? OR url = ? LIMIT 1",
+                    (article.get("title", ""), article.get("url", ""))
+                ).fetchone()
+                if exists:
+                    continue
+                article = dict(article)
+                article["id"] = next_id
+                self._upsert(connection, article)
+                next_id += 1
+                inserted.append(article)
+        return inserted
+
+    # ------------------------------------------------------------------
+    # Queries (ArticleQueries API)
+    # ------------------------------------------------------------------
+
+    def get_article(self, article_id: int) -> Optional[Dict]:
+        connection = self._connect()
+        rows = connection.execute("SELECT * FROM articles WHERE id = ?", (article_id,)).fetchall()
+        articles = self._rows_to_articles(connection, rows)
+        return articles[0] if articles else None
+
+    def get_all_tags(self) -> List[str]:
+        connection = self._connect()
+        rows = connection.execute("SELECT DISTINCT tag FROM article_tags ORDER BY tag").fetchall()
+        return [row["tag"] for row in rows]
+
+    def get_unpretreat_articles(self) -> List[Dict]:
+        connection = self._connect()
+        rows = connection.execute(
+            "SELECT id, title, url FROM articles WHERE has_been_pretreat = 0 ORDER BY id"
+        ).fetchall()
+        return [{"id": row["id"], "title": row["title"], "url": row["url"]} for row in rows]
+
+    def filter_by_tags(self, tags: List[str]) -> List[Dict]:
+        connection = self._connect()
+        placeholders = ",".join("?" * len(tags))
+        rows = connection.execute(
+            f"SELECT * FROM articles WHERE id IN "
+            f"(SELECT article_id FROM article_tags WHERE tag IN ({placeholders})) ORDER BY id",
+            list(tags)
+        ).fetchall()
+        return self._rows_to_articles(connection, rows)
+
+    def filter_by_rating(self, min_rating: int) -> List[Dict]:
+        connection = self._connect()
+        rows = connection.execute(
+            "SELECT * FROM articles WHERE rating IS NOT NULL AND rating >= ? ORDER BY id", (min_rating,)
+        ).fetchall()
+        return self._rows_to_articles(connection, rows)
+
+    # ------------------------------------------------------------------
+    # Single-row updates (ArticleOperations API)
+    # ------------------------------------------------------------------
+
+    def update_fields(self, article_id: int, fields: Dict) -> bool:
+        """
+        Update some fields of one article with a single UPDATE
+
+        Returns:
+            True if the article exists
+        """
+        return self.patch(article_id, fields=fields)
+
+    def increment_field(self, article_id: int, column: str, amount: int) -> bool:
+        """Atomically add `amount` to an integer column of one article"""
+        return self.patch(article_id, increments={column: amount})
+
+    def patch(self, article_id: int, fields: Optional[Dict] = None, increments: Optional[Dict] = None) -> bool:
+        """
+        Set and/or increment fields of one article in a single transaction
+
+        Args:
+            article_id: ID of the article to update
+            fields: Values to set
+            increments: Integer columns to add to
+
+        Returns:
+            True if the article exists
+        """
+        return self.patch_many([(article_id, fields or {}, increments or {})])[0]
+
+    def patch_many(self, patches: List[Tuple[int, Dict, Dict]]) -> List[bool]:
+        """
+        Apply several (article_id, fields, increments) patches in one transaction
+
+        Returns:
+            For each patch, True if the article exists
+        """
+        connection = self._connect()
+        results = []
+        with connection:
+            for article_id, fields, increments in patches:
+                if not self._exists(connection, article_id):
+                    results.append(False)
+                    continue
+                if fields:
+                    self._set_fields(connection, article_id, fields)
+                for column, amount in (increments or {}).items():
+                    if column not in COLUMNS or column == "id":
+                        raise ValueError(f"Unknown article column: {column}")
+                    connection.execute(
+                        f"UPDATE articles SET {column} = COALESCE({column}, 0) + ? WHERE id = ?",
+                        (amount, article_id)
+                    )
+                results.append(True)
+        return results
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _set_fields(self, connection: sqlite3.Connection, article_id: int, fields: Dict) -> None:
+        fields = dict(fields)
+        tags = fields.pop("tags", None)
+        columns = {key: value for key, value in fields.items() if key in COLUMNS and key != "id"}
+        extra = {key: value for key, value in fields.items() if key not in COLUMNS}
+
+        if columns:
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            connection.execute(
+                f"UPDATE articles SET {assignments} WHERE id = ?",
+                [self._to_column(column, value) for column, value in columns.items()] + [article_id]
+            )
+
+        if extra:
+            row = connection.execute("SELECT extra FROM articles WHERE id = ?", (article_id,)).fetchone()
+            merged = json.loads(row["extra"]) if row["extra"] else {}
+            merged.update(extra)
+            connection.execute("UPDATE articles SET extra = ? WHERE id = ?",
+                               (json.dumps(merged, ensure_ascii=False), article_id))
+
+        if tags is not None:
+            self._write_tags(connection, article_id, tags)
+
+    @staticmethod
+    def _exists(connection: sqlite3.Connection, article_id: int) -> bool:
+        return connection.execute("SELECT 1 FROM articles WHERE id = ?", (article_id,)).fetchone() is not None
+
+    @staticmethod
+    def _to_column(column: str, value):
+        if column == "has_been_pretreat":
+            return 1 if value else 0
+        return value
+
+    def _upsert(self, connection: sqlite3.Connection, article: Dict) -> None:
+        values = [self._to_column(column, article.get(column)) for column in COLUMNS]
+        # Keep the column defaults for missing values
+        defaults = {"url": "", "title": "", "source": "", "time_spent": 0, "content": "", "comments": ""}
+        for i, column in enumerate(COLUMNS):
+            if values[i] is None and column in defaults:
+                values[i] = defaults[column]
+        extra = {key: value for key, value in article.items() if key not in COLUMNS and key != "tags"}
+        values.append(json.dumps(extra, ensure_ascii=False) if extra else None)
+
+        column_list = ", ".join(COLUMNS + ["extra"])
+        placeholders = ", ".join("?" * (len(COLUMNS) + 1))
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[1:] + ["extra"])
+        connection.execute(
+            f"INSERT INTO articles ({column_list}) VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}",
+            values
+        )
+        self._write_tags(connection, article["id"], article.get("tags") or [])
+
+    @staticmethod
+    def _write_tags(connection: sqlite3.Connection, article_id: int, tags: Iterable[str]) -> None:
+        connection.execute("DELETE FROM article_tags WHERE article_id = ?", (article_id,))
+        unique_tags = list(dict.fromkeys(tags))
+        connection.executemany(
+            "INSERT INTO article_tags (article_id, tag, position) VALUES (?, ?, ?)",
+            [(article_id, tag, position) for position, tag in enumerate(unique_tags)]
+        )
+
+    @staticmethod
+    def _rows_to_articles(connection: sqlite3.Connection, rows: List[sqlite3.Row]) -> List[Dict]:
+        if not rows:
+            return []
+
+        tags_by_id: Dict[int, List[str]] = {row["id"]: [] for row in rows}
+        # Only the tags of the matched articles are read, in chunks that stay
+        # under SQLite's limit of bound variables
+        ids = list(tags_by_id)
+        for start in range(0, len(ids), TAG_QUERY_CHUNK):
+            chunk = ids[start:start + TAG_QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            tag_rows = connection.execute(
+                f"SELECT article_id, tag FROM article_tags WHERE article_id IN ({placeholders}) "
+                "ORDER BY article_id, position",
+                chunk
+            ).fetchall()
+            for tag_row in tag_rows:
+                tags_by_id[tag_row["article_id"]].append(tag_row["tag"])
+
+        articles = []
+        for row in rows:
+            article = {
+                "title": row["title"],
+                "url": row["url"],
+                "content": row["content"],
+                "has_been_pretreat": bool(row["has_been_pretreat"]),
+                "rating": row["rating"],
+                "time_spent": row["time_spent"],
+                "comments": row["comments"],
+                "tags": tags_by_id[row["id"]],
+                "source": row["source"],
+                "scraped_date": row["scraped_date"],
+                "id": row["id"]
+            }
+            for column in OPTIONAL_COLUMNS:
+                if row[column] is not None:
+                    article[column] = row[column]
+            if row["extra"]:
+                article.update(json.loads(row["extra"]))
+            articles.append(article)
+        return articles
+
+
+# Global article database instance
+article_db = ArticleDatabase()
@@ -3,33 +3,58 @@ Article Storage module for News Summary Backend
 Contains storage-related operations for articles
 """
 
+import atexit
 import os
-from typing import Dict, List
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
 
-from config import DEBUG_LOGGING, JSON_FILE
+from config import (ARTICLES_DB_FILE, ARTICLES_LOG_FILE, DEBUG_LOGGING, JSON_FILE,
+                    STORAGE_ENGINE)
 
 from .article import Article
+from .article_log import article_log
+from .article_sqlite import article_db
+from .content_store import content_store
+from .seen_index import SeenIndex, seen_index
 
 
 class ArticleStorage:
     """Handles article persistence operations"""
 
+    # Callbacks notified with (article_id, fields, increments) after each successful patch
+    _patch_listeners: List[Callable[[int, Dict, Dict], None]] = []
+    # Callbacks notified with the list of inserted articles after add_new_articles
+    _insert_listeners: List[Callable[[List[Dict]], None]] = []
+    # Bumped once by every write made through this class
+    _generation = 0
+    _generation_lock = threading.Lock()
+    _seen_lock = threading.Lock()
+    _seen_save_registered = False
+
     @staticmethod
     def load_articles() -> List[Dict]:
-        """Load articles from JSON file"""
+        """Load articles from the configured storage engine"""
         import json
 
+        if STORAGE_ENGINE == "sqlite":
+            return article_db.load_articles()
+
+        if STORAGE_ENGINE == "log":
+            articles = article_log.load()
+            for article in articles:
+                if "has_been_pretreat" not in article:
+                    article["has_been_pretreat"] = False
+            return articles
+
         if os.path.exists(JSON_FILE):
             try:
                 with open(JSON_FILE, "r", encoding="utf-8") as f:
                     articles = json.load(f)
                     # Ensure all articles have the has_been_pretreat field and an ID
-                    for i, article in enumerate(articles):
+                    for article in articles:
                         if "has_been_pretreat" not in article:
                             article["has_been_pretreat"] = False
-                        # Add ID if missing (use index as ID)
-                        if "id" not in article or article["id"] is None:
-                            article["id"] = i
+                    ArticleStorage.assign_missing_ids(articles)
                     return articles
             except (json.JSONDecodeError, FileNotFoundError) as e:
                 if DEBUG_LOGGING:
@@ -39,7 +64,78 @@ class ArticleStorage:
 
     @staticmethod
     def save_articles(articles: List[Dict]) -> None:
-        """Save articles to JSON file"""
+        """Save articles to the configured storage engine"""
+        try:
+            ArticleStorage._write_articles(articles)
+        finally:
+            # Even a failed write may have touched the files: readers must reload
+            ArticleStorage._bump_generation()
+
+    @staticmethod
+    def get_data_version() -> Tuple:
+        """
+        Identify the current state of the stored articles
+
+        Combines the write generation of this process with the signature
+        (inode, size, mtime) of the storage files, so that edits made by
+        another process or by hand are detected too.
+
+        Returns:
+            Tuple that changes whenever the stored articles may have changed
+        """
+        if STORAGE_ENGINE == "sqlite":
+            paths = (ARTICLES_DB_FILE, ARTICLES_DB_FILE + "-wal")
+        elif STORAGE_ENGINE == "log":
+            paths = (JSON_FILE, ARTICLES_LOG_FILE + ".compacting", ARTICLES_LOG_FILE)
+        else:
+            paths = (JSON_FILE,)
+
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return ArticleStorage._generation, tuple(signature)
+
+    @staticmethod
+    def get_generation() -> int:
+        """Get the number of writes made through this process"""
+        return ArticleStorage._generation
+
+    @staticmethod
+    def get_seen_index() -> SeenIndex:
+        """
+        Get the index of the stored URLs and titles, in sync with the storage
+
+        The index follows the inserts and patches made through this class.
+        It is read back from its file when the storage files are unchanged
+        since it was saved, and rebuilt from the articles otherwise.
+
+        Returns:
+            The global seen index
+        """
+        with ArticleStorage._seen_lock:
+            version = ArticleStorage.get_data_version()
+            if not seen_index.is_synced(version):
+                if not seen_index.load(version):
+                    seen_index.build(ArticleStorage.load_articles(), version)
+                    seen_index.save()
+                if not ArticleStorage._seen_save_registered:
+                    # Patches change the storage signature without changing the entries
+                    atexit.register(ArticleStorage._save_seen_index)
+                    ArticleStorage._seen_save_registered = True
+        return seen_index
+
+    @staticmethod
+    def _bump_generation() -> None:
+        with ArticleStorage._generation_lock:
+            ArticleStorage._generation += 1
+
+    @staticmethod
+    def _write_articles(articles: List[Dict]) -> None:
+        """Write a full article list without bumping the generation"""
         import json
 
         try:
@@ -47,9 +143,20 @@ class ArticleStorage:
             os.makedirs(os.path.dirname(JSON_FILE), exist_ok=True)
 
             # Ensure all articles have IDs before saving
-            for i, article in enumerate(articles):
-                if "id" not in article or article["id"] is None:
-                    article["id"] = i
+            ArticleStorage.assign_missing_ids(articles)
+
+            if STORAGE_ENGINE == "sqlite":
+                article_db.save_articles(articles)
+                if DEBUG_LOGGING:
+                    print(f"[MODELS] Saved {len(articles)} articles to database")
+                return
+
+            if STORAGE_ENGINE == "log":
+                # Only the changed fields are appended to the log
+                records = article_log.save(articles)
+                if DEBUG_LOGGING:
+                    print(f"[MODELS] Saved {len(articles)} articles ({records} log records)")
+                return
 
             with open(JSON_FILE, "w", encoding="utf-8") as f:
                 json.dump(articles, f, ensure_ascii=False, indent=2)
@@ -61,19 +168,163 @@ class ArticleStorage:
                 print(f"[MODELS] Error saving articles: {e}")
             raise
 
+    @staticmethod
+    def add_patch_listener(listener: Callable[[int, Dict, Dict], None]) -> None:
+        """Register a callback notified after each successful patch_article"""
+        if listener not in ArticleStorage._patch_listeners:
+            ArticleStorage._patch_listeners.append(listener)
+
+    @staticmethod
+    def add_insert_listener(listener: Callable[[List[Dict]], None]) -> None:
+        """Register a callback notified with the articles inserted by add_new_articles"""
+        if listener not in ArticleStorage._insert_listeners:
+            ArticleStorage._insert_listeners.append(listener)
+
+    @staticmethod
+    def remove_patch_listener(listener: Callable[[int, Dict, Dict], None]) -> None:
+        """Unregister a callback added with add_patch_listener"""
+        if listener in ArticleStorage._patch_listeners:
+            ArticleStorage._patch_listeners.remove(listener)
+
+    @staticmethod
+    def remove_insert_listener(listener: Callable[[List[Dict]], None]) -> None:
+        """Unregister a callback added with add_insert_listener"""
+        if listener in ArticleStorage._insert_listeners:
+            ArticleStorage._insert_listeners.remove(listener)
+
+    @staticmethod
+    def patch_article(article_id: int, fields: Optional[Dict] = None,
+                      increments: Optional[Dict] = None) -> bool:
+        """
+        Apply a field-level change to a single article
+
+        The sqlite engine runs a single-row UPDATE and the log engine appends a
+        single record. The json engine has no way to update a file in place,
+        so it still goes through load_articles/save_articles.
+
+        Args:
+            article_id: ID of the article to update
+            fields: Values to set
+            increments: Numeric fields to add to
+
+        Returns:
+            True if the article exists
+        """
+        return ArticleStorage.patch_articles([(article_id, fields or {}, increments or {})]) == 1
+
+    @staticmethod
+    def patch_articles(patches: List[Tuple[int, Dict, Dict]]) -> int:
+        """
+        Apply several (article_id, fields, increments) patches in one write
+
+        Returns:
+            Number of patches whose article exists
+        """
+        patches = [(article_id, fields or {}, increments or {}) for article_id, fields, increments in patches]
+        if not patches:
+            return 0
+
+        if STORAGE_ENGINE in ("sqlite", "log"):
+            storage = article_db if STORAGE_ENGINE == "sqlite" else article_log
+            results = storage.patch_many(patches)
+            if any(results):
+                ArticleStorage._bump_generation()
+                ArticleStorage._acknowledge_seen_write(patches)
+        else:
+            articles = ArticleStorage.load_articles()
+            positions = {article.get("id"): i for i, article in enumerate(articles)}
+            results = []
+            for article_id, fields, increments in patches:
+                position = positions.get(article_id)
+                if position is None:
+                    results.append(False)
+                    continue
+                article = articles[position]
+                article.update(fields)
+                for key, amount in increments.items():
+                    article[key] = (article.get(key) or 0) + amount
+                results.append(True)
+            if any(results):
+                # Bumps the generation
+                ArticleStorage.save_articles(articles)
+                ArticleStorage._acknowledge_seen_write(patches)
+
+        for (article_id, fields, increments), success in zip(patches, results):
+            if not success:
+                continue
+            for listener in ArticleStorage._patch_listeners:
+                try:
+                    listener(article_id, fields, increments)
+                except Exception as e:
+                    if DEBUG_LOGGING:
+                        print(f"[MODELS] Error notifying patch listener: {e}")
+        return sum(1 for success in results if success)
+
+    @staticmethod
+    def _save_seen_index() -> None:
+        seen_index.save()
+
+    @staticmethod
+    def _acknowledge_seen_write(patches: List[Tuple[int, Dict, Dict]]) -> None:
+        """Keep the seen index in sync with a patch (a changed url or title is added, never removed)"""
+        for _, fields, _ in patches:
+            if "url" in fields or "title" in fields:
+                seen_index.add(fields.get("url"), fields.get("title"))
+        seen_index.acknowledge_write(ArticleStorage.get_data_version())
+
+    @staticmethod
+    def assign_missing_ids(articles: List[Dict]) -> int:
+        """
+        Give an id to the articles without one (or sharing one with an earlier article)
+
+        Existing ids are never renumbered: they are referenced by the chat
+        history and the indexes, and no longer match list positions once
+        articles are deleted or reordered. New ids continue after the largest one.
+
+        Returns:
+            Number of articles that received a new id
+        """
+        used_ids = set()
+        missing = []
+        for article in articles:
+            article_id = article.get("id")
+            if not isinstance(article_id, int) or article_id in used_ids:
+                missing.append(article)
+            else:
+                used_ids.add(article_id)
+
+        next_id = max(used_ids, default=-1) + 1
+        for article in missing:
+            article["id"] = next_id
+            next_id += 1
+        return len(missing)
+
     @staticmethod
     def ensure_article_ids() -> None:
         """Ensure all articles have proper IDs and save them"""
-        try:
-            articles = ArticleStorage.load_articles()
-            needs_save = False
+        if STORAGE_ENGINE == "sqlite":
+            # Ids are the primary key of the articles table
+            return
 
-            for i, article in enumerate(articles):
-                if "id" not in article or article["id"] is None or article["id"] != i:
-                    article["id"] = i
-                    needs_save = True
+        if STORAGE_ENGINE == "log":
+            # The log is replayed over a snapshot whose ids are already assigned
+            return
+
+        import json
+
+        try:
+            if not os.path.exists(JSON_FILE):
+                return
+            if content_store.has_snapshot(ArticleStorage.get_data_version()[1]):
+                # The cache reads this file's articles and ids from the metadata snapshot
+                # instead of parsing it, and so does this check
+                return
+            # load_articles fills in missing ids in memory only: check the file itself
+            with open(JSON_FILE, "r", encoding="utf-8") as f:
+                needs_save = ArticleStorage.assign_missing_ids(json.load(f)) > 0
 
             if needs_save:
+                articles = ArticleStorage.load_articles()
                 ArticleStorage.save_articles(articles)
                 if DEBUG_LOGGING:
                     print(f"[MODELS] Updated IDs for {len(articles)} articles")
@@ -87,27 +338,48 @@ class ArticleStorage:
         if not new_articles:
             return 0
 
-        existing_articles = ArticleStorage.load_articles()
-        existing_titles = {a["title"] for a in existing_articles}
-        existing_urls = {a["url"] for a in existing_articles}
-
-        added_count = 0
-        for article in new_articles:
-            if article.title not in existing_titles and article.url not in existing_urls:
-                existing_articles.append(article.to_dict())
-                existing_titles.add(article.title)
-                existing_urls.add(article.url)
-                added_count += 1
-                # add tags, rating, comments, time_spent as default values
-                article.tags = article.tags or []
-                article.rating = article.rating or None
-                article.comments = article.comments or ""
-                article.time_spent = article.time_spent or 0
-
-
-        if added_count > 0:
-            ArticleStorage.save_articles(existing_articles)
+        if STORAGE_ENGINE == "sqlite":
+            # Duplicate titles/urls are rejected through indexed lookups
+            inserted = article_db.insert_articles([article.to_dict() for article in new_articles])
+        else:
+            # Known articles are looked up in the seen index; the list is only loaded to append to it
+            seen = ArticleStorage.get_seen_index()
+            batch = SeenIndex(index_file=None)
+            existing_articles = ArticleStorage.load_articles()
+            next_id = max((a["id"] for a in existing_articles), default=-1) + 1
+
+            inserted = []
+            for article in new_articles:
+                if not seen.contains(article.url, article.title) and not batch.contains(article.url, article.title):
+                    # add tags, rating, comments, time_spent as default values
+                    article.tags = article.tags or []
+                    article.rating = article.rating or None
+                    article.comments = article.comments or ""
+                    article.time_spent = article.time_spent or 0
+                    article_dict = article.to_dict()
+                    article_dict["id"] = next_id
+                    next_id += 1
+                    existing_articles.append(article_dict)
+                    batch.add(article.url, article.title)
+                    inserted.append(article_dict)
+
+            if inserted:
+                # Bumps the generation
+                ArticleStorage.save_articles(existing_articles)
+
+        if inserted:
+            if STORAGE_ENGINE == "sqlite":
+                ArticleStorage._bump_generation()
+            seen_index.add_articles(inserted)
+            seen_index.acknowledge_write(ArticleStorage.get_data_version())
+            seen_index.save()
             if DEBUG_LOGGING:
-                print(f"[MODELS] Added {added_count} new articles")
+                print(f"[MODELS] Added {len(inserted)} new articles")
+            for listener in ArticleStorage._insert_listeners:
+                try:
+                    listener([dict(article) for article in inserted])
+                except Exception as e:
+                    if DEBUG_LOGGING:
+                        print(f"[MODELS] Error notifying insert listener: {e}")
 
-        return added_count
\ No newline at end of file
+        return len(inserted)
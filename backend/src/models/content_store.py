@@ -0,0 +1,374 @@
+"""
+Content Store module for News Summary Backend
+Keeps article bodies in an append-only file read through mmap, so that only metadata stays in memory
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: appends are not locked against other processes
+    fcntl = None
+
+from config import (CONTENT_CACHE_SIZE, CONTENT_INDEX_FILE, CONTENT_STORE_FILE,
+                    DEBUG_LOGGING)
+
+# Bump when the file layout changes so that old stores are rebuilt
+STORE_VERSION = 1
+
+# Minimum amount of overwritten bodies before the data file is rewritten
+COMPACTION_MIN_BYTES = 1024 * 1024
+
+
+class ContentStore:
+    """
+    Offset-indexed store of article bodies
+
+    Bodies are appended as UTF-8 to a data file and located through an index
+    article id -> (offset, length, sha1). Reads go through a read-only mmap
+    of the data file and the most recently read bodies are kept in a small
+    LRU. Replacing a body appends the new version; the file is rewritten once
+    the overwritten bytes outweigh the live ones.
+
+    The index file also holds a snapshot of the article metadata (everything
+    but the bodies) together with the storage signature it was taken at, so
+    that a restart with unchanged storage does not parse the bodies at all.
+
+    Several processes may share the files (the development reloader runs
+    two): appends hold an exclusive flock and start at the real end of the
+    file, and a store that has seen another process append never compacts
+    over its bodies.
+    """
+
+    def __init__(self, data_file: str = CONTENT_STORE_FILE, index_file: str = CONTENT_INDEX_FILE,
+                 cache_size: int = CONTENT_CACHE_SIZE):
+        self.data_file = data_file
+        self.index_file = index_file
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._entries: Dict[int, Tuple[int, int, str]] = {}
+        self._recent: "OrderedDict[int, str]" = OrderedDict()
+        self._map: Optional[mmap.mmap] = None
+        self._file_size = 0
+        self._file_inode: Optional[int] = None
+        self._shared = False  # Another process appended to the data file
+        self._loaded = False
+        # Index read by has_snapshot, reused by the load_snapshot call that follows it
+        self._read_ahead: Optional[Tuple[Optional[Tuple], Optional[Dict]]] = None
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, article_id: int) -> Optional[str]:
+        """
+        Get the body of an article
+
+        Args:
+            article_id: ID of the article
+
+        Returns:
+            The body, or None if the store has no body for this article
+        """
+        with self._lock:
+            body = self._recent.get(article_id)
+            if body is not None:
+                self._recent.move_to_end(article_id)
+                self._hits += 1
+                return body
+
+            self._ensure_loaded()
+            entry = self._entries.get(article_id)
+            if entry is None:
+                return None
+            offset, length, _ = entry
+            if length == 0:
+                # Empty bodies are never mapped (an empty file cannot be)
+                return ""
+            if self._map is None or offset + length > len(self._map):
+                if self._sync_with_file():
+                    return self.get(article_id)
+                self._remap()
+            body = self._map[offset:offset + length].decode("utf-8")
+            self._misses += 1
+            self._remember(article_id, body)
+            return body
+
+    def put(self, article_id: int, body: str) -> bool:
+        """Store the body of an article, returns False if it was already stored"""
+        return self.put_many([(article_id, body)]) == 1
+
+    def put_many(self, bodies: Iterable[Tuple[int, str]]) -> int:
+        """
+        Store several bodies with a single append
+
+        Bodies identical to the stored version are skipped.
+
+        Returns:
+            Number of bodies written
+        """
+        bodies = list(bodies)
+        with self._lock:
+            self._ensure_loaded()
+            os.makedirs(os.path.dirname(self.data_file) or ".", exist_ok=True)
+            f = self._open_for_append()
+            try:
+                # Offsets start at the real end of the file, which another process may have moved
+                self._sync_with_file(os.fstat(f.fileno()))
+                chunks: List[bytes] = []
+                offset = self._file_size
+                for article_id, body in bodies:
+                    data = (body or "").encode("utf-8")
+                    digest = hashlib.sha1(data).hexdigest()
+                    entry = self._entries.get(article_id)
+                    if entry is not None and entry[1] == len(data) and entry[2] == digest:
+                        continue
+                    self._entries[article_id] = (offset, len(data), digest)
+                    self._recent.pop(article_id, None)
+                    chunks.append(data)
+                    offset += len(data)
+
+                if chunks:
+                    f.write(b"".join(chunks))
+                    f.flush()
+                    self._file_size = offset
+                    if not self._shared and self._dead_bytes() > max(self._live_bytes(), COMPACTION_MIN_BYTES):
+                        self._compact()
+            finally:
+                # Closing the file releases the flock
+                f.close()
+            return len(chunks)
+
+    def remove_missing(self, article_ids: Iterable[int]) -> None:
+        """Forget the bodies of articles that are not in the given ids"""
+        with self._lock:
+            self._ensure_loaded()
+            keep = set(article_ids)
+            for article_id in [article_id for article_id in self._entries if article_id not in keep]:
+                del self._entries[article_id]
+                self._recent.pop(article_id, None)
+
+    def has_snapshot(self, signature: Tuple) -> bool:
+        """Check whether the saved metadata snapshot was taken at a storage signature"""
+        with self._lock:
+            key = self._index_key()
+            data = self._read_index()
+            self._read_ahead = (key, data)
+            return data is not None and data.get("signature") == self._signature_key(signature)
+
+    def load_snapshot(self, signature: Tuple) -> Optional[List[Dict]]:
+        """
+        Get the article metadata saved for a storage signature
+
+        Args:
+            signature: Storage file signature (see ArticleStorage.get_data_version)
+
+        Returns:
+            The metadata list, or None if the snapshot is missing or was taken
+            at another signature
+        """
+        with self._lock:
+            read_ahead, self._read_ahead = self._read_ahead, None
+            if read_ahead is not None and read_ahead[0] == self._index_key():
+                data = read_ahead[1]
+            else:
+                data = self._read_index()
+            if not self._loaded:
+                self._load_entries(data)
+            if data is None or data.get("signature") != self._signature_key(signature):
+                return None
+            articles = data.get("articles")
+            if not isinstance(articles, list) or any(article.get("id") not in self._entries
+                                                     for article in articles):
+                return None
+            return articles
+
+    def save_snapshot(self, signature: Tuple, articles: List[Dict]) -> bool:
+        """
+        Persist the index with the metadata of the articles at a storage signature
+
+        Args:
+            signature: Storage file signature the metadata reflects
+            articles: Article dictionaries without their "content"
+
+        Returns:
+            True if the index file was written
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._write_index(self._signature_key(signature), articles)
+
+    def get_stats(self) -> Dict:
+        """Get size and hit rate information"""
+        with self._lock:
+            self._ensure_loaded()
+            lookups = self._hits + self._misses
+            return {
+                "articles": len(self._entries),
+                "live_bytes": self._live_bytes(),
+                "file_bytes": self._file_size,
+                "cached_bodies": len(self._recent),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0
+            }
+
+    def _open_for_append(self):
+        """Open the data file for appending, holding an exclusive lock on it"""
+        while True:
+            f = open(self.data_file, "ab")
+            if fcntl is None:
+                return f
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                if os.stat(self.data_file).st_ino == os.fstat(f.fileno()).st_ino:
+                    return f
+            except OSError:
+                pass
+            # Compacted by another process while waiting for the lock: lock the new file
+            f.close()
+
+    def _sync_with_file(self, stat: Optional[os.stat_result] = None) -> bool:
+        """
+        Catch up with the changes another process made to the data file
+
+        Returns:
+            True if the file was compacted by another process and the entries were reloaded
+        """
+        if stat is None:
+            try:
+                stat = os.stat(self.data_file)
+            except OSError:
+                return False
+        if self._file_inode is not None and stat.st_ino != self._file_inode:
+            # Offsets changed: the compacting process saved its entries to the index
+            self._entries = {}
+            self._recent.clear()
+            self._close_map()
+            self._load_entries(self._read_index())
+            return True
+        self._file_inode = stat.st_ino
+        if stat.st_size != self._file_size:
+            # Bodies appended by another process, which this store has no entries for
+            self._shared = True
+            self._file_size = stat.st_size
+        return False
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self._load_entries(self._read_index())
+
+    def _load_entries(self, data: Optional[Dict]) -> None:
+        """Initialize the index from the content of the index file"""
+        self._loaded = True
+        try:
+            stat = os.stat(self.data_file)
+            self._file_size, self._file_inode = stat.st_size, stat.st_ino
+        except OSError:
+            self._file_size, self._file_inode = 0, None
+        if data is None:
+            return
+        try:
+            entries = {int(key): (int(offset), int(length), digest)
+                       for key, (offset, length, digest) in data.get("entries", {}).items()}
+        except (TypeError, ValueError) as e:
+            if DEBUG_LOGGING:
+                print(f"[CONTENT] Ignoring invalid content index: {e}")
+            return
+        if all(offset + length <= self._file_size for offset, length, _ in entries.values()):
+            self._entries = entries
+
+    def _read_index(self) -> Optional[Dict]:
+        if not os.path.exists(self.index_file):
+            return None
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if data.get("version") == STORE_VERSION else None
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            if DEBUG_LOGGING:
+                print(f"[CONTENT] Error reading content index: {e}")
+            return None
+
+    def _index_key(self) -> Optional[Tuple]:
+        try:
+            stat = os.stat(self.index_file)
+            return stat.st_ino, stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return None
+
+    def _write_index(self, signature: Optional[str], articles: Optional[List[Dict]]) -> bool:
+        self._read_ahead = None
+        data = {
+            "version": STORE_VERSION,
+            "signature": signature,
+            "entries": {str(article_id): list(entry) for article_id, entry in self._entries.items()},
+            "articles": articles
+        }
+        try:
+            os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+            tmp_file = self.index_file + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_file, self.index_file)
+            return True
+        except OSError as e:
+            if DEBUG_LOGGING:
+                print(f"[CONTENT] Error saving content index: {e}")
+            return False
+
+    def _compact(self) -> None:
+        """Rewrite the data file with the live bodies only"""
+        self._remap()
+        tmp_file = self.data_file + ".tmp"
+        entries = {}
+        offset = 0
+        with open(tmp_file, "wb") as f:
+            for article_id, (old_offset, length, digest) in self._entries.items():
+                f.write(self._map[old_offset:old_offset + length])
+                entries[article_id] = (offset, length, digest)
+                offset += length
+        self._close_map()
+        os.replace(tmp_file, self.data_file)
+        self._entries = entries
+        self._file_size = offset
+        self._file_inode = os.stat(self.data_file).st_ino
+        # Offsets changed: a stale index would point into the wrong bodies
+        self._write_index(None, None)
+        if DEBUG_LOGGING:
+            print(f"[CONTENT] Compacted content store to {offset} bytes")
+
+    def _remap(self) -> None:
+        self._close_map()
+        if self._file_size:
+            with open(self.data_file, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _remember(self, article_id: int, body: str) -> None:
+        self._recent[article_id] = body
+        while len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+
+    def _live_bytes(self) -> int:
+        return sum(length for _, length, _ in self._entries.values())
+
+    def _dead_bytes(self) -> int:
+        return self._file_size - self._live_bytes()
+
+    @staticmethod
+    def _signature_key(signature: Tuple) -> str:
+        return json.dumps(signature)
+
+
+# Global content store instance
+content_store = ContentStore()
@@ -0,0 +1,216 @@
+"""
+Seen Index module for News Summary Backend
+Keeps the canonical URLs and title hashes of the stored articles, so that scrapers can skip known links without loading them
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from config import DEBUG_LOGGING, SEEN_INDEX_FILE
+
+# Bump when the canonical forms change so that old indexes are rebuilt
+INDEX_VERSION = 1
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {"fbclid", "gclid", "xtor", "guccounter", "guce_referrer", "guce_referrer_sig"}
+TRACKING_PREFIXES = ("utm_", "at_")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Canonical form of an article URL
+
+    The scheme, a leading "www.", the fragment, a trailing slash and tracking
+    parameters are dropped and the remaining query parameters are sorted, so
+    that the different links to one article share a key.
+
+    Args:
+        url: Article URL
+
+    Returns:
+        Canonical key of the URL
+    """
+    parts = urlsplit((url or "").strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES))
+    key = host + (parts.path.rstrip("/") or "/")
+    return f"{key}?{urlencode(query)}" if query else key
+
+
+def title_hash(title: str) -> Optional[int]:
+    """64-bit hash of a title, ignoring case and repeated whitespace (None for an empty title)"""
+    normalized = " ".join((title or "").casefold().split())
+    if not normalized:
+        return None
+    return int.from_bytes(hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class SeenIndex:
+    """
+    Set of the articles already stored, by canonical URL and by title hash
+
+    Lookups are O(1) set membership tests. The index is persisted with the
+    data version it reflects (see ArticleStorage.get_data_version) and is
+    only rebuilt from the articles when the storage changed without it.
+    Entries are never removed: a link that was once stored stays known.
+    """
+
+    def __init__(self, index_file: Optional[str] = SEEN_INDEX_FILE):
+        self.index_file = index_file
+        self._lock = threading.RLock()
+        self._urls: Set[str] = set()
+        self._titles: Set[int] = set()
+        self._version: Optional[Tuple] = None  # Data version the entries match
+        self._saved_signature: Optional[Tuple] = None
+
+    def contains_url(self, url: str) -> bool:
+        """Check whether an article with this URL is known"""
+        return canonical_url(url) in self._urls
+
+    def contains_title(self, title: str) -> bool:
+        """Check whether an article with this title is known"""
+        key = title_hash(title)
+        return key is not None and key in self._titles
+
+    def contains(self, url: str, title: Optional[str] = None) -> bool:
+        """Check whether an article with this URL or this title is known"""
+        return self.contains_url(url) or (title is not None and self.contains_title(title))
+
+    def add(self, url: Optional[str] = None, title: Optional[str] = None) -> None:
+        """Record the URL and/or the title of an article"""
+        with self._lock:
+            if url:
+                self._urls.add(canonical_url(url))
+            key = title_hash(title)
+            if key is not None:
+                self._titles.add(key)
+
+    def add_articles(self, articles: Iterable[Dict]) -> None:
+        """Record the URLs and titles of stored articles"""
+        with self._lock:
+            for article in articles:
+                self.add(article.get("url"), article.get("title"))
+
+    def build(self, articles: Iterable[Dict], version: Tuple) -> None:
+        """
+        Rebuild the index from the stored articles
+
+        Args:
+            articles: Every stored article
+            version: Data version the articles were loaded at
+        """
+        with self._lock:
+            self._urls = set()
+            self._titles = set()
+            self.add_articles(articles)
+            self._version = version
+        if DEBUG_LOGGING:
+            print(f"[SEEN_INDEX] Rebuilt seen index: {len(self._urls)} urls, {len(self._titles)} titles")
+
+    def is_synced(self, version: Tuple) -> bool:
+        """Check whether the index reflects the given data version"""
+        return self._version == version
+
+    def acknowledge_write(self, version: Tuple) -> None:
+        """
+        Follow a write made through ArticleStorage
+
+        The index keeps matching the data only if this write is the single
+        one made since the version it reflects (its entries must already have
+        been added).
+
+        Args:
+            version: Data version right after the write
+        """
+        with self._lock:
+            if self._version is not None and version[0] - self._version[0] <= 1:
+                self._version = version
+            else:
+                self._version = None
+
+    def load(self, version: Tuple) -> bool:
+        """
+        Load the persisted index if it was saved for the same storage files
+
+        Args:
+            version: Current data version
+
+        Returns:
+            True if the index was loaded
+        """
+        if not self.index_file or not os.path.exists(self.index_file):
+            return False
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION or data.get("signature") != self._signature_key(version[1]):
+                return False
+            urls = set(data["urls"])
+            titles = {int(key) for key in data["titles"]}
+        except (OSError, json.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError) as e:
+            if DEBUG_LOGGING:
+                print(f"[SEEN_INDEX] Error loading seen index: {e}")
+            return False
+        with self._lock:
+            self._urls = urls
+            self._titles = titles
+            self._version = version
+            self._saved_signature = version[1]
+        return True
+
+    def save(self) -> bool:
+        """
+        Persist the index with the storage signature it matches
+
+        Returns:
+            True if the file was written (or already up to date)
+        """
+        with self._lock:
+            if not self.index_file or self._version is None:
+                return False
+            signature = self._version[1]
+            if signature == self._saved_signature:
+                return True
+            data = {
+                "version": INDEX_VERSION,
+                "signature": self._signature_key(signature),
+                "urls": sorted(self._urls),
+                "titles": sorted(self._titles)
+            }
+            try:
+                os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+                tmp_file = self.index_file + ".tmp"
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_file, self.index_file)
+                self._saved_signature = signature
+                return True
+            except OSError as e:
+                if DEBUG_LOGGING:
+                    print(f"[SEEN_INDEX] Error saving seen index: {e}")
+                return False
+
+    def get_stats(self) -> Dict:
+        """Get the size of the index"""
+        return {
+            "urls": len(self._urls),
+            "titles": len(self._titles),
+            "synced": self._version is not None
+        }
+
+    @staticmethod
+    def _signature_key(signature: Tuple) -> str:
+        return json.dumps(signature)
+
+
+# Global seen index instance
+seen_index = SeenIndex()
@@ -0,0 +1,147 @@
+"""
+Reading time module for News Summary Backend
+Buffers reading-time heartbeats in memory and writes them in batches
+"""
+
+import atexit
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import DEBUG_LOGGING, READING_TIME_FLUSH_INTERVAL
+from models import ArticleManager
+
+
+class ReadingTimeBuffer:
+    """Coalesces reading-time increments per article and flushes them periodically"""
+
+    def __init__(self, flush_interval: int = READING_TIME_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Metrics
+        self._heartbeats = 0
+        self._flush_count = 0
+        self._flushed_articles = 0
+        self._last_flush_time: float = 0
+        self._last_flush_latency: float = 0
+        self._max_flush_latency: float = 0
+        self._flush_latencies: List[float] = []
+
+    def add(self, article_id: int) -> None:
+        """Record one reading-time heartbeat for an article"""
+        with self._lock:
+            # Same accounting as ArticleOperations.add_reading_time: one unit per heartbeat
+            self._pending[article_id] = self._pending.get(article_id, 0) + 1
+            self._heartbeats += 1
+
+    def get_pending(self, article_id: int) -> int:
+        """Get the increments buffered for an article and not yet written"""
+        with self._lock:
+            return self._pending.get(article_id, 0)
+
+    def flush(self) -> int:
+        """
+        Write all buffered increments in a single batched storage write
+
+        Returns:
+            Number of articles updated
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = {}
+            if not pending:
+                return 0
+
+            start_time = time.time()
+            try:
+                updated = ArticleManager.patch_articles(
+                    [(article_id, {}, {"time_spent": amount}) for article_id, amount in pending.items()]
+                )
+            except Exception as e:
+                # Put the increments back so that the next flush retries them
+                with self._lock:
+                    for article_id, amount in pending.items():
+                        self._pending[article_id] = self._pending.get(article_id, 0) + amount
+                if DEBUG_LOGGING:
+                    print(f"[READING_TIME] Error flushing reading time: {e}")
+                raise
+
+            latency = time.time() - start_time
+            with self._lock:
+                self._flush_count += 1
+                self._flushed_articles += updated
+                self._last_flush_time = time.time()
+                self._last_flush_latency = latency
+                self._max_flush_latency = max(self._max_flush_latency, latency)
+                self._flush_latencies = (self._flush_latencies + [latency])[-100:]
+
+            if DEBUG_LOGGING:
+                print(f"[READING_TIME] Flushed {len(pending)} articles in {latency:.3f}s")
+            return updated
+
+    def start(self) -> None:
+        """Start the background flush thread"""
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+            if DEBUG_LOGGING:
+                print(f"[READING_TIME] Flushing every {self.flush_interval} seconds")
+
+    def stop(self) -> None:
+        """Stop the background thread and write whatever is still buffered"""
+        self._running = False
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def get_stats(self) -> Dict:
+        """Get buffer metrics"""
+        with self._lock:
+            latencies = self._flush_latencies
+            return {
+                "pending_articles": len(self._pending),
+                "pending_increments": sum(self._pending.values()),
+                "heartbeats_received": self._heartbeats,
+                "flush_count": self._flush_count,
+                "flushed_articles": self._flushed_articles,
+                "flush_interval": self.flush_interval,
+                "last_flush": self._last_flush_time,
+                "last_flush_latency_seconds": self._last_flush_latency,
+                "avg_flush_latency_seconds": sum(latencies) / len(latencies) if latencies else 0,
+                "max_flush_latency_seconds": self._max_flush_latency
+            }
+
+    def _flush_loop(self) -> None:
+        while self._running:
+            # Sleep in small chunks to allow for graceful shutdown
+            for _ in range(self.flush_interval):
+                if not self._running:
+                    return
+                time.sleep(1)
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+
+# Global reading time buffer instance
+reading_time_buffer = ReadingTimeBuffer()
+
+
+def start_reading_time_buffer() -> None:
+    """Start the background reading time flush"""
+    reading_time_buffer.start()
+
+
+def stop_reading_time_buffer() -> None:
+    """Stop the background reading time flush and write pending increments"""
+    reading_time_buffer.stop()
@@ -10,6 +10,7 @@ from flask import Blueprint, jsonify, request
 from cache import article_cache
 from config import DEBUG_LOGGING
 from models import ArticleManager, normalize_tags
+from reading_time import reading_time_buffer
 
 # Create a Blueprint for article modification routes
 api_bp = Blueprint('article_modifications', __name__, url_prefix='/api')
@@ -46,8 +47,6 @@ def update_article_rating(article_id: int):
 
         success = ArticleManager.update_article_rating(article_id, rating)
         if success:
-            # Clear cache to ensure fresh data
-            article_cache.invalidate_cache()
             log_response("update_article_rating", start_time, article_id=article_id, rating=rating)
             return jsonify({"message": "Rating updated successfully", "rating": rating})
         else:
@@ -72,16 +71,14 @@ def add_reading_time(article_id: int):
         seconds = data['seconds']
         if not isinstance(seconds, int) or seconds < 0:
             return jsonify({"error": "Seconds must be a positive integer"}), 400
-        print(seconds)
-        success = ArticleManager.add_reading_time(article_id, seconds)
-        if success:
-            # Clear cache to ensure fresh data
-            article_cache.invalidate_cache()
-            log_response("add_reading_time", start_time, article_id=article_id, seconds=seconds)
-            return jsonify({"message": "Reading time added successfully", "seconds_added": seconds})
-        else:
+        if article_cache.get_article_by_id(article_id) is None:
             return jsonify({"error": "Article not found"}), 404
 
+        # Heartbeats are buffered and written in batches by the reading time buffer
+        reading_time_buffer.add(article_id)
+        log_response("add_reading_time", start_time, article_id=article_id, seconds=seconds)
+        return jsonify({"message": "Reading time added successfully", "seconds_added": seconds})
+
     except Exception as e:
         log_response("add_reading_time", start_time, status="error", error=str(e))
         return jsonify({"error": f"Error adding reading time: {str(e)}"}), 500
@@ -104,8 +101,6 @@ def update_article_comments(article_id: int):
 
         success = ArticleManager.update_article_comments(article_id, comments)
         if success:
-            # Clear cache to ensure fresh data
-            article_cache.invalidate_cache()
             log_response("update_article_comments", start_time, article_id=article_id)
             return jsonify({"message": "Comments updated successfully", "comments": comments})
         else:
@@ -136,8 +131,6 @@ def update_article_tags(article_id: int):
 
         success = ArticleManager.update_article_tags(article_id, normalized_tags)
         if success:
-            # Clear cache to ensure fresh data
-            article_cache.invalidate_cache()
             log_response("update_article_tags", start_time, article_id=article_id, tags=normalized_tags)
             return jsonify({"message": "Tags updated successfully", "tags": normalized_tags})
         else:
@@ -10,6 +10,7 @@ from flask import Blueprint, jsonify, request
 from ai import pretreat_articles
 from cache import article_cache
 from config import DEBUG_LOGGING
+from json_cache import cached_json
 
 # Create a Blueprint for article routes
 api_bp = Blueprint('articles', __name__, url_prefix='/api')
@@ -30,6 +31,7 @@ def log_response(endpoint_name: str, start_time: float, status: str = "success",
 
 
 @api_bp.route('/articles', methods=['GET'])
+@cached_json
 def get_articles():
     """Route GET for retrieving all articles (backward compatibility)"""
     start_time = time.time()
@@ -38,13 +40,14 @@ def get_articles():
     try:
         articles = article_cache.get_articles()
         log_response("get_articles", start_time, count=len(articles))
-        return jsonify(articles)
+        return jsonify([article.to_dict() for article in articles])
     except Exception as e:
         log_response("get_articles", start_time, "error", error=str(e))
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
 
 @api_bp.route('/articles', methods=['POST'])
+@cached_json
 def get_articles_paginated():
     """Route POST for retrieving articles with pagination"""
     start_time = time.time()
@@ -54,8 +57,9 @@ def get_articles_paginated():
         data = request.get_json() or {}
         start = data.get('start', 1)
         end = data.get('end', 20)
+        cursor = data.get('cursor')  # Optional next_cursor of the previous page
 
-        log_request("get_articles_paginated", start_time, start=start, end=end)
+        log_request("get_articles_paginated", start_time, start=start, end=end, cursor=cursor)
 
         # Validate parameters
         if not isinstance(start, int) or not isinstance(end, int):
@@ -67,8 +71,11 @@ def get_articles_paginated():
         if end < start:
             return jsonify({"error": "Parameter 'end' must be greater than or equal to 'start'"}), 400
 
+        if cursor is not None and not isinstance(cursor, str):
+            return jsonify({"error": "Parameter 'cursor' must be a string"}), 400
+
         # Get paginated articles
-        result = article_cache.get_paginated_articles(start, end)
+        result = article_cache.get_paginated_articles(start, end, cursor)
 
         log_response("get_articles_paginated", start_time,
                     returned=result["pagination"]["returned"],
@@ -76,12 +83,16 @@ def get_articles_paginated():
 
         return jsonify(result)
 
+    except ValueError as e:
+        log_response("get_articles_paginated", start_time, "error", error=str(e))
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         log_response("get_articles_paginated", start_time, "error", error=str(e))
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
 
 @api_bp.route('/titles', methods=['POST'])
+@cached_json
 def get_titles_paginated():
     """Route POST for retrieving only titles with pagination and sorting"""
     start_time = time.time()
@@ -91,17 +102,19 @@ def get_titles_paginated():
         data = request.get_json() or {}
         page = data.get('page', 1)
         per_page = data.get('per_page', 20)
-        sort_by = data.get('sort_by', 'date')  # 'date' or 'order'
+        sort_by = data.get('sort_by', 'date')  # 'date', 'order', 'rating', 'time_spent' or 'relevance'
         search = data.get('search')  # Optional search term
+        cursor = data.get('cursor')  # Optional next_cursor of the previous page, replaces 'page'
 
-        log_request("get_titles_paginated", start_time, page=page, per_page=per_page, sort_by=sort_by, search=search)
+        log_request("get_titles_paginated", start_time, page=page, per_page=per_page, sort_by=sort_by,
+                    search=search, cursor=cursor)
 
         # Validate parameters
         if not isinstance(page, int) or not isinstance(per_page, int):
             return jsonify({"error": "Parameters 'page' and 'per_page' must be integers"}), 400
 
-        if sort_by not in ['date', 'order']:
-            return jsonify({"error": "Parameter 'sort_by' must be 'date' or 'order'"}), 400
+        if sort_by not in ['date', 'order', 'rating', 'time_spent', 'relevance']:
+            return jsonify({"error": "Parameter 'sort_by' must be 'date', 'order', 'rating', 'time_spent' or 'relevance'"}), 400
 
         if page < 1:
             return jsonify({"error": "Parameter 'page' must be greater than 0"}), 400
@@ -109,8 +122,11 @@ def get_titles_paginated():
         if per_page < 1:
             return jsonify({"error": "Parameter 'per_page' must be greater than 0"}), 400
 
+        if cursor is not None and not isinstance(cursor, str):
+            return jsonify({"error": "Parameter 'cursor' must be a string"}), 400
+
         # Get paginated titles
-        result = article_cache.get_paginated_titles(page, per_page, sort_by, search)
+        result = article_cache.get_paginated_titles(page, per_page, sort_by, search, cursor)
 
         log_response("get_titles_paginated", start_time,
                     returned=result["pagination"]["returned"],
@@ -118,12 +134,16 @@ def get_titles_paginated():
 
         return jsonify(result)
 
+    except ValueError as e:
+        log_response("get_titles_paginated", start_time, "error", error=str(e))
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         log_response("get_titles_paginated", start_time, "error", error=str(e))
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
 
 @api_bp.route('/article/<int:article_id>', methods=['GET'])
+@cached_json
 def get_single_article(article_id):
     """Route GET for retrieving a single article by ID"""
     start_time = time.time()
@@ -137,7 +157,7 @@ def get_single_article(article_id):
             return jsonify({"error": "Article not found"}), 404
 
         log_response("get_single_article", start_time, article_id=article_id)
-        return jsonify(article)
+        return jsonify(article.to_dict())
 
     except Exception as e:
         log_response("get_single_article", start_time, "error", error=str(e))
@@ -188,8 +208,8 @@ def get_articles_length():
 def pretreat_articles_route():
     """Pretreat articles for better summarization"""
     try:
-        pretreat_articles()
-        return jsonify({"message": "Articles pretreatment initiated"}), 200
+        stats = pretreat_articles()
+        return jsonify({"message": "Articles pretreatment initiated", "stats": stats}), 200
     except Exception as e:
         return jsonify({"error": f"Error initiating pretreatment: {str(e)}"}), 500
 
@@ -200,22 +220,17 @@ def filter_articles():
     start_time = time.time()
 
     tags = request.args.getlist('tags')  # Permet plusieurs tags: ?tags=tech&tags=ai
+    match = request.args.get('match', 'any')  # 'any' (au moins un tag) ou 'all' (tous les tags)
     min_rating = request.args.get('min_rating', type=int)
 
-    log_request("filter_articles", start_time, tags=tags, min_rating=min_rating)
+    log_request("filter_articles", start_time, tags=tags, match=match, min_rating=min_rating)
 
-    try:
-        from models import ArticleManager
-        articles = ArticleManager.load_articles()
+    if match not in ['any', 'all']:
+        return jsonify({"error": "Parameter 'match' must be 'any' or 'all'"}), 400
 
-        # Filter by tags if provided
-        if tags:
-            filtered_by_tags = []
-            for article in articles:
-                article_tags = article.get("tags", [])
-                if any(tag in article_tags for tag in tags):
-                    filtered_by_tags.append(article)
-            articles = filtered_by_tags
+    try:
+        # Filter by tags through the cache's tag index
+        articles = article_cache.filter_by_tags(tags, match)
 
         # Filter by rating if provided
         if min_rating is not None:
@@ -229,7 +244,7 @@ def filter_articles():
         # Les IDs originaux sont déjà dans les articles, pas besoin de les redéfinir
 
         log_response("filter_articles", start_time, article_count=len(articles))
-        return jsonify(articles)
+        return jsonify([article.to_dict() for article in articles])
 
     except Exception as e:
         log_response("filter_articles", start_time, status="error", error=str(e))
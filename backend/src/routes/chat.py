@@ -3,11 +3,12 @@ Chat routes module for News Summary Backend
 Contains routes for AI chat functionality and conversation management
 """
 
+import json
 import time
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 
-from ai import chat_with_ai
+from ai import chat_with_ai, stream_chat_with_ai
 from config import DEBUG_LOGGING
 from models import ChatManager
 
@@ -86,6 +87,66 @@ def chat_about_article(article_id):
         return jsonify({"error": f"Error processing chat request: {str(e)}"}), 500
 
 
+def format_sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@api_bp.route('/articles/<article_id>/chat/stream', methods=['POST'])
+def stream_chat_about_article(article_id):
+    """Chat with AI about a specific article, relaying the answer over Server-Sent Events"""
+    start_time = time.time()
+
+    # Get request data
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or 'question' not in data:
+        return jsonify({"error": "Question is required"}), 400
+    if not isinstance(data['question'], str):
+        return jsonify({"error": "Question must be a string"}), 400
+
+    user_question = data['question'].strip()
+    if not user_question:
+        return jsonify({"error": "Question cannot be empty"}), 400
+
+    # Optional model selection (default to mistral small)
+    model_name = data.get('model', 'mistral small')
+
+    log_request("stream_chat_about_article", start_time,
+               article_id=article_id,
+               question_length=len(user_question),
+               model=model_name)
+
+    def generate():
+        model_used = model_name
+        for event in stream_chat_with_ai(article_id, user_question, model_name):
+            if event["type"] == "start":
+                model_used = event["model_used"]
+            elif event["type"] == "done":
+                # Persist the exchange once the whole answer is known
+                ChatManager.add_message(article_id, 'user', user_question)
+                ChatManager.add_message(article_id, 'ai', event["answer"], model_used)
+
+                log_request("stream_chat_about_article", start_time,
+                           article_id=article_id,
+                           response_length=len(event["answer"]),
+                           status="success")
+            elif event["type"] == "error":
+                log_request("stream_chat_about_article", start_time,
+                           article_id=article_id,
+                           error=event["error"],
+                           status="error")
+
+            payload = {key: value for key, value in event.items() if key != "type"}
+            if event["type"] == "done":
+                payload["question"] = user_question
+            yield format_sse(event["type"], payload)
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # Disable proxy buffering so tokens arrive as they are produced
+    })
+
+
 @api_bp.route('/articles/<article_id>/chat/history', methods=['GET'])
 def get_chat_history(article_id):
     """Get chat history for a specific article"""
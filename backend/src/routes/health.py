@@ -5,8 +5,12 @@ Contains health checks and cache management routes
 
 from flask import Blueprint, jsonify
 
+from ai import pretreatment_pool, response_cache
 from cache import article_cache
-from config import DEBUG_LOGGING
+from config import DEBUG_LOGGING, PRETREATMENT_QUEUE
+from json_cache import json_response_cache
+from reading_time import reading_time_buffer
+from scraper import http_cache
 
 # Create a Blueprint for health and system routes
 api_bp = Blueprint('health', __name__, url_prefix='/api')
@@ -31,6 +35,53 @@ def get_cache_status():
     return jsonify(article_cache.get_cache_info())
 
 
+@api_bp.route('/cache/responses/status', methods=['GET'])
+def get_response_cache_status():
+    """Get JSON response cache counters (hits, misses, 304s)"""
+    if not DEBUG_LOGGING:
+        return jsonify({"error": "Debug endpoint not available"}), 404
+
+    return jsonify(json_response_cache.get_stats())
+
+
+@api_bp.route('/reading-time/status', methods=['GET'])
+def get_reading_time_status():
+    """Get reading time buffer metrics (pending increments, flush latency)"""
+    if not DEBUG_LOGGING:
+        return jsonify({"error": "Debug endpoint not available"}), 404
+
+    return jsonify(reading_time_buffer.get_stats())
+
+
+@api_bp.route('/pretreat/status', methods=['GET'])
+def get_pretreatment_status():
+    """Get pretreatment progress and throughput (articles/min, p50/p95 latency) and the queued jobs"""
+    if not DEBUG_LOGGING:
+        return jsonify({"error": "Debug endpoint not available"}), 404
+
+    stats = pretreatment_pool.get_stats()
+    stats["queue"] = pretreatment_pool.queue.get_stats(PRETREATMENT_QUEUE)
+    return jsonify(stats)
+
+
+@api_bp.route('/ai/cache/status', methods=['GET'])
+def get_ai_cache_status():
+    """Get AI response cache hit rate and size"""
+    if not DEBUG_LOGGING:
+        return jsonify({"error": "Debug endpoint not available"}), 404
+
+    return jsonify(response_cache.get_stats())
+
+
+@api_bp.route('/scraper/http-cache/status', methods=['GET'])
+def get_http_cache_status():
+    """Get scraper HTTP cache counters per source (hits, misses, bytes saved)"""
+    if not DEBUG_LOGGING:
+        return jsonify({"error": "Debug endpoint not available"}), 404
+
+    return jsonify(http_cache.get_stats())
+
+
 @api_bp.route('/cache/refresh', methods=['POST'])
 def refresh_cache():
     """Force refresh the cache"""
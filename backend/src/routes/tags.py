@@ -7,8 +7,9 @@ import time
 
 from flask import Blueprint, jsonify
 
+from cache import article_cache
 from config import DEBUG_LOGGING, TAG_CATEGORIES, BASIC_TAGS
-from models import ArticleManager
+from json_cache import cached_json
 
 # Create a Blueprint for tag routes
 api_bp = Blueprint('tags', __name__, url_prefix='/api')
@@ -29,15 +30,17 @@ def log_response(endpoint_name: str, start_time: float, status: str = "success",
 
 
 @api_bp.route('/tags', methods=['GET'])
+@cached_json
 def get_all_tags():
     """Get all unique tags from all articles"""
     start_time = time.time()
     log_request("get_all_tags", start_time)
 
     try:
-        tags = ArticleManager.get_all_tags()
+        tags = article_cache.get_all_tags()
+        counts = article_cache.get_tag_counts()
         log_response("get_all_tags", start_time, tag_count=len(tags))
-        return jsonify({"tags": tags})
+        return jsonify({"tags": tags, "counts": {tag: counts.get(tag, 0) for tag in tags}})
 
     except Exception as e:
         log_response("get_all_tags", start_time, status="error", error=str(e))
@@ -45,6 +48,7 @@ def get_all_tags():
 
 
 @api_bp.route('/tags/categories', methods=['GET'])
+@cached_json
 def get_tag_categories():
     """Get organized tag categories"""
     start_time = time.time()
@@ -52,7 +56,7 @@ def get_tag_categories():
 
     try:
         # Get all actual tags from articles
-        all_article_tags = ArticleManager.get_all_tags()
+        all_article_tags = set(article_cache.get_all_tags())
 
         # Organize tags by categories
         organized_tags = {
@@ -86,7 +90,7 @@ def get_tag_categories():
             all_defined_tags.update(category_data["sub_tags"])
         all_defined_tags.update(BASIC_TAGS)
 
-        organized_tags["other_tags"] = [tag for tag in all_article_tags if tag not in all_defined_tags]
+        organized_tags["other_tags"] = sorted(tag for tag in all_article_tags if tag not in all_defined_tags)
 
         log_response("get_tag_categories", start_time)
         return jsonify(organized_tags)
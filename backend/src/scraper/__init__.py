@@ -6,10 +6,18 @@ Contains all scraping functionality organized by source
 from .scraping_service import ScrapingService, start_scraper, stop_scraper
 from .techcrunch_scraper import TechCrunchScraper
 from .france_info_scraper import FranceInfoScraper
+from .fetching import HostRateLimiter
+from .registry import create_scrapers, register_scraper
+from .http_cache import HttpCache, http_cache
 
 __all__ = [
     'TechCrunchScraper',
     'FranceInfoScraper',
+    'HostRateLimiter',
+    'create_scrapers',
+    'register_scraper',
+    'HttpCache',
+    'http_cache',
     'ScrapingService',
     'start_scraper',
     'stop_scraper'
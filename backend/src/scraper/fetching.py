@@ -0,0 +1,88 @@
+"""
+Fetching helpers for the scrapers
+Per-host rate limiting and a bounded worker pool for article downloads
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, TypeVar
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import SCRAPER_HOST_INTERVAL, SCRAPER_MAX_WORKERS
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host without slowing down the other hosts"""
+
+    def __init__(self, min_interval: float = SCRAPER_HOST_INTERVAL):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, url: str) -> float:
+        """
+        Block until a request to the host of `url` is allowed
+
+        Each caller reserves the next free slot for the host, so concurrent
+        workers are served one interval apart without holding the lock while
+        sleeping.
+
+        Args:
+            url: URL about to be requested
+
+        Returns:
+            Number of seconds waited
+        """
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+def create_session(max_workers: int = SCRAPER_MAX_WORKERS) -> requests.Session:
+    """Create a scraper HTTP session whose connection pool fits the worker pool"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    adapter = HTTPAdapter(pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_concurrently(fetch: Callable[[T], R], items: Iterable[T],
+                       max_workers: int = SCRAPER_MAX_WORKERS) -> List[R]:
+    """
+    Run `fetch` over items with a bounded pool of threads
+
+    Args:
+        fetch: Function downloading a single item
+        items: Items to download
+        max_workers: Maximum number of concurrent downloads
+
+    Returns:
+        Results in the same order as items
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [fetch(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(fetch, items))
+
+
+# Shared by every scraper so that politeness holds across sources
+host_rate_limiter = HostRateLimiter()
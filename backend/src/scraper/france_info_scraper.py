@@ -3,90 +3,106 @@ France Info scraper module for News Summary Backend
 Contains France Info article scraping functionality
 """
 
-import time
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from config import (DEBUG_LOGGING, FRANCE_INFO_BASE_URL,
-                    FRANCE_INFO_CARD_CLASSES, FRANCE_INFO_CONTENT_CLASS,
-                    FRANCE_INFO_POLITIQUE_URL, FRANCE_INFO_SOURCE, TAG_CATEGORIES)
-from models import Article, ArticleManager
+from config import DEBUG_LOGGING, SCRAPER_MAX_WORKERS, SCRAPER_SOURCES
+from models import Article, ArticleManager, SeenIndex
 
+from .fetching import create_session, fetch_concurrently, host_rate_limiter
+from .http_cache import http_cache
+from .parsing import PARAGRAPHS, has_class, parse_html
+from .registry import register_scraper
 
-class FranceInfoScraper:
-    """France Info article scraper"""
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+@register_scraper("france_info")
+class FranceInfoScraper:
+    """
+    France Info article scraper
+
+    Listing pages hold article cards (selector "cards", links relative to
+    "base_url"); article pages have an <h1> title and content blocks
+    (selector "content").
+    """
+
+    def __init__(self, source: Optional[Dict] = None):
+        self.source = source or SCRAPER_SOURCES["france_info"]
+        self.source_name = self.source["source"]
+        self.required_tag = self.source.get("required_tag")
+        self.max_workers = self.source.get("max_workers", SCRAPER_MAX_WORKERS)
+        self.base_url = self.source.get("base_url", "")
+        self.card_classes = self.source["selectors"]["cards"]
+        self.content_class = self.source["selectors"]["content"]
+        # Seuls les liens des cartes de la liste et le titre et le corps d'un article sont construits
+        self.listing_strainer = SoupStrainer("a", class_=self.card_classes)
+        self.article_strainer = SoupStrainer(self._is_article_part)
+        self.session = create_session(self.max_workers)
+
+    def _is_article_part(self, name: str, attrs: Dict) -> bool:
+        """Titre (h1) et blocs de contenu d'une page article"""
+        return name == "h1" or (name == "div" and has_class(attrs, self.content_class))
 
     def get_article_links(self) -> List[str]:
-        """Récupère toutes les URLs d'articles depuis la page politique"""
-        try:
-            response = self.session.get(FRANCE_INFO_POLITIQUE_URL, timeout=10)
-            response.raise_for_status()
+        """
+        Récupère toutes les URLs d'articles depuis les pages de liste de la source
+
+        Raises:
+            Exception: La dernière erreur si toutes les pages de liste ont échoué
+        """
+        urls = []
+        errors = []
+        for listing_url in self.source["listing_urls"]:
+            try:
+                host_rate_limiter.wait(listing_url)
+                # Une page inchangée (HTTP 304) renvoie le résultat précédent sans la reparser
+                urls.extend(http_cache.get(self.session, listing_url, self._parse_listing, self.source_name))
+
+            except requests.exceptions.RequestException as e:
+                errors.append(e)
+                if DEBUG_LOGGING:
+                    print(f"[FRANCE_INFO_SCRAPER] HTTP request error: {e}")
+            except Exception as e:
+                errors.append(e)
+                if DEBUG_LOGGING:
+                    print(f"[FRANCE_INFO_SCRAPER] Unexpected error in get_article_links: {e}")
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            urls = []
+        # Aucune page de liste récupérée : le passage a échoué, ce n'est pas un passage vide
+        if errors and len(errors) == len(self.source["listing_urls"]):
+            raise errors[-1]
 
-            for class_name in FRANCE_INFO_CARD_CLASSES:
-                for link in soup.find_all("a", class_=class_name):
-                    href = link.get("href")
-                    if href:
-                        if href.startswith("http"):
-                            urls.append(href)
-                        else:
-                            urls.append(FRANCE_INFO_BASE_URL + href)
+        if DEBUG_LOGGING:
+            print(f"[FRANCE_INFO_SCRAPER] Found {len(urls)} article links")
 
-            # Remove duplicates
-            urls = list(set(urls))
+        return urls
 
-            if DEBUG_LOGGING:
-                print(f"[FRANCE_INFO_SCRAPER] Found {len(urls)} article links")
+    def _parse_listing(self, html: str) -> List[str]:
+        """Extrait les URLs d'articles du HTML d'une page de liste"""
+        soup = parse_html(html, self.listing_strainer)
+        urls = []
 
-            return urls
+        for class_name in self.card_classes:
+            for link in soup.find_all("a", class_=class_name):
+                href = link.get("href")
+                if href:
+                    if href.startswith("http"):
+                        urls.append(href)
+                    else:
+                        urls.append(self.base_url + href)
 
-        except requests.exceptions.RequestException as e:
-            if DEBUG_LOGGING:
-                print(f"[FRANCE_INFO_SCRAPER] HTTP request error: {e}")
-            return []
-        except Exception as e:
-            if DEBUG_LOGGING:
-                print(f"[FRANCE_INFO_SCRAPER] Unexpected error in get_article_links: {e}")
-            return []
+        # Remove duplicates
+        return list(set(urls))
 
     def get_article_content(self, url: str) -> Tuple[str, str]:
         """Récupère le titre et le contenu d'un article"""
         try:
+            host_rate_limiter.wait(url)
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Get title
-            title = ""
-            title_element = soup.find("h1")
-            if title_element:
-                title = title_element.get_text(strip=True)
-
-            # Get content
-            content_blocks = soup.find_all("div", class_=FRANCE_INFO_CONTENT_CLASS)
-            content = "\n".join(block.get_text(strip=True, separator=" ") for block in content_blocks)
-
-            if not content:
-                # Fallback: try to get paragraphs
-                paragraphs = soup.find_all('p')
-                content_parts = []
-                for para in paragraphs:
-                    text = para.text.strip()
-                    if text and len(text) > 20:
-                        content_parts.append(text)
-                content = "\n".join(content_parts)
+            title, content = self._parse_article(response.text)
 
             if DEBUG_LOGGING:
                 print(f"[FRANCE_INFO_SCRAPER] Scraped article: {title[:50]}...")
@@ -102,44 +118,70 @@ class FranceInfoScraper:
                 print(f"[FRANCE_INFO_SCRAPER] Unexpected error scraping {url}: {e}")
             return "", f"Error processing article content: {str(e)}"
 
+    def _parse_article(self, html: str) -> Tuple[str, str]:
+        """Extrait le titre et le contenu du HTML d'un article"""
+        soup = parse_html(html, self.article_strainer)
+
+        # Get title
+        title = ""
+        title_element = soup.find("h1")
+        if title_element:
+            title = title_element.get_text(strip=True)
+
+        # Get content
+        content_blocks = soup.find_all("div", class_=self.content_class)
+        content = "\n".join(block.get_text(strip=True, separator=" ") for block in content_blocks)
+
+        if not content:
+            # Fallback: try to get paragraphs
+            paragraphs = parse_html(html, PARAGRAPHS).find_all('p')
+            content_parts = []
+            for para in paragraphs:
+                text = para.text.strip()
+                if text and len(text) > 20:
+                    content_parts.append(text)
+            content = "\n".join(content_parts)
+
+        return title, content
+
     def scrape_new_articles(self) -> List[Article]:
         """Scrape new articles and return them as Article objects"""
         if DEBUG_LOGGING:
             print("[FRANCE_INFO_SCRAPER] Starting to scrape new articles...")
 
-        # Get existing articles to avoid duplicates
-        existing_articles = ArticleManager.load_articles()
-        existing_titles = {a["title"] for a in existing_articles}
-        existing_urls = {a["url"] for a in existing_articles}
+        # Known articles are looked up in the seen index instead of loading the storage
+        seen = ArticleManager.get_seen_index()
+        batch = SeenIndex(index_file=None)
 
         # Get article links
         article_links = self.get_article_links()
 
-        new_articles = []
+        new_links = []
         for link in article_links:
-            if link not in existing_urls:
-                if DEBUG_LOGGING:
-                    print(f"[FRANCE_INFO_SCRAPER] Scraping new article: {link}")
-
-                title, content = self.get_article_content(link)
-
-                if title and title not in existing_titles and content:
-                    required_tag = TAG_CATEGORIES["politique"]["main_tag"]
-                    article = Article(
-                        title=title,
-                        url=link,
-                        content=content,
-                        has_been_pretreat=False,
-                        tags=[required_tag] if required_tag else [],  # Tag obligatoire pour France Info
-                        source=FRANCE_INFO_SOURCE,
-                        scraped_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    )
-                    new_articles.append(article)
-                    existing_titles.add(title)
-                    existing_urls.add(link)
-
-                # Add small delay between requests to be respectful
-                time.sleep(1)
+            if not seen.contains_url(link) and not batch.contains_url(link):
+                new_links.append(link)
+                batch.add(url=link)
+        if DEBUG_LOGGING:
+            for link in new_links:
+                print(f"[FRANCE_INFO_SCRAPER] Scraping new article: {link}")
+
+        # Fetch the pages in parallel; the host rate limiter keeps requests spaced out
+        results = fetch_concurrently(self.get_article_content, new_links, max_workers=self.max_workers)
+
+        new_articles = []
+        for link, (title, content) in zip(new_links, results):
+            if title and not seen.contains_title(title) and not batch.contains_title(title) and content:
+                article = Article(
+                    title=title,
+                    url=link,
+                    content=content,
+                    has_been_pretreat=False,
+                    tags=[self.required_tag] if self.required_tag else [],  # Tag obligatoire de la source
+                    source=self.source_name,
+                    scraped_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                )
+                new_articles.append(article)
+                batch.add(title=title)
 
         if DEBUG_LOGGING:
             print(f"[FRANCE_INFO_SCRAPER] Found {len(new_articles)} new articles")
@@ -0,0 +1,143 @@
+"""
+HTTP cache module for the scrapers
+Conditional GET (ETag / Last-Modified) for listing pages, persisted on disk
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from config import DEBUG_LOGGING, HTTP_CACHE_FILE
+
+
+class HttpCache:
+    """
+    Revalidates listing pages instead of downloading them again
+
+    For each URL the cache keeps the validators sent by the server and the
+    result of parsing the page. The next request sends If-None-Match /
+    If-Modified-Since; on a 304 the stored result is returned without
+    downloading or parsing the page again.
+    """
+
+    def __init__(self, cache_file: Optional[str] = HTTP_CACHE_FILE):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def get(self, session: requests.Session, url: str, parse: Callable[[str], Any],
+            source: str, timeout: int = 10) -> Any:
+        """
+        Fetch and parse a page, reusing the previous result if it did not change
+
+        Args:
+            session: Session used for the request
+            url: Page URL
+            parse: Function turning the page HTML into a JSON-serializable result
+            source: Source name the counters are recorded under
+            timeout: Request timeout in seconds
+
+        Returns:
+            Parsed result
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(url)
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, timeout=timeout, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self._record(source, hits=1, bytes_saved=entry.get("size", 0))
+                self._save()
+            if DEBUG_LOGGING:
+                print(f"[HTTP_CACHE] {source}: {url} not modified")
+            return copy.deepcopy(entry["data"])
+
+        response.raise_for_status()
+        data = parse(response.text)
+
+        with self._lock:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._entries[url] = {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "size": len(response.content),
+                    "stored_at": time.time(),
+                    "data": data
+                }
+            else:
+                # Server sent no validators: nothing to revalidate against
+                self._entries.pop(url, None)
+            self._record(source, misses=1, bytes_downloaded=len(response.content))
+            self._save()
+        return copy.deepcopy(data)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get hit/miss/bytes counters per source"""
+        with self._lock:
+            self._ensure_loaded()
+            return copy.deepcopy(self._stats)
+
+    def clear(self) -> None:
+        """Forget every stored page and counter"""
+        with self._lock:
+            self._entries = {}
+            self._stats = {}
+            self._save()
+
+    def _record(self, source: str, **counters: int) -> None:
+        stats = self._stats.setdefault(source, {
+            "hits": 0, "misses": 0, "bytes_downloaded": 0, "bytes_saved": 0
+        })
+        for name, value in counters.items():
+            stats[name] = stats.get(name, 0) + value
+
+    def _ensure_loaded(self) -> None:
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = data.get("entries", {})
+            self._stats = data.get("stats", {})
+        except (json.JSONDecodeError, OSError, AttributeError) as e:
+            if DEBUG_LOGGING:
+                print(f"[HTTP_CACHE] Error loading HTTP cache, starting empty: {e}")
+
+    def _save(self) -> None:
+        if not self.cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            tmp_file = self.cache_file + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"entries": self._entries, "stats": self._stats}, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            if DEBUG_LOGGING:
+                print(f"[HTTP_CACHE] Error saving HTTP cache: {e}")
+
+
+# Global HTTP cache shared by the scrapers
+http_cache = HttpCache()
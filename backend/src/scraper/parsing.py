@@ -0,0 +1,44 @@
+"""
+HTML parsing module for News Summary Backend
+Builds BeautifulSoup trees with the lxml backend, limited to the elements a scraper reads
+"""
+
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    # Slower pure-Python fallback
+    HTML_PARSER = "html.parser"
+
+# Every paragraph, for the fallbacks used when a page lacks the expected container
+PARAGRAPHS = SoupStrainer("p")
+
+
+def parse_html(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse a page, building only the elements matched by parse_only
+
+    Elements outside the strainer (head, scripts, navigation, footers) are
+    skipped while parsing instead of being built and then ignored; a matched
+    element is kept with all its descendants.
+
+    Args:
+        html: Page HTML
+        parse_only: Optional strainer selecting the top-level elements to keep
+
+    Returns:
+        The (partial) parsed tree
+    """
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+
+def has_class(attrs: Dict, class_name: str) -> bool:
+    """Check the class attribute of a tag being parsed (still a raw string at that point)"""
+    classes = attrs.get("class") or ""
+    if isinstance(classes, str):
+        classes = classes.split()
+    return class_name in classes
@@ -0,0 +1,50 @@
+"""
+Scraper registry module for News Summary Backend
+Maps scraper implementations to names and builds one scraper per configured source
+"""
+
+from typing import Any, Callable, Dict, Optional, Type
+
+from config import DEBUG_LOGGING, SCRAPER_SOURCES
+
+# Scraper classes by the name used in the "scraper" field of SCRAPER_SOURCES
+SCRAPERS: Dict[str, Type] = {}
+
+
+def register_scraper(name: str) -> Callable[[Type], Type]:
+    """
+    Class decorator registering a scraper implementation
+
+    A scraper is built with its source configuration (a SCRAPER_SOURCES
+    entry) and exposes scrape_new_articles().
+
+    Args:
+        name: Name sources refer to this implementation by
+    """
+    def decorator(scraper_class: Type) -> Type:
+        SCRAPERS[name] = scraper_class
+        return scraper_class
+    return decorator
+
+
+def create_scrapers(sources: Optional[Dict[str, Dict]] = None) -> Dict[str, Any]:
+    """
+    Build the scraper of every enabled source
+
+    Args:
+        sources: Source configurations by id (SCRAPER_SOURCES by default)
+
+    Returns:
+        Scrapers by source id; sources with an unknown implementation are skipped
+    """
+    scrapers = {}
+    for source_id, source in (SCRAPER_SOURCES if sources is None else sources).items():
+        if not source.get("enabled", True):
+            continue
+        scraper_class = SCRAPERS.get(source.get("scraper"))
+        if scraper_class is None:
+            if DEBUG_LOGGING:
+                print(f"[SCRAPER_REGISTRY] Unknown scraper '{source.get('scraper')}' for source '{source_id}'")
+            continue
+        scrapers[source_id] = scraper_class(source)
+    return scrapers
@@ -5,25 +5,146 @@ Contains the background scraping service and global functions
 
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
 
-import ai as ai
+from config import (DEBUG_LOGGING, SCRAPER_BUSY_HIT_RATE, SCRAPER_HIT_RATE_SMOOTHING, SCRAPER_INTERVAL_FACTOR,
+                    SCRAPER_MAX_INTERVAL, SCRAPER_MIN_INTERVAL, SCRAPER_QUIET_HIT_RATE, SCRAPER_SOURCES,
+                    SCRAPING_INTERVAL)
+from models import Article, ArticleManager
 
-from config import DEBUG_LOGGING, SCRAPING_INTERVAL
-from models import ArticleManager
+# Importing the scrapers registers them
+from . import france_info_scraper, techcrunch_scraper  # noqa: F401
+from .registry import create_scrapers
 
-from .france_info_scraper import FranceInfoScraper
-from .techcrunch_scraper import TechCrunchScraper
+# Seconds before retrying a source whose run failed
+RETRY_DELAY = 60
 
 
 class ScrapingService:
-    """Service to manage continuous scraping in a background thread"""
-
-    def __init__(self):
-        self.techcrunch_scraper = TechCrunchScraper()
-        self.france_info_scraper = FranceInfoScraper()
+    """
+    Service to manage continuous scraping in a background thread
+
+    Every configured source (SCRAPER_SOURCES) is polled on its own interval:
+    a source is scheduled again `interval` seconds after its previous run
+    ends, and never runs twice at the same time. Each source downloads its
+    article pages with its own "max_workers" budget.
+
+    Intervals adapt to the hit rate of each source (new articles per poll,
+    smoothed): a busy source is polled more often so that its articles show
+    up sooner, a quiet one less often to save listing fetches, within the
+    source's min/max bounds.
+    """
+
+    def __init__(self, sources: Optional[Dict[str, Dict]] = None):
+        self.sources = SCRAPER_SOURCES if sources is None else sources
+        self.scrapers = create_scrapers(self.sources)
+        self.next_runs: Dict[str, float] = {source_id: 0.0 for source_id in self.scrapers}
+        # Current interval and smoothed hit rate of each source
+        self.intervals: Dict[str, float] = {}
+        self.hit_rates: Dict[str, Optional[float]] = {source_id: None for source_id in self.scrapers}
         self.running = False
         self.thread = None
 
+    def _scrape_source(self, source_id: str) -> List[Article]:
+        """Scrape one source for scrape_all_sources, so that a failing source does not discard the others"""
+        try:
+            return self.scrapers[source_id].scrape_new_articles()
+        except Exception as e:
+            if DEBUG_LOGGING:
+                print(f"[SCRAPING_SERVICE] Error scraping {source_id}: {e}")
+            return []
+
+    def scrape_all_sources(self) -> Dict[str, List[Article]]:
+        """Scrape every source concurrently, without storing the articles"""
+        if not self.scrapers:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(self.scrapers)) as executor:
+            futures = {source_id: executor.submit(self._scrape_source, source_id) for source_id in self.scrapers}
+            return {source_id: future.result() for source_id, future in futures.items()}
+
+    def get_interval(self, source_id: str) -> float:
+        """Get the current number of seconds between two runs of a source"""
+        if source_id not in self.intervals:
+            self.intervals[source_id] = self._clamp_interval(
+                source_id, self.sources[source_id].get("interval", SCRAPING_INTERVAL))
+        return self.intervals[source_id]
+
+    def _clamp_interval(self, source_id: str, interval: float) -> float:
+        source = self.sources[source_id]
+        return max(source.get("min_interval", SCRAPER_MIN_INTERVAL),
+                   min(source.get("max_interval", SCRAPER_MAX_INTERVAL), interval))
+
+    def adapt_interval(self, source_id: str, hits: int) -> float:
+        """
+        Update the hit rate of a source after a poll and adjust its interval
+
+        Args:
+            source_id: ID of the source in SCRAPER_SOURCES
+            hits: Number of new articles the poll found
+
+        Returns:
+            The new interval in seconds
+        """
+        previous = self.hit_rates.get(source_id)
+        rate = hits if previous is None else (
+            SCRAPER_HIT_RATE_SMOOTHING * hits + (1 - SCRAPER_HIT_RATE_SMOOTHING) * previous)
+        self.hit_rates[source_id] = rate
+
+        interval = self.get_interval(source_id)
+        if rate >= SCRAPER_BUSY_HIT_RATE:
+            interval /= SCRAPER_INTERVAL_FACTOR
+        elif rate < SCRAPER_QUIET_HIT_RATE:
+            interval *= SCRAPER_INTERVAL_FACTOR
+        self.intervals[source_id] = self._clamp_interval(source_id, interval)
+        return self.intervals[source_id]
+
+    def get_due_sources(self, now: Optional[float] = None) -> List[str]:
+        """Get the sources whose next run time has come (monotonic clock)"""
+        now = time.monotonic() if now is None else now
+        return [source_id for source_id, next_run in self.next_runs.items() if next_run <= now]
+
+    def run_source(self, source_id: str) -> int:
+        """
+        Scrape a source, store its new articles and schedule its next run
+
+        Args:
+            source_id: ID of the source in SCRAPER_SOURCES
+
+        Returns:
+            Number of articles added
+        """
+        added_count = 0
+        try:
+            # Scrapers raise when none of their listing pages could be fetched: the run is retried sooner
+            new_articles = self.scrapers[source_id].scrape_new_articles()
+            if new_articles:
+                added_count = ArticleManager.add_new_articles(new_articles)
+                if DEBUG_LOGGING:
+                    print(f"[SCRAPING_SERVICE] Added {added_count} new articles from {source_id}")
+            elif DEBUG_LOGGING:
+                print(f"[SCRAPING_SERVICE] No new articles found for {source_id}")
+            # Stored articles are queued for pretreatment by the storage (see PretreatmentPool)
+            delay = self.adapt_interval(source_id, added_count)
+        except Exception as e:
+            if DEBUG_LOGGING:
+                print(f"[SCRAPING_SERVICE] Error running {source_id}: {e}")
+            # Wait a bit before retrying on error, without counting the poll in the hit rate
+            delay = min(self.get_interval(source_id), RETRY_DELAY)
+
+        self.next_runs[source_id] = time.monotonic() + delay
+        if DEBUG_LOGGING:
+            print(f"[SCRAPING_SERVICE] Next check of {source_id} in {delay} seconds")
+        return added_count
+
+    def get_schedule(self) -> Dict[str, Dict]:
+        """Get the interval, the hit rate and the seconds until the next run of every source"""
+        now = time.monotonic()
+        return {source_id: {"interval": self.get_interval(source_id),
+                            "hit_rate": self.hit_rates.get(source_id),
+                            "next_run_in": max(0.0, next_run - now)}
+                for source_id, next_run in self.next_runs.items()}
+
     def start(self):
         """Start the background scraping service"""
         if not self.running:
@@ -40,47 +161,20 @@ class ScrapingService:
             print("[SCRAPING_SERVICE] Background scraping service stopped")
 
     def _scraping_loop(self):
-        """Main scraping loop that runs in background"""
+        """Main scheduling loop that runs in background"""
         if DEBUG_LOGGING:
-            print("[SCRAPING_SERVICE] Scraping loop started")
-
-        while self.running:
-            try:
-                # Scrape new articles from both sources
-                techcrunch_articles = self.techcrunch_scraper.scrape_new_articles()
-                france_info_articles = self.france_info_scraper.scrape_new_articles()
-
-                # Combine all new articles
-                all_new_articles = techcrunch_articles + france_info_articles
-
-                # Add them to the database
-                if all_new_articles:
-                    added_count = ArticleManager.add_new_articles(all_new_articles)
-                    if DEBUG_LOGGING:
-                        tc_count = len(techcrunch_articles)
-                        fi_count = len(france_info_articles)
-                        print(f"[SCRAPING_SERVICE] Added {added_count} new articles "
-                              f"({tc_count} from TechCrunch, {fi_count} from France Info)")
-                else:
-                    if DEBUG_LOGGING:
-                        print("[SCRAPING_SERVICE] No new articles found")
-
-                # Wait before next iteration
-                if DEBUG_LOGGING:
-                    print(f"[SCRAPING_SERVICE] Waiting {SCRAPING_INTERVAL} seconds before next check...")
-                ai.pretreat_articles()
+            print(f"[SCRAPING_SERVICE] Scraping loop started for {', '.join(self.scrapers) or 'no source'}")
+
+        in_flight: Dict[str, Future] = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(self.scrapers))) as executor:
+            while self.running:
+                for source_id in self.get_due_sources():
+                    if source_id not in in_flight:
+                        in_flight[source_id] = executor.submit(self.run_source, source_id)
+                for source_id in [source_id for source_id, future in in_flight.items() if future.done()]:
+                    del in_flight[source_id]
                 # Sleep in small chunks to allow for graceful shutdown
-                for _ in range(SCRAPING_INTERVAL):
-                    if not self.running:
-                        break
-                    time.sleep(1)
-
-
-            except Exception as e:
-                if DEBUG_LOGGING:
-                    print(f"[SCRAPING_SERVICE] Error in scraping loop: {e}")
-                # Wait a bit before retrying on error
-                time.sleep(60)
+                time.sleep(1)
 
         if DEBUG_LOGGING:
             print("[SCRAPING_SERVICE] Scraping loop ended")
@@ -97,4 +191,4 @@ def start_scraper():
 
 def stop_scraper():
     """Stop the background scraping service"""
-    scraping_service.stop()
\ No newline at end of file
+    scraping_service.stop()
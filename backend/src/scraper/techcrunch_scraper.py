@@ -3,92 +3,112 @@ TechCrunch scraper module for News Summary Backend
 Contains TechCrunch article scraping functionality
 """
 
-import time
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from config import (DEBUG_LOGGING, PARAGRAPH_CLASS, TAG_CATEGORIES, TECHCRUNCH_SOURCE,
-                    TECHCRUNCH_URL, TITLE_CLASS)
-from models import Article, ArticleManager
+from config import DEBUG_LOGGING, SCRAPER_MAX_WORKERS, SCRAPER_SOURCES
+from models import Article, ArticleManager, SeenIndex
 
+from .fetching import create_session, fetch_concurrently, host_rate_limiter
+from .http_cache import http_cache
+from .parsing import PARAGRAPHS, parse_html
+from .registry import register_scraper
 
-class TechCrunchScraper:
-    """TechCrunch article scraper"""
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+@register_scraper("techcrunch")
+class TechCrunchScraper:
+    """
+    TechCrunch article scraper
+
+    Listing pages hold title cards (selector "title") linking to articles
+    whose body is made of paragraphs (selector "paragraph").
+    """
+
+    def __init__(self, source: Optional[Dict] = None):
+        self.source = source or SCRAPER_SOURCES["techcrunch"]
+        self.source_name = self.source["source"]
+        self.required_tag = self.source.get("required_tag")
+        self.max_workers = self.source.get("max_workers", SCRAPER_MAX_WORKERS)
+        self.title_class = self.source["selectors"]["title"]
+        self.paragraph_class = self.source["selectors"]["paragraph"]
+        # Only the title cards of the listing and the body paragraphs of an article are built
+        self.listing_strainer = SoupStrainer(class_=self.title_class)
+        self.article_strainer = SoupStrainer("p", class_=self.paragraph_class)
+        self.session = create_session(self.max_workers)
 
     def get_titles_and_links(self) -> tuple[List[str], List[str]]:
-        """Scrape article titles and links from TechCrunch AI category"""
-        titles = []
-        links = []
+        """
+        Scrape article titles and links from the listing pages of the source
+
+        Raises:
+            Exception: The last error if every listing page failed
+        """
+        titles, links = [], []
+        errors = []
+        for listing_url in self.source["listing_urls"]:
+            try:
+                host_rate_limiter.wait(listing_url)
+                # An unchanged listing (HTTP 304) returns the previous result without parsing
+                listing = http_cache.get(self.session, listing_url, self._parse_listing, self.source_name)
+                titles.extend(listing["titles"])
+                links.extend(listing["links"])
+
+            except requests.exceptions.RequestException as e:
+                errors.append(e)
+                if DEBUG_LOGGING:
+                    print(f"[SCRAPER] HTTP request error: {e}")
+            except Exception as e:
+                errors.append(e)
+                if DEBUG_LOGGING:
+                    print(f"[SCRAPER] Unexpected error in get_titles_and_links: {e}")
 
-        try:
-            response = self.session.get(TECHCRUNCH_URL, timeout=10)
-            response.raise_for_status()
+        # A poll where no listing could be fetched is a failure, not an empty poll
+        if errors and len(errors) == len(self.source["listing_urls"]):
+            raise errors[-1]
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            title_elements = soup.find_all(class_=TITLE_CLASS)
+        if DEBUG_LOGGING:
+            print(f"[SCRAPER] Found {len(titles)} articles from {self.source_name}")
 
-            if not title_elements:
-                if DEBUG_LOGGING:
-                    print(f"[SCRAPER] No elements found with class '{TITLE_CLASS}'")
-                return [], []
-
-            for element in title_elements:
-                link_element = element.find('a')
-                if link_element and 'href' in link_element.attrs:
-                    title_text = element.text.strip()
-                    link_href = link_element['href']
-                    if title_text and link_href:
-                        titles.append(title_text)
-                        links.append(link_href)
+        return titles, links
 
-            if DEBUG_LOGGING:
-                print(f"[SCRAPER] Found {len(titles)} articles from TechCrunch")
+    def _parse_listing(self, html: str) -> Dict[str, List[str]]:
+        """Extract article titles and links from the listing page HTML"""
+        titles = []
+        links = []
 
-            return titles, links
+        soup = parse_html(html, self.listing_strainer)
+        title_elements = soup.find_all(class_=self.title_class)
 
-        except requests.exceptions.RequestException as e:
+        if not title_elements:
             if DEBUG_LOGGING:
-                print(f"[SCRAPER] HTTP request error: {e}")
-            return [], []
-        except Exception as e:
-            if DEBUG_LOGGING:
-                print(f"[SCRAPER] Unexpected error in get_titles_and_links: {e}")
-            return [], []
+                print(f"[SCRAPER] No elements found with class '{self.title_class}'")
+            return {"titles": [], "links": []}
+
+        for element in title_elements:
+            link_element = element.find('a')
+            if link_element and 'href' in link_element.attrs:
+                title_text = element.text.strip()
+                link_href = link_element['href']
+                if title_text and link_href:
+                    titles.append(title_text)
+                    links.append(link_href)
+
+        return {"titles": titles, "links": links}
 
     def get_article_content(self, url: str) -> str:
         """Scrape the content of a specific article"""
         try:
+            host_rate_limiter.wait(url)
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            paragraphs = soup.find_all('p', class_=PARAGRAPH_CLASS)
-
-            if not paragraphs:
-                # Fallback: try to get any paragraphs
-                paragraphs = soup.find_all('p')
-                if DEBUG_LOGGING:
-                    print(f"[SCRAPER] No paragraphs with class '{PARAGRAPH_CLASS}' found, using fallback")
-
-            content_parts = []
-            for para in paragraphs:
-                text = para.text.strip()
-                if text and len(text) > 20:  # Filter out very short paragraphs
-                    content_parts.append(text)
-
-            if content_parts:
-                content = "\n".join(content_parts)
+            content = self._parse_article(response.text)
+            if content:
                 if DEBUG_LOGGING:
-                    print(f"[SCRAPER] Scraped {len(content_parts)} paragraphs from {url}")
+                    print(f"[SCRAPER] Scraped {len(content.splitlines())} paragraphs from {url}")
                 return content
             else:
                 return f"No substantial content found for this article: {url}"
@@ -102,42 +122,59 @@ class TechCrunchScraper:
                 print(f"[SCRAPER] Unexpected error scraping {url}: {e}")
             return f"Error processing article content: {str(e)}"
 
+    def _parse_article(self, html: str) -> str:
+        """Extract the body paragraphs of an article page (empty string if none)"""
+        paragraphs = parse_html(html, self.article_strainer).find_all('p', class_=self.paragraph_class)
+
+        if not paragraphs:
+            # Fallback: try to get any paragraphs
+            paragraphs = parse_html(html, PARAGRAPHS).find_all('p')
+            if DEBUG_LOGGING:
+                print(f"[SCRAPER] No paragraphs with class '{self.paragraph_class}' found, using fallback")
+
+        content_parts = []
+        for para in paragraphs:
+            text = para.text.strip()
+            if text and len(text) > 20:  # Filter out very short paragraphs
+                content_parts.append(text)
+        return "\n".join(content_parts)
+
     def scrape_new_articles(self) -> List[Article]:
         """Scrape new articles and return them as Article objects"""
         if DEBUG_LOGGING:
             print("[SCRAPER] Starting to scrape new articles...")
 
-        # Get existing articles to avoid duplicates
-        existing_articles = ArticleManager.load_articles()
-        existing_titles = {a["title"] for a in existing_articles}
-        existing_urls = {a["url"] for a in existing_articles}
+        # Known articles are looked up in the seen index instead of loading the storage
+        seen = ArticleManager.get_seen_index()
+        batch = SeenIndex(index_file=None)
 
         # Get titles and links from TechCrunch
         titles, links = self.get_titles_and_links()
 
-        new_articles = []
+        new_items = []
         for title, link in zip(titles, links):
-            if title not in existing_titles and link not in existing_urls:
+            if not seen.contains(link, title) and not batch.contains(link, title):
                 if DEBUG_LOGGING:
                     print(f"[SCRAPER] Scraping new article: {title}")
+                new_items.append((title, link))
+                batch.add(link, title)
+
+        # Fetch the bodies in parallel; the host rate limiter keeps requests spaced out
+        contents = fetch_concurrently(self.get_article_content, [link for _, link in new_items],
+                                      max_workers=self.max_workers)
 
-                content = self.get_article_content(link)
-                required_tag = TAG_CATEGORIES["ia"]["main_tag"]
-                article = Article(
-                    title=title,
-                    url=link,
-                    content=content,
-                    has_been_pretreat=False,
-                    tags=[required_tag] if required_tag else [],  # Tag obligatoire pour TechCrunch
-                    source=TECHCRUNCH_SOURCE,
-                    scraped_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                )
-                new_articles.append(article)
-                existing_titles.add(title)
-                existing_urls.add(link)
-
-                # Add small delay between requests to be respectful
-                time.sleep(1)
+        new_articles = []
+        for (title, link), content in zip(new_items, contents):
+            article = Article(
+                title=title,
+                url=link,
+                content=content,
+                has_been_pretreat=False,
+                tags=[self.required_tag] if self.required_tag else [],  # Tag obligatoire de la source
+                source=self.source_name,
+                scraped_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            )
+            new_articles.append(article)
 
         if DEBUG_LOGGING:
             print(f"[SCRAPER] Found {len(new_articles)} new articles")
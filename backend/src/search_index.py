@@ -0,0 +1,276 @@
+"""
+Search index module for News Summary Backend
+Full-text inverted index over articles with BM25 ranking, persisted to disk
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set
+
+from config import DEBUG_LOGGING, SEARCH_INDEX_FILE
+
+# Fields of an article that are indexed
+INDEXED_FIELDS = ("title", "content", "comments", "tags")
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Bump when tokenization changes so that persisted indexes are rebuilt
+INDEX_VERSION = 1
+
+TOKEN_PATTERN = re.compile(r"\w+")
+LIGATURES = str.maketrans({"œ": "oe", "æ": "ae", "ß": "ss"})
+
+# Most frequent French and English function words, already accent-folded
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "will", "with",
+    "au", "aux", "ce", "ces", "dans", "de", "des", "du", "en", "est", "et", "il", "elle", "ils",
+    "la", "le", "les", "leur", "mais", "ne", "ou", "par", "pas", "pour", "qu", "que", "qui",
+    "sa", "se", "ses", "son", "sont", "sur", "un", "une"
+}
+
+
+def fold_text(text: str) -> str:
+    """Lowercase a text and strip its accents ("Élection" -> "election")"""
+    text = text.casefold().translate(LIGATURES)
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into accent-folded search terms"""
+    return [token for token in TOKEN_PATTERN.findall(fold_text(text))
+            if len(token) > 1 and token not in STOP_WORDS]
+
+
+def article_text(article: Dict) -> str:
+    """Concatenate the indexed fields of an article"""
+    parts = []
+    for field in INDEXED_FIELDS:
+        value = article.get(field)
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value)
+        elif value:
+            parts.append(str(value))
+    return "\n".join(parts)
+
+
+class SearchIndex:
+    """
+    Inverted index term -> {article id: term frequency} ranked with BM25
+
+    Each indexed article keeps a fingerprint of its indexed text. The index is
+    saved with its per-article term counts, so that on startup only the
+    articles whose fingerprint changed have to be tokenized again.
+    """
+
+    def __init__(self, index_file: Optional[str] = SEARCH_INDEX_FILE):
+        self.index_file = index_file
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_terms: Dict[int, Dict[str, int]] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._fingerprints: Dict[int, str] = {}
+        self._total_length = 0
+        self._loaded = False
+        self._dirty = False
+
+    def sync(self, articles: Iterable[Dict]) -> int:
+        """
+        Bring the index in line with a full list of articles
+
+        Loads the persisted index the first time, then only re-tokenizes new
+        or modified articles and drops removed ones.
+
+        Args:
+            articles: Complete list of articles, each with an "id"
+
+        Returns:
+            Number of articles (re)indexed or removed
+        """
+        with self._lock:
+            if not self._loaded:
+                self.load()
+
+            changes = 0
+            seen_ids = set()
+            for article in articles:
+                article_id = article.get("id")
+                seen_ids.add(article_id)
+                text = article_text(article)
+                if self._fingerprints.get(article_id) != self._fingerprint(text):
+                    self._index_text(article_id, text)
+                    changes += 1
+            for article_id in set(self._doc_terms) - seen_ids:
+                self._remove(article_id)
+                changes += 1
+
+            if changes:
+                self._dirty = True
+            # Also persists patches and inserts indexed since the last sync
+            self.save()
+            return changes
+
+    def set_article(self, article: Dict) -> None:
+        """Index a new article or re-index a modified one"""
+        with self._lock:
+            self._index_text(article.get("id"), article_text(article))
+            self._dirty = True
+
+    def remove_article(self, article_id: int) -> None:
+        """Remove an article from the index"""
+        with self._lock:
+            if article_id in self._doc_terms:
+                self._remove(article_id)
+                self._dirty = True
+
+    def search(self, query: str) -> Dict[int, float]:
+        """
+        Score the articles containing at least one query term
+
+        Args:
+            query: Free-text query
+
+        Returns:
+            Dictionary mapping article id to BM25 score
+        """
+        with self._lock:
+            document_count = len(self._doc_terms)
+            if not document_count:
+                return {}
+            average_length = self._total_length / document_count or 1
+
+            scores: Dict[int, float] = {}
+            for term in dict.fromkeys(tokenize(query)):
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (document_count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for article_id, frequency in posting.items():
+                    length_norm = 1 - BM25_B + BM25_B * self._doc_lengths[article_id] / average_length
+                    score = idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+                    scores[article_id] = scores.get(article_id, 0.0) + score
+            return scores
+
+    def get_article_ids(self) -> Set[int]:
+        """Get the ids of the indexed articles, loading the persisted index first if needed"""
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            return set(self._doc_terms)
+
+    def get_stats(self) -> Dict:
+        """Get information about the index"""
+        with self._lock:
+            return {
+                "documents": len(self._doc_terms),
+                "terms": len(self._postings),
+                "total_length": self._total_length,
+                "index_file": self.index_file
+            }
+
+    def load(self) -> bool:
+        """
+        Load the persisted index
+
+        Returns:
+            True if a compatible index file was loaded
+        """
+        with self._lock:
+            self._loaded = True
+            if not self.index_file or not os.path.exists(self.index_file):
+                return False
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") != INDEX_VERSION:
+                    return False
+
+                self._clear()
+                for key, document in data.get("documents", {}).items():
+                    self._add_terms(int(key), document["terms"], document["fingerprint"])
+                if DEBUG_LOGGING:
+                    print(f"[SEARCH] Loaded search index: {len(self._doc_terms)} articles, {len(self._postings)} terms")
+                return True
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                if DEBUG_LOGGING:
+                    print(f"[SEARCH] Error loading search index, rebuilding it: {e}")
+                self._clear()
+                return False
+
+    def save(self) -> bool:
+        """
+        Persist the index if it changed since the last save
+
+        Returns:
+            True if the file was written
+        """
+        with self._lock:
+            if not self._dirty or not self.index_file:
+                return False
+            data = {
+                "version": INDEX_VERSION,
+                "documents": {
+                    str(article_id): {"fingerprint": self._fingerprints[article_id], "terms": terms}
+                    for article_id, terms in self._doc_terms.items()
+                }
+            }
+            try:
+                os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+                tmp_file = self.index_file + ".tmp"
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_file, self.index_file)
+                self._dirty = False
+                return True
+            except OSError as e:
+                if DEBUG_LOGGING:
+                    print(f"[SEARCH] Error saving search index: {e}")
+                return False
+
+    def _index_text(self, article_id: int, text: str) -> None:
+        terms: Dict[str, int] = {}
+        for token in tokenize(text):
+            terms[token] = terms.get(token, 0) + 1
+        self._remove(article_id)
+        self._add_terms(article_id, terms, self._fingerprint(text))
+
+    def _add_terms(self, article_id: int, terms: Dict[str, int], fingerprint: str) -> None:
+        self._doc_terms[article_id] = terms
+        self._fingerprints[article_id] = fingerprint
+        length = sum(terms.values())
+        self._doc_lengths[article_id] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[article_id] = frequency
+
+    def _remove(self, article_id: int) -> None:
+        terms = self._doc_terms.pop(article_id, None)
+        if terms is None:
+            return
+        self._fingerprints.pop(article_id, None)
+        self._total_length -= self._doc_lengths.pop(article_id, 0)
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(article_id, None)
+                if not posting:
+                    del self._postings[term]
+
+    def _clear(self) -> None:
+        self._postings = {}
+        self._doc_terms = {}
+        self._doc_lengths = {}
+        self._fingerprints = {}
+        self._total_length = 0
+
+    @staticmethod
+    def _fingerprint(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,194 @@
+"""
+Sort index module for News Summary Backend
+Article ids kept presorted for each title sort order, maintained alongside the article cache
+"""
+
+import base64
+import bisect
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_DATE = "1900-01-01"
+
+# Sort key of each order; articles are listed by decreasing key, then decreasing id
+SORT_KEYS: Dict[str, Callable[[Dict], Any]] = {
+    # Plus récents en premier, puis par ordre d'arrivée (id) si pas de date
+    "date": lambda article: article.get("date") or DEFAULT_DATE,
+    # Mieux notés en premier, articles sans note à la fin
+    "rating": lambda article: (article.get("rating") is not None, article.get("rating") or 0,
+                               article.get("date") or DEFAULT_DATE),
+    # Plus lus en premier
+    "time_spent": lambda article: (article.get("time_spent") or 0, article.get("date") or DEFAULT_DATE),
+}
+
+
+class SortIndex:
+    """
+    One sorted list of (key, article id) per sort order
+
+    Lists are kept in ascending order with bisect and read from the end, so
+    that a page of the unfiltered order is a slice and a changed article only
+    moves its own entry instead of triggering a full sort.
+    """
+
+    def __init__(self, sort_keys: Dict[str, Callable[[Dict], Any]] = SORT_KEYS):
+        self._sort_keys = sort_keys
+        self._entries: Dict[str, List[Tuple[Any, int]]] = {name: [] for name in sort_keys}
+        self._keys: Dict[str, Dict[int, Any]] = {name: {} for name in sort_keys}
+
+    def build(self, articles: Iterable[Dict]) -> None:
+        """Rebuild every order from a list of articles"""
+        articles = list(articles)
+        for name, sort_key in self._sort_keys.items():
+            keys = {article.get("id"): sort_key(article) for article in articles}
+            self._keys[name] = keys
+            self._entries[name] = sorted((key, article_id) for article_id, key in keys.items())
+
+    def set_article(self, article: Dict) -> None:
+        """Add an article or move it to its new place in the orders whose key changed"""
+        article_id = article.get("id")
+        for name, sort_key in self._sort_keys.items():
+            key = sort_key(article)
+            keys = self._keys[name]
+            if article_id in keys:
+                if keys[article_id] == key:
+                    continue
+                self._remove_entry(name, article_id)
+            keys[article_id] = key
+            bisect.insort(self._entries[name], (key, article_id))
+
+    def remove_article(self, article_id: int) -> None:
+        """Remove an article from every order"""
+        for name in self._sort_keys:
+            if article_id in self._keys[name]:
+                self._remove_entry(name, article_id)
+
+    def get_page(self, sort_by: str, start: int, end: int,
+                 article_ids: Optional[Set[int]] = None) -> List[int]:
+        """
+        Get the ids of a page of articles in a sort order
+
+        Args:
+            sort_by: Name of the order
+            start: Index of the first article of the page (0-based)
+            end: Index after the last article of the page
+            article_ids: Optional subset to paginate (search results); the
+                         presorted order is walked until the page is filled
+
+        Returns:
+            Article ids, highest key first
+        """
+        entries = self._entries[sort_by]
+        if article_ids is not None and start >= len(article_ids):
+            return []
+        return self._collect(entries, len(entries), start, end - start, article_ids)
+
+    def get_page_after(self, sort_by: str, cursor: Tuple[Any, int], count: int,
+                       article_ids: Optional[Set[int]] = None) -> List[int]:
+        """
+        Get the ids of the articles that follow a cursor in a sort order
+
+        The cursor is located with a binary search, so resuming does not
+        depend on how deep the page is, and articles added before the cursor
+        since the previous page do not shift the results.
+
+        Args:
+            sort_by: Name of the order
+            cursor: (key, article id) of the last article already returned
+            count: Maximum number of ids to return
+            article_ids: Optional subset to paginate (search results)
+
+        Returns:
+            Article ids, highest key first
+
+        Raises:
+            ValueError: If the cursor key is not a key of this order
+        """
+        entries = self._entries[sort_by]
+        try:
+            stop = bisect.bisect_left(entries, cursor)
+        except TypeError:
+            raise ValueError(f"Cursor does not match the '{sort_by}' order")
+        return self._collect(entries, stop, 0, count, article_ids)
+
+    def get_key(self, sort_by: str, article_id: int) -> Any:
+        """Get the key of an article in a sort order"""
+        return self._keys[sort_by].get(article_id)
+
+    @staticmethod
+    def _collect(entries: List[Tuple[Any, int]], stop: int, skip: int, count: int,
+                 article_ids: Optional[Set[int]]) -> List[int]:
+        """Read up to count ids downwards from entries[stop - 1], after skipping the first skip ones"""
+        if count <= 0:
+            return []
+        if article_ids is None:
+            return [article_id for _, article_id in reversed(entries[max(0, stop - skip - count):max(0, stop - skip)])]
+
+        page: List[int] = []
+        skipped = 0
+        for index in range(stop - 1, -1, -1):
+            article_id = entries[index][1]
+            if article_id not in article_ids:
+                continue
+            if skipped < skip:
+                skipped += 1
+                continue
+            page.append(article_id)
+            if len(page) >= count:
+                break
+        return page
+
+    def _remove_entry(self, name: str, article_id: int) -> None:
+        key = self._keys[name].pop(article_id)
+        entries = self._entries[name]
+        index = bisect.bisect_left(entries, (key, article_id))
+        if index < len(entries) and entries[index] == (key, article_id):
+            del entries[index]
+
+
+def encode_cursor(sort_by: str, key: Any, article_id: int) -> str:
+    """
+    Encode the position of an article in a sort order as an opaque cursor
+
+    Args:
+        sort_by: Name of the order the cursor belongs to
+        key: Sort key of the article (None for the insertion order)
+        article_id: ID of the article
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([sort_by, key, article_id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string
+        sort_by: Order the cursor is used with
+
+    Returns:
+        (key, article id), with JSON lists turned back into tuples
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, key, article_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if name != sort_by:
+        raise ValueError(f"Cursor was issued for the '{name}' order, not '{sort_by}'")
+    if not isinstance(article_id, int):
+        raise ValueError("Invalid cursor")
+    return _as_key(key), article_id
+
+
+def _as_key(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_as_key(item) for item in value)
+    return value
@@ -0,0 +1,81 @@
+"""
+Tag index module for News Summary Backend
+Inverted index from tag to article ids, maintained alongside the article cache
+"""
+
+from typing import Dict, Iterable, List, Set
+
+
+class TagIndex:
+    """Posting lists mapping each tag to the ids of the articles carrying it"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._article_tags: Dict[int, List[str]] = {}
+
+    def build(self, articles: Iterable[Dict]) -> None:
+        """Rebuild the whole index from a list of articles"""
+        self._postings = {}
+        self._article_tags = {}
+        for article in articles:
+            self.set_article_tags(article.get("id"), article.get("tags") or [])
+
+    def set_article_tags(self, article_id: int, tags: Iterable[str]) -> None:
+        """Add an article or replace its tags, only touching the changed posting lists"""
+        new_tags = list(dict.fromkeys(tags))
+        old_tags = self._article_tags.get(article_id, [])
+
+        for tag in set(old_tags) - set(new_tags):
+            posting = self._postings.get(tag)
+            if posting is not None:
+                posting.discard(article_id)
+                if not posting:
+                    del self._postings[tag]
+        for tag in set(new_tags) - set(old_tags):
+            self._postings.setdefault(tag, set()).add(article_id)
+
+        self._article_tags[article_id] = new_tags
+
+    def remove_article(self, article_id: int) -> None:
+        """Remove an article from every posting list"""
+        self.set_article_tags(article_id, [])
+        self._article_tags.pop(article_id, None)
+
+    def get_article_ids(self, tags: List[str], match: str = "any") -> Set[int]:
+        """
+        Get the ids of the articles matching the given tags
+
+        Args:
+            tags: Tags to look up
+            match: 'any' for articles with at least one of the tags (OR),
+                   'all' for articles with every tag (AND)
+
+        Returns:
+            Set of matching article ids
+        """
+        postings = [self._postings.get(tag, set()) for tag in dict.fromkeys(tags)]
+        if not postings:
+            return set()
+
+        if match == "all":
+            # Walk the shortest posting list and probe the others
+            postings.sort(key=len)
+            smallest, others = postings[0], postings[1:]
+            return {article_id for article_id in smallest if all(article_id in other for other in others)}
+
+        result: Set[int] = set()
+        for posting in postings:
+            result.update(posting)
+        return result
+
+    def get_tags(self) -> List[str]:
+        """Get every tag currently used by at least one article"""
+        return sorted(self._postings)
+
+    def get_counts(self) -> Dict[str, int]:
+        """Get the number of articles per tag"""
+        return {tag: len(posting) for tag, posting in self._postings.items()}
+
+    def get_count(self, tag: str) -> int:
+        """Get the number of articles carrying a tag"""
+        return len(self._postings.get(tag, ()))
@@ -0,0 +1,181 @@
+"""
+Title index module for News Summary Backend
+Character trigram index used to answer fuzzy title searches without scanning every article
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+# Same threshold as the original per-word similarity check
+SIMILARITY_THRESHOLD = 0.8
+PADDING = "\x00\x00"
+
+
+def bounded_levenshtein(str1: str, str2: str, max_distance: int) -> int:
+    """
+    Levenshtein distance that gives up as soon as it exceeds max_distance
+
+    Args:
+        str1: First string
+        str2: Second string
+        max_distance: Largest distance worth computing exactly
+
+    Returns:
+        The edit distance, or max_distance + 1 if it is larger
+    """
+    if len(str1) < len(str2):
+        str1, str2 = str2, str1
+    if len(str1) - len(str2) > max_distance:
+        return max_distance + 1
+    if not str2:
+        return len(str1)
+
+    previous_row = list(range(len(str2) + 1))
+    for i, c1 in enumerate(str1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(str2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        # Every later cell derives from this row, so the distance can only grow
+        if min(current_row) > max_distance:
+            return max_distance + 1
+        previous_row = current_row
+
+    return min(previous_row[-1], max_distance + 1)
+
+
+def max_edit_distance(length: int) -> int:
+    """Largest edit distance that still gives a similarity >= SIMILARITY_THRESHOLD"""
+    distance = 0
+    while distance < length and (length - distance - 1) / length >= SIMILARITY_THRESHOLD:
+        distance += 1
+    return distance
+
+
+def _trigrams(word: str, padded: bool = True) -> Set[str]:
+    if padded:
+        word = PADDING + word + PADDING
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class TitleIndex:
+    """
+    Inverted indexes over lowercased title words
+
+    Titles are split into words (word -> article ids) and every distinct word
+    is indexed by its padded character trigrams (trigram -> words). A search
+    word only ever has to be compared with the vocabulary words sharing one of
+    its trigrams, instead of with every word of every title.
+    """
+
+    def __init__(self):
+        self._word_articles: Dict[str, Set[int]] = {}
+        self._trigram_words: Dict[str, Set[str]] = {}
+        self._article_words: Dict[int, Set[str]] = {}
+        self._distances: Dict[int, int] = {}
+
+    def build(self, articles: Iterable[Dict]) -> None:
+        """Rebuild the whole index from a list of articles"""
+        self._word_articles = {}
+        self._trigram_words = {}
+        self._article_words = {}
+        for article in articles:
+            self.set_article_title(article.get("id"), article.get("title"))
+
+    def set_article_title(self, article_id: int, title: Optional[str]) -> None:
+        """Add an article or replace its title"""
+        self.remove_article(article_id)
+        if not title:
+            # Untitled articles never match a search
+            return
+
+        words = set(title.lower().split())
+        self._article_words[article_id] = words
+        for word in words:
+            if word not in self._word_articles:
+                self._word_articles[word] = set()
+                for trigram in _trigrams(word):
+                    self._trigram_words.setdefault(trigram, set()).add(word)
+            self._word_articles[word].add(article_id)
+
+    def remove_article(self, article_id: int) -> None:
+        """Remove an article from the index"""
+        for word in self._article_words.pop(article_id, ()):
+            articles = self._word_articles.get(word)
+            if articles is None:
+                continue
+            articles.discard(article_id)
+            if not articles:
+                del self._word_articles[word]
+                for trigram in _trigrams(word):
+                    words = self._trigram_words.get(trigram)
+                    if words is not None:
+                        words.discard(word)
+                        if not words:
+                            del self._trigram_words[trigram]
+
+    def search(self, search_term: str) -> Set[int]:
+        """
+        Get the ids of the articles whose title matches the search term
+
+        Same semantics as a per-article check: every search word must be
+        contained in a title word, or be within 80% Levenshtein similarity of
+        one when both words are longer than 3 characters.
+
+        Args:
+            search_term: Search string
+
+        Returns:
+            Set of matching article ids
+        """
+        search_words = list(dict.fromkeys(search_term.lower().split()))
+        if not search_words:
+            return set(self._article_words)
+
+        # Resolve the rarest words first so the intersection shrinks quickly
+        word_matches = [self._matching_words(search_word) for search_word in search_words]
+        word_matches.sort(key=len)
+
+        result: Optional[Set[int]] = None
+        for words in word_matches:
+            articles: Set[int] = set()
+            for word in words:
+                articles.update(self._word_articles[word])
+            result = articles if result is None else result & articles
+            if not result:
+                return set()
+        return result or set()
+
+    def get_vocabulary_size(self) -> int:
+        """Get the number of distinct title words"""
+        return len(self._word_articles)
+
+    def _matching_words(self, search_word: str) -> List[str]:
+        """Get the vocabulary words matched by a single search word"""
+        if len(search_word) < 3:
+            # Too short to have an unpadded trigram: scan the vocabulary
+            return [word for word in self._word_articles if search_word in word]
+
+        # Candidates sharing at least one padded trigram. A substring contains
+        # all of the search word's inner trigrams, and a word within the edit
+        # distance bound always keeps at least one padded trigram in common.
+        candidates: Set[str] = set()
+        for trigram in _trigrams(search_word):
+            candidates.update(self._trigram_words.get(trigram, ()))
+
+        matches = []
+        for word in candidates:
+            if search_word in word:
+                matches.append(word)
+            elif len(word) > 3 and len(search_word) > 3:
+                max_distance = self._max_distance(min(len(word), len(search_word)))
+                if bounded_levenshtein(word, search_word, max_distance) <= max_distance:
+                    matches.append(word)
+        return matches
+
+    def _max_distance(self, length: int) -> int:
+        distance = self._distances.get(length)
+        if distance is None:
+            distance = self._distances[length] = max_edit_distance(length)
+        return distance
@@ -16,9 +16,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from flask import Flask
 from routes import articles_bp, modifications_bp, chat_bp, health_bp, settings_bp, tags_bp
-from models import ArticleManager, ChatManager
+from models import Article, ArticleManager, ChatManager
 from settings import SettingsManager
 from cache import article_cache
+from reading_time import ReadingTimeBuffer
+from json_cache import json_response_cache
+from models.content_store import ContentStore
+from search_index import SearchIndex
 
 
 @pytest.fixture
@@ -35,9 +39,22 @@ def app():
     return app
 
 
+@pytest.fixture(autouse=True)
+def isolated_article_cache(tmp_path):
+    """Give the global cache a temporary content store and search index, so tests never rewrite the real ones."""
+    store = ContentStore(data_file=str(tmp_path / 'contents.bin'), index_file=str(tmp_path / 'contents.json'))
+    with patch.object(article_cache, 'search_index', SearchIndex(index_file=None)), \
+         patch('cache.content_store', store), patch('models.article.content_store', store):
+        article_cache.invalidate_cache()
+        yield
+    article_cache.invalidate_cache()
+
+
 @pytest.fixture
 def client(app):
     """A test client for the app."""
+    # Responses built from mocked data must not leak into other tests
+    json_response_cache.clear()
     return app.test_client()
 
 
@@ -101,7 +118,7 @@ class TestArticlesEndpoints:
     @patch('routes.articles.article_cache')
     def test_get_articles_success(self, mock_cache, client, sample_articles):
         """Test GET /api/articles endpoint."""
-        mock_cache.get_articles.return_value = sample_articles
+        mock_cache.get_articles.return_value = [Article.from_dict(article) for article in sample_articles]
 
         response = client.get('/api/articles')
         assert response.status_code == 200
@@ -178,6 +195,59 @@ class TestArticlesEndpoints:
         assert "titles" in result
         assert "pagination" in result
 
+    def test_get_titles_sorted_by_rating(self, client):
+        """Test POST /api/titles with the presorted rating order."""
+        data = {"page": 1, "per_page": 5, "sort_by": "rating"}
+
+        response = client.post('/api/titles',
+                             data=json.dumps(data),
+                             content_type='application/json')
+        assert response.status_code == 200
+        result = json.loads(response.data)
+        assert result["pagination"]["sort_by"] == "rating"
+        ratings = [title["rating"] for title in result["titles"] if title.get("rating") is not None]
+        assert ratings == sorted(ratings, reverse=True)
+
+    def test_get_titles_cursor(self, client):
+        """Test POST /api/titles resumed from the returned cursor."""
+        data = {"per_page": 1, "sort_by": "date"}
+        response = client.post('/api/titles',
+                             data=json.dumps(data),
+                             content_type='application/json')
+        assert response.status_code == 200
+        first = json.loads(response.data)
+
+        data["cursor"] = first["pagination"]["next_cursor"]
+        response = client.post('/api/titles',
+                             data=json.dumps(data),
+                             content_type='application/json')
+        assert response.status_code == 200
+        second = json.loads(response.data)
+        assert second["titles"][0]["id"] != first["titles"][0]["id"]
+
+        data["cursor"] = "invalid"
+        response = client.post('/api/titles',
+                             data=json.dumps(data),
+                             content_type='application/json')
+        assert response.status_code == 400
+
+    def test_get_titles_relevance(self, client):
+        """Test POST /api/titles with full-text relevance ranking."""
+        data = {"page": 1, "per_page": 5, "sort_by": "relevance", "search": "intelligence artificielle"}
+
+        response = client.post('/api/titles',
+                             data=json.dumps(data),
+                             content_type='application/json')
+        assert response.status_code == 200
+        result = json.loads(response.data)
+        assert result["pagination"]["sort_by"] == "relevance"
+
+        data["sort_by"] = "popularity"
+        response = client.post('/api/titles',
+                             data=json.dumps(data),
+                             content_type='application/json')
+        assert response.status_code == 400
+
     @patch('routes.articles.get_single_article')
     def test_get_article_by_id_success(self, mock_get_single, client):
         """Test GET /api/article/<id> endpoint."""
@@ -335,21 +405,52 @@ class TestTagsEndpoints:
                             content_type='application/json')
         assert response.status_code == 404
 
-    @patch('models.ArticleManager.get_all_tags')
-    def test_get_tags_success(self, mock_get_tags, client):
+    @patch('routes.tags.article_cache')
+    def test_get_tags_success(self, mock_cache, client):
         """Test GET /api/tags endpoint."""
-        mock_get_tags.return_value = ["tag1", "tag2", "tag3"]
+        mock_cache.get_all_tags.return_value = ["tag1", "tag2", "tag3"]
+        mock_cache.get_tag_counts.return_value = {"tag1": 2, "tag2": 1, "tag3": 1}
 
         response = client.get('/api/tags')
         assert response.status_code == 200
         data = json.loads(response.data)
         assert "tags" in data
         assert len(data['tags']) == 3
+        assert data['counts'] == {"tag1": 2, "tag2": 1, "tag3": 1}
+
+    @patch('json_cache.article_cache')
+    @patch('routes.tags.article_cache')
+    def test_get_tags_etag(self, mock_cache, mock_generation_cache, client):
+        """Test that repeated reads are served from the response cache and revalidated."""
+        mock_generation_cache.get_generation.return_value = 1
+        mock_cache.get_all_tags.return_value = ["tag1"]
+        mock_cache.get_tag_counts.return_value = {"tag1": 1}
 
-    @patch('models.ArticleManager.get_all_tags')
-    def test_get_tags_error(self, mock_get_tags, client):
+        response = client.get('/api/tags')
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+
+        response = client.get('/api/tags', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert mock_cache.get_all_tags.call_count == 1
+
+        # A new data generation recomputes the response; same bytes keep the same ETag
+        mock_generation_cache.get_generation.return_value = 2
+        response = client.get('/api/tags', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert mock_cache.get_all_tags.call_count == 2
+
+        mock_generation_cache.get_generation.return_value = 3
+        mock_cache.get_all_tags.return_value = ["tag1", "tag2"]
+        response = client.get('/api/tags', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+    @patch('routes.tags.article_cache')
+    def test_get_tags_error(self, mock_cache, client):
         """Test GET /api/tags endpoint with error."""
-        mock_get_tags.side_effect = Exception("Database error")
+        mock_cache.get_all_tags.side_effect = Exception("Database error")
 
         response = client.get('/api/tags')
         assert response.status_code == 500
@@ -417,6 +518,56 @@ class TestReadingTimeEndpoints:
         # The endpoint exists but may return 400 for validation errors
         assert response.status_code in [200, 400]
 
+    @patch('routes.article_modifications.reading_time_buffer')
+    @patch('routes.article_modifications.article_cache')
+    def test_reading_time_is_buffered(self, mock_cache, mock_buffer, client, sample_article):
+        """Test that heartbeats are buffered instead of written immediately."""
+        mock_cache.get_article_by_id.return_value = sample_article
+
+        response = client.post('/api/articles/1/reading-time',
+                             data=json.dumps({"seconds": 10}),
+                             content_type='application/json')
+        assert response.status_code == 200
+        mock_buffer.add.assert_called_once_with(1)
+
+    @patch('routes.article_modifications.reading_time_buffer')
+    @patch('routes.article_modifications.article_cache')
+    def test_reading_time_article_not_found(self, mock_cache, mock_buffer, client):
+        """Test reading time for a non-existent article."""
+        mock_cache.get_article_by_id.return_value = None
+
+        response = client.post('/api/articles/999/reading-time',
+                             data=json.dumps({"seconds": 10}),
+                             content_type='application/json')
+        assert response.status_code == 404
+        mock_buffer.add.assert_not_called()
+
+    @patch('models.ArticleManager.patch_articles')
+    def test_buffer_flush_coalesces_heartbeats(self, mock_patch):
+        """Test that a flush writes one batched patch per article."""
+        mock_patch.return_value = 2
+        buffer = ReadingTimeBuffer(flush_interval=60)
+        for article_id in [1, 1, 1, 2]:
+            buffer.add(article_id)
+        assert buffer.get_stats()["pending_increments"] == 4
+
+        assert buffer.flush() == 2
+        mock_patch.assert_called_once_with([(1, {}, {"time_spent": 3}), (2, {}, {"time_spent": 1})])
+        stats = buffer.get_stats()
+        assert stats["pending_articles"] == 0
+        assert stats["flush_count"] == 1
+
+    @patch('models.ArticleManager.patch_articles')
+    def test_buffer_flush_failure_keeps_increments(self, mock_patch):
+        """Test that increments survive a failed flush."""
+        mock_patch.side_effect = Exception("Disk full")
+        buffer = ReadingTimeBuffer(flush_interval=60)
+        buffer.add(1)
+
+        with pytest.raises(Exception):
+            buffer.flush()
+        assert buffer.get_pending(1) == 1
+
 
 class TestChatEndpoints:
     """Test cases for chat-related endpoints."""
@@ -443,6 +594,59 @@ class TestChatEndpoints:
                              content_type='application/json')
         assert response.status_code == 400
 
+    @patch('routes.chat.ChatManager.add_message')
+    @patch('routes.chat.stream_chat_with_ai')
+    def test_stream_chat_relays_tokens(self, mock_stream, mock_add_message, client):
+        """Test POST /api/articles/<id>/chat/stream relays events and persists the answer."""
+        mock_stream.return_value = iter([
+            {"type": "start", "article_title": "Test Article", "model_used": "mistral small"},
+            {"type": "token", "content": "Hello"},
+            {"type": "token", "content": " world"},
+            {"type": "done", "answer": "Hello world"}
+        ])
+
+        response = client.post('/api/articles/1/chat/stream',
+                             data=json.dumps({"question": "Summary?"}),
+                             content_type='application/json')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+
+        events = [block.split("\n") for block in response.get_data(as_text=True).strip().split("\n\n")]
+        assert [lines[0] for lines in events] == ["event: start", "event: token", "event: token", "event: done"]
+        assert json.loads(events[1][1][len("data: "):]) == {"content": "Hello"}
+        assert json.loads(events[3][1][len("data: "):])["answer"] == "Hello world"
+
+        mock_add_message.assert_any_call('1', 'user', "Summary?")
+        mock_add_message.assert_any_call('1', 'ai', "Hello world", "mistral small")
+
+    @patch('routes.chat.ChatManager.add_message')
+    @patch('routes.chat.stream_chat_with_ai')
+    def test_stream_chat_error_is_not_persisted(self, mock_stream, mock_add_message, client):
+        """Test that a failed stream sends an error event and saves nothing."""
+        mock_stream.return_value = iter([{"type": "error", "error": "AI service error: 500"}])
+
+        response = client.post('/api/articles/1/chat/stream',
+                             data=json.dumps({"question": "Summary?"}),
+                             content_type='application/json')
+        assert response.get_data(as_text=True).startswith("event: error\n")
+        mock_add_message.assert_not_called()
+
+    def test_stream_chat_missing_question(self, client):
+        """Test POST /api/articles/<id>/chat/stream with missing question."""
+        response = client.post('/api/articles/1/chat/stream',
+                             data=json.dumps({}),
+                             content_type='application/json')
+        assert response.status_code == 400
+
+    def test_stream_chat_invalid_question(self, client):
+        """Test POST /api/articles/<id>/chat/stream with a question that is not a string."""
+        for body in ({"question": 42}, {"question": None}, ["question"]):
+            response = client.post('/api/articles/1/chat/stream',
+                                 data=json.dumps(body),
+                                 content_type='application/json')
+            assert response.status_code == 400
+            assert "error" in json.loads(response.data)
+
     def test_chat_history_placeholder(self, client):
         """Placeholder test for chat history functionality."""
         response = client.get('/api/articles/1/chat/history')
@@ -520,6 +724,22 @@ class TestUtilityEndpoints:
         # The endpoint actually exists and returns 200
         assert response.status_code == 200
 
+    @patch('routes.articles.article_cache')
+    def test_filter_articles_match_all(self, mock_cache, client, sample_articles):
+        """Test GET /api/articles/filter with AND semantics and rating."""
+        mock_cache.filter_by_tags.return_value = [Article.from_dict(article) for article in sample_articles]
+
+        response = client.get('/api/articles/filter?tags=tech&tags=ai&match=all&min_rating=4')
+        assert response.status_code == 200
+        mock_cache.filter_by_tags.assert_called_once_with(["tech", "ai"], "all")
+        data = json.loads(response.data)
+        assert [article["id"] for article in data] == [0]
+
+    def test_filter_articles_invalid_match(self, client):
+        """Test GET /api/articles/filter with an unknown match mode."""
+        response = client.get('/api/articles/filter?tags=tech&match=some')
+        assert response.status_code == 400
+
     @patch('settings.SettingsManager.load_settings')
     def test_get_settings(self, mock_settings, client):
         """Test GET /api/settings endpoint."""
@@ -6,7 +6,10 @@ import json
 import os
 import sys
 import tempfile
+import threading
+import time
 import pytest
+import requests
 from unittest.mock import Mock, patch, MagicMock
 from typing import List, Dict, Any
 
@@ -15,12 +18,35 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from models import (
     ArticleManager,
+    ArticleDatabase,
+    ArticleLog,
     ChatManager,
     Article,
     normalize_tag,
     normalize_tags
 )
+from models.article import LAZY_CONTENT
+from models.article_storage import ArticleStorage
+from models.content_store import ContentStore
+from models.seen_index import SeenIndex, canonical_url
+from config import PRETREATMENT_QUEUE, SCRAPER_SOURCES
 from settings import SettingsManager
+from cache import ArticleCache
+from tag_index import TagIndex
+from title_index import TitleIndex, bounded_levenshtein
+from sort_index import SortIndex, decode_cursor, encode_cursor
+from search_index import SearchIndex, tokenize
+from scraper import (FranceInfoScraper, HostRateLimiter, ScrapingService, TechCrunchScraper, create_scrapers,
+                     register_scraper)
+from scraper.fetching import fetch_concurrently
+from scraper.registry import SCRAPERS
+from scraper.scraping_service import RETRY_DELAY
+from scraper.http_cache import HttpCache
+from ai.pretreatment import PretreatmentPool
+from job_queue import JobQueue
+from ai.processing import process_article_content
+from ai.response_cache import ResponseCache
+from ai.chat import stream_chat_with_ai
 
 
 @pytest.fixture
@@ -93,6 +119,24 @@ def temp_data_dir():
         yield temp_dir
 
 
+@pytest.fixture
+def make_cache(tmp_path):
+    """Build article caches on a temporary content store and search index, closed after the test."""
+    caches = []
+    store = ContentStore(data_file=str(tmp_path / 'contents.bin'), index_file=str(tmp_path / 'contents.json'))
+
+    def factory():
+        cache = ArticleCache()
+        caches.append(cache)
+        return cache
+
+    with patch('cache.SearchIndex', lambda: SearchIndex(index_file=None)), \
+         patch('cache.content_store', store), patch('models.article.content_store', store):
+        yield factory
+    for cache in caches:
+        cache.close()
+
+
 class TestNormalizeTag:
     """Test cases for tag normalization functions."""
 
@@ -159,7 +203,7 @@ class TestArticle:
         assert article.title == "Test Title"
         assert article.url == "https://example.com"
         assert article.rating == 4
-        assert article.tags == ["test", "sample"]
+        assert article.tags == ("test", "sample")
 
     def test_article_to_dict(self):
         """Test Article to_dict method."""
@@ -173,7 +217,8 @@ class TestArticle:
         assert article_dict['title'] == "Test Title"
         assert article_dict['url'] == "https://example.com"
         assert article_dict['content'] == "Test content"
-        assert 'id' not in article_dict  # id is not part of the Article object
+        assert 'id' not in article_dict  # Unset ids are left out
+        assert article_dict['tags'] == []
 
     def test_article_from_dict(self):
         """Test Article from_dict method."""
@@ -195,8 +240,39 @@ class TestArticle:
         article = Article.from_dict(data)
         assert article.title == "Test Title"
         assert article.rating == 4
-        assert article.tags == ["test", "sample"]
-        assert hasattr(article, 'id') == False  # Article doesn't have id attribute
+        assert article.tags == ("test", "sample")
+        assert article.id == 1
+        assert article.to_dict() == data
+
+    def test_article_slots_and_interning(self):
+        """Test that articles have no __dict__ and share their tag and source strings."""
+        first = Article.from_dict({"title": "A", "url": "a", "tags": ["tech"], "source": "Test " + "Source"})
+        second = Article.from_dict({"title": "B", "url": "b", "tags": ["te" + "ch"], "source": "Test Source"})
+
+        assert not hasattr(first, '__dict__')
+        assert first.tags[0] is second.tags[0]
+        assert first.source is second.source
+
+    def test_article_dict_style_access(self):
+        """Test get/[]/in, extra fields and frozen articles."""
+        article = Article.from_dict({"id": 3, "title": "A", "url": "a", "custom": 1})
+
+        assert article["id"] == 3
+        assert article.get("date", "1900-01-01") == "1900-01-01"
+        assert "date" not in article
+        assert article["custom"] == 1
+        with pytest.raises(KeyError):
+            article["missing"]
+
+        article.update({"rating": 2, "other": True}, {"time_spent": 30})
+        assert article.to_dict()["other"] is True
+        assert article.time_spent == 30
+
+        frozen = article.copy().freeze()
+        with pytest.raises(TypeError):
+            frozen.rating = 5
+        article.rating = 5
+        assert frozen.rating == 2
 
 
 class TestArticleManager:
@@ -292,6 +368,1379 @@ class TestArticleManager:
         assert result[1]["id"] == 2
 
 
+class TestArticleLog:
+    """Test cases for the append-only article log storage."""
+
+    def _make_log(self, temp_data_dir, threshold=100):
+        return ArticleLog(
+            snapshot_file=os.path.join(temp_data_dir, 'articles_seen.json'),
+            log_file=os.path.join(temp_data_dir, 'articles_seen.log'),
+            compaction_threshold=threshold
+        )
+
+    def test_save_appends_only_changed_fields(self, temp_data_dir):
+        """Test that a one-field change appends a single small record."""
+        log = self._make_log(temp_data_dir)
+        articles = log.load()
+        articles[1]["rating"] = 3
+
+        assert log.save(articles) == 1
+        with open(log.log_file, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        assert records == [{"op": "set", "id": 1, "fields": {"rating": 3}}]
+
+        # The snapshot itself is untouched
+        with open(log.snapshot_file, encoding='utf-8') as f:
+            assert json.load(f)[1]["rating"] is None
+
+    def test_load_replays_snapshot_and_log(self, temp_data_dir):
+        """Test that a fresh instance sees snapshot + log."""
+        log = self._make_log(temp_data_dir)
+        articles = log.load()
+        articles[0]["tags"] = ["tech"]
+        articles.append({"id": 2, "title": "Test Article 3", "url": "https://example.com/3"})
+        log.save(articles)
+
+        replayed = self._make_log(temp_data_dir).load()
+        assert len(replayed) == 3
+        assert replayed[0]["tags"] == ["tech"]
+        assert replayed[2]["title"] == "Test Article 3"
+
+    def test_save_without_changes_writes_nothing(self, temp_data_dir):
+        """Test that saving an unchanged list does not grow the log."""
+        log = self._make_log(temp_data_dir)
+        assert log.save(log.load()) == 0
+        assert not os.path.exists(log.log_file)
+
+    def test_compaction_merges_log_into_snapshot(self, temp_data_dir):
+        """Test that compaction rewrites the snapshot and empties the log."""
+        log = self._make_log(temp_data_dir)
+        articles = log.load()
+        articles[1]["comments"] = "Updated"
+        log.save(articles)
+
+        assert log.compact() is True
+        assert not os.path.exists(log.log_file)
+        with open(log.snapshot_file, encoding='utf-8') as f:
+            assert json.load(f)[1]["comments"] == "Updated"
+        assert self._make_log(temp_data_dir).load()[1]["comments"] == "Updated"
+
+    def test_corrupted_trailing_record_is_skipped(self, temp_data_dir):
+        """Test that a torn last line does not break replay."""
+        log = self._make_log(temp_data_dir)
+        with open(log.log_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"op": "set", "id": 0, "fields": {"rating": 2}}) + "\n")
+            f.write('{"op": "set", "id": 1, "fie')
+
+        articles = log.load()
+        assert articles[0]["rating"] == 2
+        assert articles[1]["rating"] is None
+
+
+class TestArticleDatabase:
+    """Test cases for the SQLite article storage."""
+
+    @pytest.fixture
+    def database(self, temp_data_dir):
+        database = ArticleDatabase(
+            db_file=os.path.join(temp_data_dir, 'articles.db'),
+            json_file=os.path.join(temp_data_dir, 'articles_seen.json')
+        )
+        yield database
+        database.close()
+
+    def test_migration_from_json(self, database, temp_data_dir):
+        """Test that the JSON file is imported on first use."""
+        with open(os.path.join(temp_data_dir, 'articles_seen.json'), encoding='utf-8') as f:
+            expected = json.load(f)
+
+        assert database.load_articles() == expected
+
+    def test_migration_runs_once(self, database, temp_data_dir):
+        """Test that a migrated database does not re-import the JSON file."""
+        database.load_articles()
+        database.update_fields(0, {"rating": 1})
+
+        reopened = ArticleDatabase(db_file=database.db_file, json_file=database.json_file)
+        assert reopened.get_article(0)["rating"] == 1
+        reopened.close()
+
+    def test_indexed_queries(self, database):
+        """Test tag, rating and pretreatment queries."""
+        assert [a["id"] for a in database.filter_by_tags(["ai", "politics"])] == [0, 1]
+        assert [a["id"] for a in database.filter_by_tags(["politics"])] == [1]
+        assert [a["id"] for a in database.filter_by_rating(4)] == [0]
+        assert database.get_unpretreat_articles() == [
+            {"id": 1, "title": "Test Article 2", "url": "https://example.com/2"}
+        ]
+        assert database.get_all_tags() == ["ai", "politics", "tech"]
+
+    def test_update_fields_single_article(self, database):
+        """Test single-row updates, including tags and unknown ids."""
+        assert database.update_fields(1, {"rating": 3, "tags": ["europe", "politics"]}) is True
+        article = database.get_article(1)
+        assert article["rating"] == 3
+        assert article["tags"] == ["europe", "politics"]
+        assert database.update_fields(999, {"rating": 3}) is False
+
+    def test_increment_field(self, database):
+        """Test atomic increments of integer columns."""
+        assert database.increment_field(0, "time_spent", 1) is True
+        assert database.get_article(0)["time_spent"] == 301
+        assert database.increment_field(999, "time_spent", 1) is False
+
+    def test_insert_articles_skips_duplicates(self, database):
+        """Test that new articles get the next id and duplicates are ignored."""
+        inserted = database.insert_articles([
+            {"title": "Test Article 1", "url": "https://example.com/other"},
+            {"title": "New Article", "url": "https://example.com/new", "tags": ["ai"]}
+        ])
+        assert [article["id"] for article in inserted] == [2]
+        assert database.get_article(2)["title"] == "New Article"
+
+    def test_save_and_load_large_collection(self, database):
+        """Test that saves and tag lookups work past SQLite's bound variable limit."""
+        articles = [{"id": i, "title": f"Article {i}", "url": f"https://example.com/{i}",
+                     "tags": ["even" if i % 2 == 0 else "odd", "all"]} for i in range(2500)]
+        database.save_articles(articles)
+        database.save_articles(articles[:2000])
+
+        loaded = database.load_articles()
+        assert len(loaded) == 2000
+        assert loaded[1999]["tags"] == ["odd", "all"]
+        assert len(database.filter_by_tags(["even"])) == 1000
+
+
+class TestArticlePatch:
+    """Test cases for per-field article patches."""
+
+    def test_patch_article_json_engine(self, temp_data_dir):
+        """Test set and increment patches on the JSON engine."""
+        articles_file = os.path.join(temp_data_dir, 'articles_seen.json')
+        with patch('models.article_storage.JSON_FILE', articles_file):
+            assert ArticleStorage.patch_article(1, {"rating": 2}, {"time_spent": 1}) is True
+            assert ArticleStorage.patch_article(999, {"rating": 2}) is False
+
+        with open(articles_file, encoding='utf-8') as f:
+            saved = json.load(f)
+        assert saved[1]["rating"] == 2
+        assert saved[1]["time_spent"] == 1
+
+    @patch('models.article_storage.STORAGE_ENGINE', 'log')
+    def test_patch_article_notifies_listeners(self):
+        """Test that successful patches are forwarded to listeners."""
+        listener = Mock()
+        with patch.object(ArticleStorage, '_patch_listeners', [listener]), \
+                patch('models.article_storage.article_log') as mock_log:
+            mock_log.patch_many.side_effect = [[True], [False]]
+            assert ArticleManager.patch_article(3, {"comments": "ok"}) is True
+            assert ArticleManager.patch_article(4, {"comments": "ok"}) is False
+
+        listener.assert_called_once_with(3, {"comments": "ok"}, {})
+
+    def test_cache_apply_patch_updates_entry(self, make_cache):
+        """Test that the cache updates one entry without reloading."""
+        cache = make_cache()
+        cache._cache = [Article.from_dict({"id": 0, "time_spent": 5}).freeze(),
+                        Article.from_dict({"id": 7, "rating": None}).freeze()]
+        cache._rebuild_indexes()
+        handed_out = cache._cache.copy()
+
+        assert cache.apply_patch(7, {"rating": 4}) is True
+        assert cache.apply_patch(0, increments={"time_spent": 1}) is True
+        assert cache.apply_patch(42, {"rating": 1}) is False
+
+        assert cache._cache[1]["rating"] == 4
+        assert cache._cache[0]["time_spent"] == 6
+        assert handed_out[1]["rating"] is None  # Previously returned lists are untouched
+
+    def test_closed_cache_stops_following_writes(self, make_cache):
+        """Test that close() unregisters the storage listeners of a cache."""
+        cache = make_cache()
+        assert cache.apply_patch in ArticleStorage._patch_listeners
+        assert cache.apply_insert in ArticleStorage._insert_listeners
+        cache.close()
+        assert cache.apply_patch not in ArticleStorage._patch_listeners
+        assert cache.apply_insert not in ArticleStorage._insert_listeners
+
+
+class TestTagIndex:
+    """Test cases for the tag inverted index."""
+
+    @pytest.fixture
+    def index(self):
+        index = TagIndex()
+        index.build([
+            {"id": 0, "tags": ["tech", "ai"]},
+            {"id": 1, "tags": ["politics"]},
+            {"id": 2, "tags": ["tech", "politics"]}
+        ])
+        return index
+
+    def test_any_and_all_queries(self, index):
+        """Test OR and AND tag queries."""
+        assert index.get_article_ids(["ai", "politics"]) == {0, 1, 2}
+        assert index.get_article_ids(["tech", "politics"], match="all") == {2}
+        assert index.get_article_ids(["unknown"]) == set()
+        assert index.get_article_ids([]) == set()
+
+    def test_counts(self, index):
+        """Test per-tag counts and tag listing."""
+        assert index.get_counts() == {"tech": 2, "ai": 1, "politics": 2}
+        assert index.get_tags() == ["ai", "politics", "tech"]
+
+    def test_incremental_update(self, index):
+        """Test that replacing tags only moves the article between postings."""
+        index.set_article_tags(0, ["politics"])
+        assert index.get_tags() == ["politics", "tech"]
+        assert index.get_count("politics") == 3
+
+        index.remove_article(2)
+        assert index.get_article_ids(["tech"]) == set()
+
+    def test_cache_keeps_index_in_sync(self, make_cache):
+        """Test that cache patches and inserts update the tag index."""
+        cache = make_cache()
+        cache._cache = [Article.from_dict({"id": 0, "tags": ["tech"]}).freeze(),
+                        Article.from_dict({"id": 1, "tags": ["politics"]}).freeze()]
+        cache._data_version = ArticleStorage.get_data_version()
+        cache._rebuild_indexes()
+
+        cache.apply_patch(1, {"tags": ["tech", "europe"]})
+        cache.apply_insert([{"id": 2, "tags": ["europe"]}])
+
+        assert cache.tag_index.get_article_ids(["tech"]) == {0, 1}
+        assert cache.tag_index.get_article_ids(["europe"]) == {1, 2}
+        assert cache.tag_index.get_article_ids(["politics"]) == set()
+
+
+class TestTitleIndex:
+    """Test cases for the trigram title index."""
+
+    TITLES = [
+        "Intelligence artificielle et régulation européenne",
+        "Les marchés financiers en hausse",
+        "Nouvelle politique climatique",
+        "Artificial intelligence startups raise funds",
+        ""
+    ]
+
+    @pytest.fixture
+    def articles(self):
+        return [{"id": i, "title": title} for i, title in enumerate(self.TITLES)]
+
+    @pytest.fixture
+    def index(self, articles):
+        index = TitleIndex()
+        index.build(articles)
+        return index
+
+    def test_bounded_levenshtein(self):
+        """Test the early-exit edit distance."""
+        assert bounded_levenshtein("kitten", "sitting", 5) == 3
+        assert bounded_levenshtein("kitten", "sitting", 1) == 2
+        assert bounded_levenshtein("abc", "abcdefgh", 2) == 3
+        assert bounded_levenshtein("same", "same", 0) == 0
+
+    @pytest.mark.parametrize("term", [
+        "intel", "artificial", "artficielle", "marchés", "marches", "politque climatique",
+        "en", "e", "européene", "intelligence startups", "xyz", "hausse marchés"
+    ])
+    def test_matches_linear_search(self, index, articles, term, make_cache):
+        """Test that the index returns exactly what the per-article check returns."""
+        cache = make_cache()
+        expected = {article["id"] for article in articles if cache._matches_search(article["title"], term)}
+        assert index.search(term) == expected
+
+    def test_incremental_update(self, index):
+        """Test that title changes move the article between words."""
+        index.set_article_title(2, "Budget de la défense")
+        assert index.search("climatique") == set()
+        assert index.search("défense") == {2}
+
+        index.remove_article(1)
+        assert index.search("marchés") == set()
+
+
+class TestSortIndex:
+    """Test cases for the presorted title orders."""
+
+    @staticmethod
+    def make_articles(count):
+        import random
+        rng = random.Random(7)
+        return [{
+            "id": i,
+            "date": rng.choice([None, "2025-01-01", "2025-02-01", "2025-03-01"]),
+            "rating": rng.choice([None, 1, 3, 5]),
+            "time_spent": rng.choice([0, 30, 120])
+        } for i in range(count)]
+
+    @staticmethod
+    def expected(articles, key, article_ids=None):
+        selected = [a for a in articles if article_ids is None or a["id"] in article_ids]
+        return [a["id"] for a in sorted(selected, key=lambda a: (key(a), a["id"]), reverse=True)]
+
+    @pytest.mark.parametrize("sort_by", ["date", "rating", "time_spent"])
+    def test_pages_match_full_sort(self, sort_by):
+        """Test that unfiltered and filtered pages match sorting the articles."""
+        from sort_index import SORT_KEYS
+        articles = self.make_articles(60)
+        index = SortIndex()
+        index.build(articles)
+        ordered = self.expected(articles, SORT_KEYS[sort_by])
+        assert index.get_page(sort_by, 0, 10) == ordered[:10]
+        assert index.get_page(sort_by, 55, 65) == ordered[55:]
+        assert index.get_page(sort_by, 70, 80) == []
+
+        subset = {i for i in range(60) if i % 3 == 0}
+        filtered = self.expected(articles, SORT_KEYS[sort_by], subset)
+        assert index.get_page(sort_by, 5, 10, subset) == filtered[5:10]
+        assert index.get_page(sort_by, 30, 40, subset) == []
+
+    def test_incremental_update(self):
+        """Test that a changed article moves without rebuilding the orders."""
+        articles = self.make_articles(20)
+        index = SortIndex()
+        index.build(articles)
+
+        index.set_article({"id": 3, "date": "2030-01-01", "rating": 5, "time_spent": 10000})
+        index.set_article({"id": 20, "date": "2031-01-01", "rating": None, "time_spent": 0})
+        assert index.get_page("date", 0, 2) == [20, 3]
+        assert index.get_page("time_spent", 0, 1) == [3]
+        assert index.get_page("rating", 0, 1) == [3]
+        # Unrated articles come after the rated ones, newest first
+        rated = sum(1 for article in articles if article["rating"] is not None or article["id"] == 3)
+        assert index.get_page("rating", rated, rated + 1) == [20]
+
+        index.remove_article(20)
+        assert 20 not in index.get_page("date", 0, 100)
+        assert len(index.get_page("date", 0, 100)) == 20
+
+
+    def test_page_after_cursor(self):
+        """Test that resuming after a cursor matches the full sort, filtered or not."""
+        from sort_index import SORT_KEYS
+        articles = self.make_articles(40)
+        index = SortIndex()
+        index.build(articles)
+        ordered = self.expected(articles, SORT_KEYS["rating"])
+
+        last = ordered[9]
+        cursor = (index.get_key("rating", last), last)
+        assert index.get_page_after("rating", cursor, 10) == ordered[10:20]
+        assert index.get_page_after("rating", (index.get_key("rating", ordered[-1]), ordered[-1]), 10) == []
+
+        subset = set(ordered[::2])
+        assert index.get_page_after("rating", cursor, 5, subset) == [i for i in ordered[10:] if i in subset][:5]
+
+        with pytest.raises(ValueError):
+            index.get_page_after("rating", ("2025-01-01", 3), 10)
+
+    def test_cursor_round_trip(self):
+        """Test that cursors are opaque strings that decode back to their key."""
+        cursor = encode_cursor("rating", (True, 4, "2025-01-01"), 12)
+        assert isinstance(cursor, str) and "=" not in cursor
+        assert decode_cursor(cursor, "rating") == ((True, 4, "2025-01-01"), 12)
+
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, "date")
+        with pytest.raises(ValueError):
+            decode_cursor("not a cursor", "rating")
+
+    def test_cache_cursor_survives_inserts(self, make_cache):
+        """Test that cursor pages neither repeat nor skip articles when new ones arrive."""
+        cache = make_cache()
+        cache._cache = [Article.from_dict({"id": i, "title": f"Article {i}", "date": f"2025-01-0{i + 1}"}).freeze()
+                        for i in range(5)]
+        cache._data_version = ArticleStorage.get_data_version()
+        cache._rebuild_indexes()
+
+        first = cache.get_paginated_titles(1, 2, 'date')
+        assert [title["id"] for title in first["titles"]] == [4, 3]
+        cache.apply_insert([{"id": 5, "title": "Article 5", "date": "2025-02-01"}])
+
+        cursor = first["pagination"]["next_cursor"]
+        second = cache.get_paginated_titles(1, 2, 'date', cursor=cursor)
+        assert [title["id"] for title in second["titles"]] == [2, 1]
+        third = cache.get_paginated_titles(1, 2, 'date', cursor=second["pagination"]["next_cursor"])
+        assert [title["id"] for title in third["titles"]] == [0]
+        assert third["pagination"]["next_cursor"] is None
+
+        # L'ordre d'insertion partage ses curseurs entre /api/titles et /api/articles
+        page = cache.get_paginated_articles(1, 2)
+        page = cache.get_paginated_articles(1, 2, page["pagination"]["next_cursor"])
+        assert [article["id"] for article in page["articles"]] == [2, 3]
+        assert page["pagination"]["start"] == 3
+        with pytest.raises(ValueError):
+            cache.get_paginated_titles(1, 2, 'rating', cursor=cursor)
+
+class TestSearchIndex:
+    """Test cases for the BM25 full-text index."""
+
+    @pytest.fixture
+    def articles(self):
+        return [
+            {"id": 0, "title": "Élections européennes", "content": "Le scrutin européen approche.", "tags": ["politique"]},
+            {"id": 1, "title": "OpenAI raises funds", "content": "The AI startup raised funds for AI research.", "tags": ["ia"]},
+            {"id": 2, "title": "Budget", "content": "Le gouvernement présente le budget.", "comments": "Lire les élections après", "tags": []}
+        ]
+
+    def test_tokenize_folds_accents(self):
+        """Test lowercasing, accent folding and stop words."""
+        assert tokenize("Élections à Bruxelles, l'œuvre de la Commission") == [
+            "elections", "bruxelles", "oeuvre", "commission"
+        ]
+
+    def test_search_ranks_by_bm25(self, tmp_path, articles):
+        """Test that matches come from every indexed field and are ranked."""
+        index = SearchIndex(str(tmp_path / "index.json"))
+        index.sync(articles)
+
+        scores = index.search("elections")
+        assert set(scores) == {0, 2}
+        assert scores[0] > scores[2]  # Title + content beats a single comment mention
+        assert set(index.search("ai funds")) == {1}
+        assert index.search("inconnu") == {}
+
+    def test_persisted_index_is_reused(self, tmp_path, articles):
+        """Test that a restart only re-tokenizes modified articles."""
+        index_file = str(tmp_path / "index.json")
+        SearchIndex(index_file).sync(articles)
+
+        articles[2] = dict(articles[2], content="Nouveau budget")
+        restarted = SearchIndex(index_file)
+        assert restarted.sync(articles) == 1
+        assert set(restarted.search("gouvernement")) == set()
+        assert set(restarted.search("européen")) == {0}
+
+    def test_incremental_update(self, tmp_path, articles):
+        """Test indexing and removing single articles."""
+        index = SearchIndex(str(tmp_path / "index.json"))
+        index.sync(articles)
+
+        index.set_article({"id": 3, "title": "Élections municipales"})
+        assert set(index.search("élections")) == {0, 2, 3}
+        index.remove_article(0)
+        assert set(index.search("élections")) == {2, 3}
+        assert index.get_stats()["documents"] == 3
+
+
+class TestScraperFetching:
+    """Test cases for concurrent article fetching."""
+
+    def test_rate_limiter_spaces_same_host(self):
+        """Test that only requests to the same host are delayed."""
+        limiter = HostRateLimiter(min_interval=0.05)
+        assert limiter.wait("https://techcrunch.com/a") == 0
+        assert limiter.wait("https://www.franceinfo.fr/a") == 0
+        assert limiter.wait("https://techcrunch.com/b") > 0
+
+    def test_fetch_concurrently_keeps_order(self):
+        """Test that downloads overlap and results keep the input order."""
+        def fetch(delay):
+            time.sleep(delay)
+            return delay
+
+        start = time.time()
+        assert fetch_concurrently(fetch, [0.2, 0.1, 0.2, 0.1], max_workers=4) == [0.2, 0.1, 0.2, 0.1]
+        assert time.time() - start < 0.5
+
+    @staticmethod
+    def _seen(articles):
+        index = SeenIndex(index_file=None)
+        index.build(articles, (0, ()))
+        return index
+
+    @patch('scraper.techcrunch_scraper.ArticleManager.get_seen_index')
+    def test_techcrunch_skips_known_articles(self, mock_seen):
+        """Test that only unseen articles are fetched."""
+        mock_seen.return_value = self._seen([{"title": "Old", "url": "https://techcrunch.com/old"}])
+        scraper = TechCrunchScraper()
+        scraper.get_titles_and_links = Mock(return_value=(
+            ["Old", "New 1", "New 2"],
+            ["https://techcrunch.com/old", "https://techcrunch.com/1", "https://techcrunch.com/2"]
+        ))
+        scraper.get_article_content = Mock(side_effect=lambda url: f"Content of {url}")
+
+        articles = scraper.scrape_new_articles()
+        assert [article.title for article in articles] == ["New 1", "New 2"]
+        assert articles[1].content == "Content of https://techcrunch.com/2"
+        assert scraper.get_article_content.call_count == 2
+
+    @patch('scraper.france_info_scraper.ArticleManager.get_seen_index')
+    def test_france_info_drops_duplicate_titles(self, mock_seen):
+        """Test that pages with a known or repeated title are dropped."""
+        mock_seen.return_value = self._seen([{"title": "Known", "url": "https://www.franceinfo.fr/old"}])
+        scraper = FranceInfoScraper()
+        scraper.get_article_links = Mock(return_value=[
+            "https://www.franceinfo.fr/1", "https://www.franceinfo.fr/2", "https://www.franceinfo.fr/3"
+        ])
+        pages = {
+            "https://www.franceinfo.fr/1": ("Known", "Body"),
+            "https://www.franceinfo.fr/2": ("Fresh", "Body"),
+            "https://www.franceinfo.fr/3": ("Fresh", "Body")
+        }
+        scraper.get_article_content = Mock(side_effect=pages.get)
+
+        articles = scraper.scrape_new_articles()
+        assert [(article.title, article.url) for article in articles] == [("Fresh", "https://www.franceinfo.fr/2")]
+
+    @staticmethod
+    def _fixture(name):
+        with open(os.path.join(os.path.dirname(__file__), 'fixtures', name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_strained_parsing_of_saved_pages(self):
+        """Test that the targeted parsing extracts the listings and bodies of the saved pages."""
+        listing = TechCrunchScraper()._parse_listing(self._fixture('techcrunch_listing.html'))
+        assert len(listing["titles"]) == len(listing["links"]) == 20
+        assert all(link.startswith("https://techcrunch.com/2025/") for link in listing["links"])
+
+        content = TechCrunchScraper()._parse_article(self._fixture('techcrunch_article.html'))
+        assert len(content.splitlines()) == 23
+        assert "Subscribe" not in content and "Sign up" not in content
+
+        links = FranceInfoScraper()._parse_listing(self._fixture('france_info_listing.html'))
+        assert len(links) == 45
+        assert all(link.startswith("https://www.franceinfo.fr/monde/europe/") for link in links)
+
+        title, content = FranceInfoScraper()._parse_article(self._fixture('france_info_article.html'))
+        assert title and title in self._fixture('france_info_article.html')
+        assert "Lire aussi" not in content and len(content) > 1000
+
+    def test_parsing_falls_back_to_all_paragraphs(self):
+        """Test that pages without the expected container still yield their paragraphs."""
+        html = "<html><body><div><p>Un paragraphe assez long pour être retenu.</p><p>Court</p></div></body></html>"
+        assert TechCrunchScraper()._parse_article(html) == "Un paragraphe assez long pour être retenu."
+        assert FranceInfoScraper()._parse_article("<h1>Titre</h1>" + html) == (
+            "Titre", "Un paragraphe assez long pour être retenu.")
+
+    def test_failing_source_does_not_block_the_other(self):
+        """Test that both sources are scraped and errors stay isolated."""
+        service = ScrapingService()
+        service.scrapers = {"techcrunch": Mock(), "france_info": Mock()}
+        service.scrapers["techcrunch"].scrape_new_articles.side_effect = Exception("Network error")
+        service.scrapers["france_info"].scrape_new_articles.return_value = ["article"]
+
+        assert service.scrape_all_sources() == {"techcrunch": [], "france_info": ["article"]}
+
+    @patch.dict(SCRAPERS)
+    def test_sources_are_built_from_the_registry(self):
+        """Test that sources use their registered scraper and disabled or unknown ones are skipped."""
+        @register_scraper("fake")
+        class FakeScraper:
+            def __init__(self, source):
+                self.source = source
+
+        sources = {
+            "one": {"scraper": "fake", "interval": 30},
+            "two": {"scraper": "fake", "enabled": False},
+            "three": {"scraper": "missing"},
+            "techcrunch": dict(SCRAPER_SOURCES["techcrunch"], listing_urls=["https://example.com/"])
+        }
+        scrapers = create_scrapers(sources)
+        assert set(scrapers) == {"one", "techcrunch"}
+        assert isinstance(scrapers["one"], FakeScraper) and scrapers["one"].source["interval"] == 30
+        assert scrapers["techcrunch"].source["listing_urls"] == ["https://example.com/"]
+
+    @patch('scraper.scraping_service.ArticleManager.add_new_articles', return_value=1)
+    def test_sources_run_on_their_own_interval(self, mock_add):
+        """Test that a run stores the articles and schedules the next one after the source interval."""
+        service = ScrapingService(sources={})
+        service.sources = {"fast": {"interval": 60, "min_interval": 60}, "slow": {"interval": 3600}}
+        service.scrapers = {"fast": Mock(), "slow": Mock()}
+        service.scrapers["fast"].scrape_new_articles.return_value = ["article"]
+        service.scrapers["slow"].scrape_new_articles.return_value = []
+        service.next_runs = {"fast": 0.0, "slow": 0.0}
+        assert service.get_due_sources() == ["fast", "slow"]
+
+        assert service.run_source("fast") == 1
+        assert service.run_source("slow") == 0
+        mock_add.assert_called_once_with(["article"])
+
+        now = time.monotonic()
+        assert service.get_due_sources(now) == []
+        assert service.get_due_sources(now + 61) == ["fast"]
+        # The empty poll made the slow source back off
+        assert service.get_due_sources(now + 3601) == ["fast"]
+        assert service.get_due_sources(now + 5401) == ["fast", "slow"]
+
+    @patch('scraper.scraping_service.ArticleManager.add_new_articles')
+    def test_failed_run_is_retried_sooner(self, mock_add):
+        """Test that a source whose scraper raises is scheduled again after the retry delay."""
+        service = ScrapingService(sources={})
+        service.sources = {"broken": {"interval": 1800}}
+        service.scrapers = {"broken": Mock()}
+        service.scrapers["broken"].scrape_new_articles.side_effect = Exception("Network error")
+        service.next_runs = {"broken": 0.0}
+
+        assert service.run_source("broken") == 0
+        mock_add.assert_not_called()
+        now = time.monotonic()
+        assert service.get_due_sources(now + RETRY_DELAY - 5) == []
+        assert service.get_due_sources(now + RETRY_DELAY + 1) == ["broken"]
+
+    def test_failed_run_keeps_hit_rate_and_interval(self):
+        """Test that a scraper that raises is not counted as an empty poll."""
+        service = ScrapingService(sources={})
+        service.sources = {"broken": {"interval": 1800}}
+        service.scrapers = {"broken": Mock()}
+        service.scrapers["broken"].scrape_new_articles.side_effect = Exception("Network error")
+        service.next_runs = {"broken": 0.0}
+
+        service.run_source("broken")
+        assert service.hit_rates.get("broken") is None
+        assert service.get_interval("broken") == 1800
+        assert service.get_schedule()["broken"]["next_run_in"] <= RETRY_DELAY
+
+    @staticmethod
+    def _offline_service():
+        service = ScrapingService(sources={
+            source_id: dict(SCRAPER_SOURCES[source_id], interval=1800) for source_id in ("techcrunch", "france_info")
+        })
+        for scraper in service.scrapers.values():
+            scraper.session.get = Mock(side_effect=requests.ConnectionError("Name or service not known"))
+        return service
+
+    @patch('scraper.scraping_service.ArticleManager.add_new_articles')
+    @patch('scraper.fetching.host_rate_limiter.wait', return_value=0)
+    def test_offline_source_is_retried_sooner(self, mock_wait, mock_add):
+        """Test that a real scraper whose listing fetch fails is scheduled again after the retry delay."""
+        service = self._offline_service()
+        assert isinstance(service.scrapers["techcrunch"], TechCrunchScraper)
+        assert isinstance(service.scrapers["france_info"], FranceInfoScraper)
+
+        for source_id in ("techcrunch", "france_info"):
+            before = time.monotonic()
+            assert service.run_source(source_id) == 0
+            assert before + RETRY_DELAY <= service.next_runs[source_id] <= time.monotonic() + RETRY_DELAY
+        mock_add.assert_not_called()
+
+    @patch('scraper.fetching.host_rate_limiter.wait', return_value=0)
+    def test_offline_polls_keep_hit_rate_and_interval(self, mock_wait):
+        """Test that failed listing fetches of the real scrapers are not counted as empty polls."""
+        service = self._offline_service()
+        for _ in range(5):
+            for source_id in ("techcrunch", "france_info"):
+                service.run_source(source_id)
+
+        for source_id in ("techcrunch", "france_info"):
+            assert service.hit_rates[source_id] is None
+            assert service.get_interval(source_id) == 1800
+
+    @patch('scraper.fetching.host_rate_limiter.wait', return_value=0)
+    def test_listing_errors_raise_only_when_every_listing_fails(self, mock_wait):
+        """Test that one reachable listing page is enough for the poll to succeed."""
+        source = dict(SCRAPER_SOURCES["france_info"],
+                      listing_urls=["https://www.franceinfo.fr/down/", "https://www.franceinfo.fr/up/"])
+        scraper = FranceInfoScraper(source)
+        html = self._fixture('france_info_listing.html')
+        response = Mock(status_code=200, headers={}, text=html, content=html.encode())
+        scraper.session.get = Mock(side_effect=[requests.ConnectionError("Connection refused"), response])
+        with patch('scraper.france_info_scraper.http_cache', HttpCache(cache_file=None)):
+            assert len(scraper.get_article_links()) == 45
+
+        scraper.session.get = Mock(side_effect=requests.ConnectionError("Connection refused"))
+        with pytest.raises(requests.ConnectionError):
+            scraper.get_article_links()
+
+    def test_interval_adapts_to_hit_rate(self):
+        """Test that busy sources are polled more often and quiet ones less, within their bounds."""
+        service = ScrapingService(sources={})
+        service.sources = {"news": {"interval": 1200, "min_interval": 600, "max_interval": 3600}}
+
+        assert service.adapt_interval("news", 6) == 800
+        assert service.adapt_interval("news", 6) == 600
+        assert service.adapt_interval("news", 6) == 600
+        # One quiet poll only lowers the smoothed rate, several make the source back off
+        assert service.adapt_interval("news", 0) == 600
+        intervals = [service.adapt_interval("news", 0) for _ in range(10)]
+        assert intervals[-1] == 3600 and intervals == sorted(intervals)
+        assert service.hit_rates["news"] < 0.5
+
+
+class TestHttpCache:
+    """Test cases for conditional GET on listing pages."""
+
+    @staticmethod
+    def make_response(status_code, text="", headers=None):
+        response = Mock()
+        response.status_code = status_code
+        response.text = text
+        response.content = text.encode("utf-8")
+        response.headers = headers or {}
+        return response
+
+    def test_not_modified_skips_parsing(self, tmp_path):
+        """Test that a 304 returns the stored result without parsing."""
+        cache = HttpCache(str(tmp_path / "http_cache.json"))
+        session = Mock()
+        session.get.side_effect = [
+            self.make_response(200, "<html>listing</html>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Sep 2025 10:00:00 GMT"}),
+            self.make_response(304)
+        ]
+        parse = Mock(return_value=["https://example.com/1"])
+
+        assert cache.get(session, "https://example.com", parse, "Example") == ["https://example.com/1"]
+        assert cache.get(session, "https://example.com", parse, "Example") == ["https://example.com/1"]
+
+        parse.assert_called_once()
+        headers = session.get.call_args_list[1].kwargs["headers"]
+        assert headers == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Sep 2025 10:00:00 GMT"}
+        assert cache.get_stats()["Example"] == {
+            "hits": 1, "misses": 1, "bytes_downloaded": 20, "bytes_saved": 20
+        }
+
+    def test_entries_persist_across_instances(self, tmp_path):
+        """Test that validators survive a restart."""
+        cache_file = str(tmp_path / "http_cache.json")
+        session = Mock()
+        session.get.return_value = self.make_response(200, "page", {"ETag": '"v1"'})
+        HttpCache(cache_file).get(session, "https://example.com", lambda html: {"titles": [html]}, "Example")
+
+        session.get.return_value = self.make_response(304)
+        result = HttpCache(cache_file).get(session, "https://example.com", Mock(), "Example")
+        assert result == {"titles": ["page"]}
+
+    def test_no_validators_always_downloads(self, tmp_path):
+        """Test that pages without ETag/Last-Modified are not revalidated."""
+        cache = HttpCache(str(tmp_path / "http_cache.json"))
+        session = Mock()
+        session.get.return_value = self.make_response(200, "page")
+
+        cache.get(session, "https://example.com", lambda html: html, "Example")
+        cache.get(session, "https://example.com", lambda html: html, "Example")
+        assert session.get.call_args_list[1].kwargs["headers"] == {}
+        assert cache.get_stats()["Example"]["misses"] == 2
+
+
+class TestPretreatmentPool:
+    """Test cases for the concurrent pretreatment pool."""
+
+    @pytest.fixture
+    def articles(self):
+        return [
+            {"id": i, "title": f"Article {i}", "content": f"Content {i}", "source": "TechCrunch",
+             "tags": [], "has_been_pretreat": i == 0}
+            for i in range(8)
+        ]
+
+    @patch('ai.pretreatment.load_models_settings', return_value={"max_in_flight": 2})
+    @patch('ai.pretreatment.SettingsManager.get_article_processing_model', return_value="test model")
+    @patch('ai.pretreatment.ArticleManager.patch_articles')
+    @patch('ai.pretreatment.ArticleManager.load_articles')
+    @patch('ai.pretreatment.process_article_content')
+    def test_run_batches_and_limits_in_flight(self, mock_process, mock_load, mock_patch,
+                                             mock_model, mock_settings, articles):
+        """Test that results are committed in batches with bounded concurrency."""
+        in_flight = {"current": 0, "max": 0}
+        lock = threading.Lock()
+
+        def process(content, model_name, source, raise_on_error=False):
+            with lock:
+                in_flight["current"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            time.sleep(0.02)
+            with lock:
+                in_flight["current"] -= 1
+            return content.upper(), ["innovation"]
+
+        mock_process.side_effect = process
+        mock_load.return_value = articles
+        mock_patch.side_effect = lambda batch: len(batch)
+
+        stats = PretreatmentPool(workers=4, batch_size=3).run()
+
+        assert in_flight["max"] <= 2
+        assert [len(call.args[0]) for call in mock_patch.call_args_list] == [3, 3, 1]
+        patched = {article_id: fields for call in mock_patch.call_args_list for article_id, fields, _ in call.args[0]}
+        assert sorted(patched) == [1, 2, 3, 4, 5, 6, 7]
+        assert patched[1]["content"] == "CONTENT 1"
+        assert patched[1]["has_been_pretreat"] is True
+        assert sorted(patched[1]["tags"]) == ["ia", "innovation"]
+        assert stats["completed"] == 7
+        assert stats["batches"] == 3
+        assert stats["running"] is False
+        assert stats["latency_p95_seconds"] >= stats["latency_p50_seconds"] > 0
+
+    @patch('ai.pretreatment.load_models_settings', return_value={})
+    @patch('ai.pretreatment.SettingsManager.get_article_processing_model', return_value="test model")
+    @patch('ai.pretreatment.ArticleManager.patch_articles')
+    @patch('ai.pretreatment.ArticleManager.load_articles')
+    @patch('ai.pretreatment.process_article_content')
+    def test_failed_articles_are_not_committed(self, mock_process, mock_load, mock_patch,
+                                               mock_model, mock_settings, articles):
+        """Test that an article whose request fails stays unpretreated."""
+        def process(content, model_name, source, raise_on_error=False):
+            if content == "Content 2":
+                raise Exception("Timeout")
+            return content, []
+
+        mock_process.side_effect = process
+        mock_load.return_value = articles[:3]
+        mock_patch.side_effect = lambda batch: len(batch)
+
+        stats = PretreatmentPool(workers=2, batch_size=10).run()
+
+        mock_patch.assert_called_once()
+        assert [article_id for article_id, _, _ in mock_patch.call_args[0][0]] == [1]
+        assert stats["completed"] == 1
+        assert stats["failed"] == 1
+
+    @patch('ai.pretreatment.load_models_settings', return_value={})
+    @patch('ai.pretreatment.SettingsManager.get_article_processing_model', return_value="test model")
+    @patch('ai.pretreatment.ArticleManager.patch_articles')
+    @patch('ai.pretreatment.article_cache.get_article_by_id')
+    @patch('ai.pretreatment.process_article_content')
+    def test_queue_jobs_are_acknowledged_or_retried(self, mock_process, mock_get, mock_patch,
+                                                    mock_model, mock_settings, articles, tmp_path):
+        """Test that queued articles are pretreated and failures stay queued for a retry."""
+        def process(content, model_name, source, raise_on_error=False):
+            if content == "Content 2":
+                raise Exception("Timeout")
+            return content, []
+
+        mock_process.side_effect = process
+        stored = {article["id"]: Article.from_dict(article).freeze() for article in articles[:4]}
+        mock_get.side_effect = stored.get
+        mock_patch.side_effect = lambda batch: len(batch)
+        queue = JobQueue(str(tmp_path / "jobs.db"), retry_delay=0)
+        pool = PretreatmentPool(workers=2, batch_size=10, queue=queue)
+
+        # Article 0 is already pretreated and article 9 does not exist
+        assert pool.enqueue_articles(articles[:4]) == 3
+        queue.enqueue(PRETREATMENT_QUEUE, {"article_id": 9}, key="9")
+        with patch('ai.pretreatment.ArticleManager.load_articles') as mock_load:
+            assert pool.process_queue() == 4
+        mock_load.assert_not_called()
+
+        assert sorted(article_id for article_id, _, _ in mock_patch.call_args[0][0]) == [1, 3]
+        assert queue.get_stats(PRETREATMENT_QUEUE) == {"pending": 1, "running": 0, "dead": 0}
+
+        mock_process.side_effect = lambda content, model_name, source, raise_on_error=False: (content, [])
+        assert pool.process_queue() == 1
+        assert queue.get_stats(PRETREATMENT_QUEUE) == {"pending": 0, "running": 0, "dead": 0}
+        assert pool.process_queue() == 0
+
+    @patch('ai.processing.SettingsManager.get_prompt', return_value="Tags: {tags}")
+    @patch('ai.processing.load_models_settings')
+    @patch('ai.processing.requests.post')
+    @patch('ai.pretreatment.load_models_settings', return_value={})
+    @patch('ai.pretreatment.SettingsManager.get_article_processing_model', return_value="test model")
+    @patch('ai.pretreatment.ArticleManager.patch_articles')
+    @patch('ai.pretreatment.article_cache.get_article_by_id')
+    def test_queue_retries_model_error_responses(self, mock_get, mock_patch, mock_model, mock_settings,
+                                                 mock_post, mock_processing_model, mock_prompt,
+                                                 articles, tmp_path):
+        """Test that a rate-limited model fails the job instead of marking the article as pretreated."""
+        mock_processing_model.return_value = {"url": "https://api.example.com", "apikey": "key", "id": "model-1"}
+        mock_post.return_value.status_code = 429
+        mock_post.return_value.text = "Too Many Requests"
+        mock_get.side_effect = lambda article_id: Article.from_dict(articles[article_id]).freeze()
+        queue = JobQueue(str(tmp_path / "jobs.db"), retry_delay=0)
+        pool = PretreatmentPool(workers=1, batch_size=10, queue=queue)
+        pool.enqueue_articles(articles[:2])
+
+        with patch('ai.processing.response_cache', ResponseCache(str(tmp_path / "llm_cache.db"))):
+            assert pool.process_queue() == 1
+
+        mock_patch.assert_not_called()
+        assert queue.get_stats(PRETREATMENT_QUEUE) == {"pending": 1, "running": 0, "dead": 0}
+        assert pool.get_stats()["failed"] == 1
+
+    @patch('ai.pretreatment.PretreatmentPool._consume_loop')
+    @patch('ai.pretreatment.article_cache.get_articles')
+    def test_start_queues_unpretreated_articles_from_cache(self, mock_articles, mock_loop, articles, tmp_path):
+        """Test that starting the consumer queues the backlog from the cache without loading the storage."""
+        mock_articles.return_value = tuple(Article.from_dict(article).freeze() for article in articles[:4])
+        queue = JobQueue(str(tmp_path / "jobs.db"))
+        pool = PretreatmentPool(queue=queue)
+        try:
+            with patch('ai.pretreatment.ArticleManager.load_articles') as mock_load:
+                pool.start()
+            mock_load.assert_not_called()
+        finally:
+            pool.stop()
+            ArticleManager.remove_insert_listener(pool.enqueue_articles)
+
+        assert queue.get_stats(PRETREATMENT_QUEUE)["pending"] == 3
+
+
+class TestJobQueue:
+    """Test cases for the persistent job queue."""
+
+    def test_claim_ack_and_deduplication(self, tmp_path):
+        """Test that jobs are claimed oldest first, once, and removed when acknowledged."""
+        queue = JobQueue(str(tmp_path / "jobs.db"))
+        assert queue.enqueue("work", {"n": 1}, key="1")
+        assert not queue.enqueue("work", {"n": 1}, key="1")
+        assert queue.enqueue_many("work", [("2", {"n": 2}), (None, {"n": 3})]) == 2
+
+        jobs = queue.claim("work", limit=2)
+        assert [job["payload"] for job in jobs] == [{"n": 1}, {"n": 2}]
+        assert [job["payload"] for job in queue.claim("work", limit=5)] == [{"n": 3}]
+        assert queue.claim("work") == []
+
+        assert queue.ack(jobs[0]["id"])
+        assert queue.get_stats("work") == {"pending": 0, "running": 2, "dead": 0}
+        assert queue.get_stats("other") == {"pending": 0, "running": 0, "dead": 0}
+
+    def test_retries_then_dead_letter(self, tmp_path):
+        """Test that failed jobs are retried after a delay, then dead-lettered and requeued on demand."""
+        queue = JobQueue(str(tmp_path / "jobs.db"), max_attempts=2, retry_delay=0)
+        queue.enqueue("work", {"n": 1})
+
+        job = queue.claim("work")[0]
+        assert queue.fail(job["id"], "boom") == "pending"
+        job = queue.claim("work")[0]
+        assert job["attempts"] == 2
+        assert queue.fail(job["id"], "boom again") == "dead"
+        assert queue.claim("work") == []
+        assert queue.get_dead("work") == [{"id": job["id"], "payload": {"n": 1}, "attempts": 2,
+                                           "last_error": "boom again"}]
+
+        assert queue.requeue_dead("work") == 1
+        assert queue.claim("work")[0]["attempts"] == 1
+
+        delayed = JobQueue(str(tmp_path / "delayed.db"), retry_delay=60)
+        delayed.enqueue("work", {"n": 1})
+        delayed.fail(delayed.claim("work")[0]["id"], "boom")
+        assert delayed.claim("work") == []
+
+    def test_visibility_timeout(self, tmp_path):
+        """Test that a job that is not settled in time is claimed again, and persists across restarts."""
+        queue = JobQueue(str(tmp_path / "jobs.db"), max_attempts=2)
+        queue.enqueue("work", {"n": 1})
+        first = queue.claim("work", visibility_timeout=0)[0]
+
+        restarted = JobQueue(str(tmp_path / "jobs.db"), max_attempts=2)
+        second = restarted.claim("work", visibility_timeout=0)[0]
+        assert second["id"] == first["id"] and second["attempts"] == 2
+
+        # The second lease expired too: no attempt is left
+        assert restarted.claim("work") == []
+        assert restarted.get_dead("work")[0]["last_error"] == "Visibility timeout expired"
+
+
+class TestResponseCache:
+    """Test cases for the AI response cache."""
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        """Test that the least recently used responses are evicted first."""
+        cache = ResponseCache(str(tmp_path / "llm_cache.db"), max_bytes=30)
+        cache.put("a", "model", "x" * 10)
+        cache.put("b", "model", "y" * 10)
+        assert cache.get("a") == "x" * 10  # "b" becomes the least recently used
+        cache.put("c", "model", "z" * 15)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "x" * 10
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["total_bytes"] == 25
+        assert stats["evictions"] == 1
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+    def test_entries_persist(self, tmp_path):
+        """Test that cached responses survive a restart."""
+        cache_file = str(tmp_path / "llm_cache.db")
+        key = ResponseCache.make_key("model", "prompt", "content")
+        ResponseCache(cache_file).put(key, "model", "Summary\nTAGS:[ia]")
+
+        assert ResponseCache(cache_file).get(key) == "Summary\nTAGS:[ia]"
+        assert key != ResponseCache.make_key("model", "other prompt", "content")
+
+    @patch('ai.processing.SettingsManager.get_prompt', return_value="Tags: {tags}")
+    @patch('ai.processing.load_models_settings')
+    @patch('ai.processing.requests.post')
+    def test_process_article_content_uses_cache(self, mock_post, mock_model, mock_prompt, tmp_path):
+        """Test that a repeated pretreatment does not call the model again."""
+        mock_model.return_value = {"url": "https://api.example.com", "apikey": "key", "id": "model-1"}
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {
+            "choices": [{"message": {"content": "Résumé\nTAGS:[innovation, finance]"}}]
+        }
+
+        with patch('ai.processing.response_cache', ResponseCache(str(tmp_path / "llm_cache.db"))):
+            first = process_article_content("Article body", "test model", "TechCrunch")
+            second = process_article_content("Article body", "test model", "TechCrunch")
+
+        assert first == second == ("Résumé", ["innovation", "finance"])
+        mock_post.assert_called_once()
+
+
+class TestChatStreaming:
+    """Test cases for streamed chat answers."""
+
+    @patch('ai.chat.SettingsManager.get_prompt', return_value="{article_title} {article_content} {article_source} {user_question}")
+    @patch('ai.chat.load_models_settings')
+    @patch('ai.chat.article_cache.get_article_by_id')
+    @patch('ai.chat.requests.post')
+    def test_stream_parses_model_chunks(self, mock_post, mock_get, mock_model, mock_prompt):
+        """Test that streamed deltas are yielded as tokens and joined at the end."""
+        mock_get.return_value = {"id": 1, "title": "Title", "content": "Body"}
+        mock_model.return_value = {"url": "https://api.example.com", "apikey": "key", "id": "model-1"}
+        response = mock_post.return_value.__enter__.return_value
+        response.status_code = 200
+        response.iter_lines.return_value = [
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            '',
+            'data: {"choices": [{"delta": {"content": "Bon"}}]}',
+            'data: {"choices": [{"delta": {"content": "jour"}}]}',
+            'data: [DONE]'
+        ]
+
+        events = list(stream_chat_with_ai("1", "Question?", "test model"))
+
+        assert mock_post.call_args.kwargs["json"]["stream"] is True
+        assert [event["type"] for event in events] == ["start", "token", "token", "done"]
+        assert events[-1]["answer"] == "Bonjour"
+
+    @patch('ai.chat.article_cache.get_article_by_id', return_value=None)
+    def test_stream_unknown_article(self, mock_get):
+        """Test that a missing article yields a single error event."""
+        events = list(stream_chat_with_ai("42", "Question?", "test model"))
+        assert len(events) == 1
+        assert events[0]["type"] == "error"
+
+
+class TestArticleIds:
+    """Test cases for id-based lookups when ids and positions diverge."""
+
+    def test_assign_missing_ids_keeps_existing(self):
+        """Test that only missing or duplicated ids are assigned, after the largest one."""
+        articles = [{"id": 5}, {"title": "no id"}, {"id": 2}, {"id": 5}, {"id": None}]
+        assert ArticleStorage.assign_missing_ids(articles) == 3
+        assert [article["id"] for article in articles] == [5, 6, 2, 7, 8]
+
+    @patch('models.article_queries.ArticleStorage.load_articles')
+    def test_queries_lookup_by_id(self, mock_load):
+        """Test that a lookup after a deletion does not use the list position."""
+        mock_load.return_value = [{"id": 0, "title": "A"}, {"id": 2, "title": "C"}]
+        assert ArticleManager.get_article_by_id(2)["title"] == "C"
+        assert ArticleManager.get_article_by_id(1) is None
+
+    def test_cache_lookup_by_id(self, make_cache):
+        """Test that the cache resolves ids through its id index."""
+        cache = make_cache()
+        cache._cache = [Article(title="Seven", url="", article_id=7).freeze(),
+                        Article(title="Three", url="", article_id=3).freeze()]
+        cache._data_version = ArticleStorage.get_data_version()
+        cache._rebuild_indexes()
+
+        assert cache.get_article_by_id(3)["title"] == "Three"
+        assert cache.get_article_by_id(1) is None
+
+    def test_cache_generation_changes_with_data(self, make_cache):
+        """Test that patches, inserts and reloads bump the data generation."""
+        cache = make_cache()
+        cache._cache = [Article.from_dict({"id": 0, "title": "A"}).freeze()]
+        cache._data_version = ArticleStorage.get_data_version()
+        cache._rebuild_indexes()
+
+        generation = cache.get_generation()
+        assert cache.get_generation() == generation
+        cache.apply_patch(0, {"rating": 5})
+        assert cache.get_generation() == generation + 1
+        cache.apply_insert([{"id": 1, "title": "B"}])
+        assert cache.get_generation() == generation + 2
+
+    def test_concurrent_inserts_and_patches(self, make_cache):
+        """Test that listener writes from several threads keep the cache and its id index consistent."""
+        cache = make_cache()
+        cache._cache = [Article.from_dict({"id": 0, "title": "A", "time_spent": 0}).freeze()]
+        cache._data_version = ArticleStorage.get_data_version()
+        cache._rebuild_indexes()
+
+        def insert(offset):
+            for i in range(offset, offset + 50):
+                cache.apply_insert([{"id": i, "title": f"Article {i}"}])
+                cache.apply_patch(0, increments={"time_spent": 1})
+
+        threads = [threading.Thread(target=insert, args=(1 + 50 * n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(cache._cache) == 201
+        assert all(cache._cache[position]["id"] == article_id for article_id, position in cache._positions.items())
+        assert cache.get_article_by_id(0)["time_spent"] == 200
+
+
+class TestCacheFreshness:
+    """Test cases for reloading the article cache only when the stored data changes."""
+
+    @pytest.fixture
+    def cache(self, temp_data_dir):
+        articles_file = os.path.join(temp_data_dir, 'articles_seen.json')
+        store = ContentStore(data_file=os.path.join(temp_data_dir, 'contents.bin'),
+                             index_file=os.path.join(temp_data_dir, 'contents.json'))
+        with patch('models.article_storage.JSON_FILE', articles_file), \
+             patch('models.article_storage.STORAGE_ENGINE', 'json'), \
+             patch('cache.SearchIndex', lambda: SearchIndex(index_file=None)), \
+             patch('cache.content_store', store), patch('models.article.content_store', store), \
+             patch('models.article_storage.content_store', store):
+            cache = ArticleCache()
+            yield cache
+        cache.close()
+
+    def test_idle_cache_never_reloads(self, cache):
+        """Test that repeated reads without writes load the articles once."""
+        with patch('cache.ArticleManager.load_articles', wraps=ArticleManager.load_articles) as mock_load:
+            for _ in range(5):
+                assert len(cache.get_articles()) == 2
+        assert mock_load.call_count == 1
+        assert cache.is_cache_valid()
+
+    def test_save_triggers_reload(self, cache):
+        """Test that a full save bumps the generation and the next read reloads."""
+        articles = [article.to_dict() for article in cache.get_articles()]
+        articles[0]["title"] = "Renamed"
+        generation = ArticleManager.get_generation()
+        ArticleManager.save_articles(articles)
+
+        assert ArticleManager.get_generation() == generation + 1
+        assert not cache.is_cache_valid()
+        assert cache.get_articles()[0]["title"] == "Renamed"
+
+    def test_external_edit_triggers_reload(self, cache, temp_data_dir):
+        """Test that a file rewritten by another process is detected from its signature."""
+        cache.get_articles()
+        articles_file = os.path.join(temp_data_dir, 'articles_seen.json')
+        with open(articles_file, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        articles.append({"id": 2, "title": "Added by hand", "url": "https://example.com/3"})
+        with open(articles_file, 'w', encoding='utf-8') as f:
+            json.dump(articles, f)
+
+        assert len(cache.get_articles()) == 3
+
+    def test_reads_share_read_only_records(self, cache):
+        """Test that reads hand out the same immutable snapshot until a write."""
+        articles = cache.get_articles()
+        assert cache.get_articles() is articles
+        assert cache.get_article_by_id(0) is articles[0]
+        assert articles[0]["tags"] == ("tech", "ai")
+        with pytest.raises(TypeError):
+            articles[0].title = "Changed"
+        with pytest.raises(TypeError):
+            articles[0].update({"rating": 1})
+        assert isinstance(articles, tuple)
+
+        copy = articles[0].copy()
+        copy.title = "Changed"
+        assert cache.get_article_by_id(0)["title"] == "Test Article 1"
+
+        ArticleManager.patch_articles([(0, {"rating": 1}, {})])
+        assert cache.get_articles() is not articles
+        assert articles[0]["rating"] == 5
+        assert cache.get_article_by_id(0)["rating"] == 1
+
+    def test_bodies_are_read_from_content_store(self, cache):
+        """Test that cached articles keep no body in memory but still expose it."""
+        article = cache.get_article_by_id(0)
+        assert article._content is LAZY_CONTENT
+        assert article["content"] == "Content 1"
+        assert article.to_dict()["content"] == "Content 1"
+
+        ArticleManager.patch_articles([(1, {"content": "Pretreated"}, {})])
+        assert cache.get_article_by_id(1).content == "Pretreated"
+
+    def test_restart_uses_metadata_snapshot(self, cache):
+        """Test that a new cache on unchanged storage does not load the articles."""
+        cache.get_articles()
+        restarted = ArticleCache()
+        try:
+            with patch('cache.ArticleManager.load_articles') as mock_load:
+                assert [article.title for article in restarted.get_articles()] == ["Test Article 1", "Test Article 2"]
+                assert restarted.get_article_by_id(1).content == "Content 2"
+            mock_load.assert_not_called()
+        finally:
+            restarted.close()
+
+    def test_startup_id_check_skips_unchanged_storage(self, cache, temp_data_dir):
+        """Test that the id pass does not parse the articles file when the metadata snapshot matches it."""
+        with patch('models.article_storage.ArticleStorage.assign_missing_ids') as mock_assign:
+            ArticleManager.ensure_article_ids()
+            mock_assign.assert_called_once()
+            cache.get_articles()
+            mock_assign.reset_mock()
+            ArticleManager.ensure_article_ids()
+            mock_assign.assert_not_called()
+
+        # A file edited since the snapshot is checked again
+        articles_file = os.path.join(temp_data_dir, 'articles_seen.json')
+        with open(articles_file, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        articles.append({"title": "Added by hand", "url": "https://example.com/3"})
+        with open(articles_file, 'w', encoding='utf-8') as f:
+            json.dump(articles, f)
+        ArticleManager.ensure_article_ids()
+        with open(articles_file, 'r', encoding='utf-8') as f:
+            assert [article["id"] for article in json.load(f)] == [0, 1, 2]
+
+    def test_listener_write_does_not_reload(self, cache):
+        """Test that a patch applied through the listener keeps the cache valid."""
+        cache.get_articles()
+        with patch('cache.ArticleManager.load_articles') as mock_load:
+            ArticleManager.patch_articles([(0, {"rating": 2}, {})])
+            assert cache.get_article_by_id(0)["rating"] == 2
+        mock_load.assert_not_called()
+
+
+class TestContentStore:
+    """Test cases for the offset-indexed article body store."""
+
+    def _make_store(self, temp_data_dir, cache_size=2):
+        return ContentStore(data_file=os.path.join(temp_data_dir, 'contents.bin'),
+                            index_file=os.path.join(temp_data_dir, 'contents.json'),
+                            cache_size=cache_size)
+
+    def test_put_and_get(self, temp_data_dir):
+        """Test that bodies are stored once and read back."""
+        store = self._make_store(temp_data_dir)
+        assert store.put_many([(1, "Premier"), (2, "Deuxième é")]) == 2
+        assert store.put(1, "Premier") is False  # Unchanged bodies are not appended again
+
+        assert store.get(2) == "Deuxième é"
+        assert store.get(1) == "Premier"
+        assert store.get(3) is None
+        assert store.get_stats()["file_bytes"] == len("PremierDeuxième é".encode("utf-8"))
+
+    def test_lru_keeps_recent_bodies(self, temp_data_dir):
+        """Test that only the most recently read bodies stay in memory."""
+        store = self._make_store(temp_data_dir, cache_size=2)
+        store.put_many([(1, "a"), (2, "b"), (3, "c")])
+        store.get(1), store.get(2), store.get(3), store.get(3)
+
+        stats = store.get_stats()
+        assert stats["cached_bodies"] == 2
+        assert stats["hits"] == 1
+        assert stats["misses"] == 3
+
+    def test_snapshot_requires_same_signature(self, temp_data_dir):
+        """Test that the metadata snapshot is only returned for the signature it was saved at."""
+        store = self._make_store(temp_data_dir)
+        store.put(1, "Body")
+        store.save_snapshot(((1, 10, 100),), [{"id": 1, "title": "A"}])
+
+        reopened = self._make_store(temp_data_dir)
+        assert reopened.load_snapshot(((1, 10, 100),)) == [{"id": 1, "title": "A"}]
+        assert reopened.load_snapshot(((1, 11, 100),)) is None
+        assert reopened.get(1) == "Body"
+
+    def test_compaction_drops_replaced_bodies(self, temp_data_dir):
+        """Test that the data file is rewritten once replaced bodies dominate."""
+        store = self._make_store(temp_data_dir)
+        big = "x" * (1024 * 1024)
+        store.put(1, big)
+        store.put(2, "short")
+        store.put(1, "y")
+        store.put(1, "z" * 10)
+
+        assert store.get_stats()["file_bytes"] == len("short") + 10
+        assert store.get(1) == "z" * 10
+        assert store.get(2) == "short"
+
+    def test_appends_from_two_processes(self, temp_data_dir):
+        """Test that stores sharing the files append at the real end of the data file."""
+        first = self._make_store(temp_data_dir)
+        second = self._make_store(temp_data_dir)
+        first.get_stats(), second.get_stats()
+
+        first.put(1, "From the first process")
+        second.put(2, "From the second process")
+        first.put(3, "x" * 10)
+
+        assert second.get(2) == "From the second process"
+        assert first.get(1) == "From the first process"
+        assert first.get(3) == "x" * 10
+        # The other process's bodies are not counted as replaced ones
+        first.put(1, "y" * (2 * 1024 * 1024))
+        first.put(1, "z")
+        assert second.get(2) == "From the second process"
+
+    def test_compaction_by_another_process(self, temp_data_dir):
+        """Test that a store reloads the entries after another process compacted the data file."""
+        first = self._make_store(temp_data_dir)
+        first.put(1, "x" * (2 * 1024 * 1024))
+        first.put(2, "short")
+        first.save_snapshot(((1, 10, 100),), [{"id": 1}, {"id": 2}])
+
+        second = self._make_store(temp_data_dir)
+        second.get_stats()
+        first.put(1, "y")
+
+        assert first.get_stats()["file_bytes"] == len("short") + 1
+        assert second.get(1) == "y"
+        assert second.get(2) == "short"
+
+
+
+class TestSeenIndex:
+    """Test cases for the persistent index of known article URLs and titles."""
+
+    @pytest.fixture
+    def storage(self, temp_data_dir):
+        index = SeenIndex(index_file=os.path.join(temp_data_dir, 'seen_index.json'))
+        with patch('models.article_storage.JSON_FILE', os.path.join(temp_data_dir, 'articles_seen.json')), \
+             patch('models.article_storage.STORAGE_ENGINE', 'json'), \
+             patch('models.article_storage.seen_index', index), \
+             patch.object(ArticleStorage, '_insert_listeners', []), \
+             patch.object(ArticleStorage, '_patch_listeners', []):
+            yield index
+
+    def test_canonical_url(self):
+        """Test that links to the same article share a key."""
+        key = canonical_url("https://techcrunch.com/2025/01/01/article/")
+        assert canonical_url("http://www.techcrunch.com/2025/01/01/article") == key
+        assert canonical_url("https://TechCrunch.com/2025/01/01/article/?utm_source=rss#comments") == key
+        assert canonical_url("https://example.com/a?b=2&a=1&xtor=RSS") == canonical_url("https://example.com/a?a=1&b=2")
+        assert canonical_url("https://example.com/a?id=1") != canonical_url("https://example.com/a?id=2")
+
+    def test_lookups(self):
+        """Test URL and title lookups."""
+        index = SeenIndex(index_file=None)
+        index.add("https://example.com/1", "Un  Titre")
+        assert index.contains_url("https://www.example.com/1/")
+        assert index.contains_title("un titre")
+        assert index.contains("https://example.com/2", "Un titre")
+        assert not index.contains("https://example.com/2", "Autre titre")
+        assert not index.contains_title("")
+
+    def test_storage_keeps_index_in_sync(self, storage):
+        """Test that inserts update the index and scrapers never reload the articles."""
+        assert ArticleStorage.get_seen_index().contains_url("https://example.com/1")
+
+        new = [Article(title="Test Article 1", url="https://example.com/new"),
+               Article(title="Fresh", url="https://example.com/fresh"),
+               Article(title="Fresh again", url="https://example.com/fresh/")]
+        assert ArticleStorage.add_new_articles(new) == 1
+        ArticleStorage.patch_articles([(0, {"rating": 3}, {})])
+
+        with patch.object(ArticleStorage, 'load_articles') as mock_load:
+            assert ArticleStorage.get_seen_index().contains_url("https://example.com/fresh")
+        mock_load.assert_not_called()
+
+    def test_restart_reads_saved_index(self, storage, temp_data_dir):
+        """Test that a saved index is reused on unchanged storage and rebuilt after an outside edit."""
+        ArticleStorage.get_seen_index()
+        restarted = SeenIndex(index_file=storage.index_file)
+        with patch('models.article_storage.seen_index', restarted), \
+             patch.object(ArticleStorage, 'load_articles') as mock_load:
+            assert ArticleStorage.get_seen_index().contains_title("Test Article 2")
+        mock_load.assert_not_called()
+
+        articles_file = os.path.join(temp_data_dir, 'articles_seen.json')
+        with open(articles_file, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        articles.append({"id": 2, "title": "Added by hand", "url": "https://example.com/3"})
+        with open(articles_file, 'w', encoding='utf-8') as f:
+            json.dump(articles, f)
+        assert ArticleStorage.get_seen_index().contains_title("Added by hand")
+
 class TestChatManager:
     """Test cases for ChatManager class."""
 
@@ -33,6 +33,7 @@ export interface PaginationInfo {
   total: number;
   returned: number;
   sort_by: string;
+  next_cursor?: string | null; // À renvoyer dans `cursor` pour la page suivante
 }
 
 export interface TitlesResponse {